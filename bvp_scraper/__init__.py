@@ -15,9 +15,17 @@ PHP implementation while leveraging Python-specific features and libraries.
 __version__ = "1.0.0"
 __author__ = "Port to Python (Original by shimomo)"
 
+from .batch import BatchError, BatchResult
 from .scraper import Scraper
 from .scraper_core import ScraperCore
 from .scrapers.program_scraper import ProgramScraper
 from .scrapers.result_scraper import ResultScraper
 
-__all__ = ["Scraper", "ScraperCore", "ResultScraper", "ProgramScraper"]
+__all__ = [
+    "Scraper",
+    "ScraperCore",
+    "ResultScraper",
+    "ProgramScraper",
+    "BatchResult",
+    "BatchError",
+]
@@ -0,0 +1,225 @@
+"""
+Market metrics computed over the odds of many races at once.
+
+Every function takes odds stacked across races: the first axis is the
+race and the remaining axes are the bet type's own layout (see
+bvp_scraper.combinations), e.g. ``(races, 6)`` for win odds or
+``(races, 6, 6, 6)`` for trifecta odds. Missing odds (NaN) count as no
+money on the combination.
+
+For a parimutuel pool with takeout ``t`` the odds are ``(1 - t) / p``, so
+the implied probabilities ``1 / odds`` sum to ``winners / (1 - t)``, where
+``winners`` is the number of combinations paid out (1 for win, 2 for
+place, 3 for quinella place).
+"""
+
+from typing import Any, Dict, Iterable
+
+import numpy as np
+
+from .combinations import PAIRS, TRIPLE_POSITIONS, TRIPLES
+from .odds_delta import flatten_odds
+
+
+def _trifecta_to_trio() -> np.ndarray:
+    """Build the (216, 20) matrix summing trifecta cells into trio triples."""
+    positions = TRIPLE_POSITIONS.ravel()
+    (cells,) = np.nonzero(positions >= 0)
+    matrix = np.zeros((positions.size, len(TRIPLES)))
+    matrix[cells, positions[cells]] = 1.0
+    return matrix
+
+
+_TRIFECTA_TO_TRIO = _trifecta_to_trio()
+
+
+def stack_odds(races: Iterable[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    Stack the odds of many races into one array per bet type.
+
+    Args:
+        races: Odds as returned by the odds scraper, one dict per race
+
+    Returns:
+        Arrays with a leading race axis, keyed by bet type as named by
+        flatten_odds; bet types missing from any race are left out
+    """
+    arrays = [flatten_odds(odds, ravel=False) for odds in races]
+    if not arrays:
+        return {}
+
+    return {
+        name: np.stack([race[name] for race in arrays])
+        for name in arrays[0]
+        if all(name in race for race in arrays)
+    }
+
+
+def implied_probabilities(odds: np.ndarray) -> np.ndarray:
+    """
+    Convert odds to implied probabilities.
+
+    Args:
+        odds: Stacked odds
+
+    Returns:
+        float64 array of 1 / odds, 0 where odds are missing or not positive
+    """
+    odds = np.asarray(odds, dtype=np.float64)
+    valid = np.isfinite(odds) & (odds > 0)
+    return np.divide(1.0, odds, out=np.zeros_like(odds), where=valid)
+
+
+def overround(odds: np.ndarray) -> np.ndarray:
+    """
+    Sum the implied probabilities of each race.
+
+    Args:
+        odds: Stacked odds
+
+    Returns:
+        One sum per race
+    """
+    probabilities = implied_probabilities(odds)
+    return probabilities.reshape(len(probabilities), -1).sum(axis=1)
+
+
+def takeout(odds: np.ndarray, winners: int = 1) -> np.ndarray:
+    """
+    Estimate the pool's takeout rate of each race.
+
+    Args:
+        odds: Stacked odds
+        winners: Combinations paid out per race
+
+    Returns:
+        Takeout per race, NaN for races without odds
+    """
+    total = overround(odds)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(total > 0, 1.0 - winners / total, np.nan)
+
+
+def normalized_probabilities(odds: np.ndarray, winners: int = 1) -> np.ndarray:
+    """
+    Implied probabilities scaled to sum to the number of winners per race.
+
+    Args:
+        odds: Stacked odds
+        winners: Combinations paid out per race
+
+    Returns:
+        float64 array shaped like odds, NaN for races without odds
+    """
+    probabilities = implied_probabilities(odds)
+    total = overround(odds).reshape((-1,) + (1,) * (probabilities.ndim - 1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(total > 0, probabilities * winners / total, np.nan)
+
+
+def win_marginals(odds: np.ndarray) -> np.ndarray:
+    """
+    Winning probability of each boat implied by an ordered bet type.
+
+    Args:
+        odds: Stacked exacta (races, 6, 6) or trifecta (races, 6, 6, 6) odds
+
+    Returns:
+        (races, 6) probabilities
+    """
+    probabilities = normalized_probabilities(odds)
+    return probabilities.reshape(len(probabilities), 6, -1).sum(axis=2)
+
+
+def exacta_marginals(trifecta: np.ndarray) -> np.ndarray:
+    """
+    Exacta probabilities implied by trifecta odds.
+
+    Args:
+        trifecta: Stacked trifecta odds (races, 6, 6, 6)
+
+    Returns:
+        (races, 6, 6) probabilities
+    """
+    return normalized_probabilities(trifecta).sum(axis=3)
+
+
+def quinella_marginals(exacta: np.ndarray) -> np.ndarray:
+    """
+    Quinella probabilities implied by exacta odds.
+
+    Args:
+        exacta: Stacked exacta odds (races, 6, 6)
+
+    Returns:
+        (races, 15) probabilities in PAIRS order
+    """
+    probabilities = normalized_probabilities(exacta)
+    first, second = (np.array(boats) - 1 for boats in zip(*PAIRS))
+    return probabilities[:, first, second] + probabilities[:, second, first]
+
+
+def trio_marginals(trifecta: np.ndarray) -> np.ndarray:
+    """
+    Trio probabilities implied by trifecta odds.
+
+    Args:
+        trifecta: Stacked trifecta odds (races, 6, 6, 6)
+
+    Returns:
+        (races, 20) probabilities in TRIPLES order
+    """
+    probabilities = normalized_probabilities(trifecta).reshape(len(trifecta), -1)
+    return np.nan_to_num(probabilities) @ _TRIFECTA_TO_TRIO
+
+
+def consistency(odds: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Compare the probabilities implied by related bet types.
+
+    Each check is the largest absolute probability difference per race
+    between a bet type and the marginals of a finer one; large values flag
+    stale or inconsistent odds.
+
+    Args:
+        odds: Stacked odds keyed by bet type, as returned by stack_odds
+
+    Returns:
+        Per-race differences keyed by check, for the bet types available
+    """
+    checks = {}
+    win = odds.get("win_odds")
+    exacta = odds.get("exacta_odds")
+    quinella = odds.get("quinella_odds")
+    trifecta = odds.get("trifecta_odds")
+    trio = odds.get("trio_odds")
+
+    if win is not None and exacta is not None:
+        checks["exacta_vs_win"] = _largest_difference(
+            win_marginals(exacta), normalized_probabilities(win)
+        )
+    if win is not None and trifecta is not None:
+        checks["trifecta_vs_win"] = _largest_difference(
+            win_marginals(trifecta), normalized_probabilities(win)
+        )
+    if exacta is not None and trifecta is not None:
+        checks["trifecta_vs_exacta"] = _largest_difference(
+            exacta_marginals(trifecta), normalized_probabilities(exacta)
+        )
+    if quinella is not None and exacta is not None:
+        checks["exacta_vs_quinella"] = _largest_difference(
+            quinella_marginals(exacta), normalized_probabilities(quinella)
+        )
+    if trio is not None and trifecta is not None:
+        checks["trifecta_vs_trio"] = _largest_difference(
+            trio_marginals(trifecta), normalized_probabilities(trio)
+        )
+
+    return checks
+
+
+def _largest_difference(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Largest absolute difference per race, ignoring NaN."""
+    difference = np.abs(left - right).reshape(len(left), -1)
+    largest = np.where(np.isnan(difference), -np.inf, difference).max(axis=1)
+    return np.where(np.isneginf(largest), np.nan, largest)
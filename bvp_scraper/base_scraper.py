@@ -4,18 +4,34 @@ Base scraper class providing common functionality.
 
 import re
 import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
-from typing import Any, Dict, Optional, Union
+from typing import TYPE_CHECKING, Any, ClassVar, Dict, Optional, Tuple, Union
 
 import requests
 from bs4 import BeautifulSoup
 
 from .interfaces import ScraperContractInterface
+from .layout import LayoutDetector
+from .parse_context import ParseContext
+
+if TYPE_CHECKING:
+    from .scheduler import FetchScheduler
 
 
 class BaseScraper(ScraperContractInterface):
     """Base scraper class with common HTTP and parsing functionality."""
 
+    # Pages each scraping method needs, keyed by method name
+    PAGES: ClassVar[Dict[str, Tuple[str, ...]]] = {}
+
+    # Selector templates for each page, compiled per layout (see layout.py)
+    SELECTORS: ClassVar[Dict[str, Dict[str, str]]] = {}
+
+    # Fetch scheduler lane of the scraper's requests (see scheduler.py)
+    LANE: ClassVar[str] = "result"
+
     def __init__(self, session: Optional[requests.Session] = None):
         """
         Initialize base scraper.
@@ -24,9 +40,27 @@ class BaseScraper(ScraperContractInterface):
             session: Optional requests session for connection reuse
         """
         self.base_url = "https://www.boatrace.jp"
-        self.base_level = 0
-        self.seconds = 1  # Sleep duration between requests
+        self.seconds = 1  # Sleep duration between requests without a scheduler
+        self.scheduler: Optional[FetchScheduler] = None  # Shared rate budget
+        self.lane = self.LANE
+        self.parser = "html.parser"
+        self.stream = False  # Stop downloading once extraction has what it needs
+        self.chunk_size = 16 * 1024
+        # Bytes of body left after the needed part read to keep the connection
+        self.drain_limit = 64 * 1024
+        # Pages of one method fetched at the same time; only used with a
+        # scheduler, which keeps them within the rate budget
+        self.max_workers = 1
+        # Record tree sizes with tracemalloc; valid with one parse thread only
+        self.track_memory = False
+        self.peak_tree_memory: Dict[str, int] = {}  # Bytes, by page name
         self.session = session or requests.Session()
+        self.layouts = LayoutDetector(self.SELECTORS)
+
+        # (declared charset, resolved encoding) of the most recent page, so
+        # that detection only runs again when the server changes its
+        # declaration. Kept as one tuple so threads never see a torn pair.
+        self._encoding_cache: Optional[Tuple[Optional[str], str]] = None
 
         # Configure session with headers similar to browser
         self.session.headers.update(
@@ -39,12 +73,16 @@ class BaseScraper(ScraperContractInterface):
             }
         )
 
-    def request_and_parse(self, url: str) -> BeautifulSoup:
+    def request_and_parse(
+        self, url: str, until: Optional[bytes] = b"</main>"
+    ) -> BeautifulSoup:
         """
         Make HTTP request and parse HTML response.
 
         Args:
             url: URL to request
+            until: In streaming mode, raw end tag after which the rest of the
+                body is not needed
 
         Returns:
             BeautifulSoup object for parsing
@@ -52,11 +90,314 @@ class BaseScraper(ScraperContractInterface):
         Raises:
             requests.RequestException: On HTTP errors
         """
+        if self.stream:
+            content, declared_charset = self._fetch_until(url, until)
+        else:
+            content, declared_charset = self.fetch(url)
+        return self.parse_html(content, declared_charset)
+
+    def fetch(self, url: str) -> Tuple[bytes, Optional[str]]:
+        """
+        Make HTTP request and return the raw body without parsing it.
+
+        Args:
+            url: URL to request
+
+        Returns:
+            Tuple of response body and declared charset
+
+        Raises:
+            requests.RequestException: On HTTP errors
+        """
+        self._wait_for_slot()
         response = self.session.get(url)
         response.raise_for_status()
-        time.sleep(self.seconds)
+        if self.scheduler is None:
+            time.sleep(self.seconds)
+
+        return response.content, self._declared_charset_of(response)
+
+    def parse_html(
+        self, content: bytes, declared_charset: Optional[str] = None
+    ) -> BeautifulSoup:
+        """
+        Parse raw HTML bytes, reusing the encoding resolved for the charset.
+
+        Args:
+            content: Raw response body
+            declared_charset: Charset declared by the server, if any
+
+        Returns:
+            BeautifulSoup object for parsing
+        """
+        cached = self._encoding_cache
+        if cached is not None and cached[0] == declared_charset:
+            return BeautifulSoup(content, self.parser, from_encoding=cached[1])
+
+        # First page or a changed declaration: let the parser detect it once
+        soup = BeautifulSoup(content, self.parser, from_encoding=declared_charset)
+        if soup.original_encoding:
+            self._encoding_cache = (declared_charset, soup.original_encoding)
+        return soup
+
+    def _fetch_until(
+        self, url: str, until: Optional[bytes]
+    ) -> Tuple[bytes, Optional[str]]:
+        """
+        Download the body only up to the end tag extraction needs.
+
+        This stops the download early; parsing still happens once, on the
+        truncated body. The end tag is looked for in the raw bytes as they
+        arrive, so the check costs nothing per chunk. A short rest of the
+        body is read and dropped so the connection can be reused; a longer
+        one is cheaper to abandon along with the connection.
+
+        Args:
+            url: URL to request
+            until: Raw end tag of the last element needed, or None to read
+                the whole body
+
+        Returns:
+            Tuple of the body up to the end tag and declared charset
+
+        Raises:
+            requests.RequestException: On HTTP errors
+        """
+        body = bytearray()
+        end = -1
+        self._wait_for_slot()
+        with self.session.get(url, stream=True) as response:
+            response.raise_for_status()
+            declared_charset = self._declared_charset_of(response)
+
+            chunks = response.iter_content(self.chunk_size)
+            for chunk in chunks:
+                # Only the new bytes, and a tag split across chunks, are searched
+                searched_from = max(len(body) - len(until or b"") + 1, 0)
+                body += chunk
+                if until:
+                    end = body.find(until, searched_from)
+                    if end >= 0:
+                        break
+
+            if end >= 0:
+                del body[end + len(until) :]
+                drained = 0
+                for chunk in chunks:
+                    drained += len(chunk)
+                    if drained > self.drain_limit:
+                        break
+
+        if self.scheduler is None:
+            time.sleep(self.seconds)
+
+        return bytes(body), declared_charset
+
+    def _wait_for_slot(self) -> None:
+        """Wait for the scheduler to let a request of the scraper's lane go."""
+        if self.scheduler is not None:
+            self.scheduler.acquire(self.lane)
+
+    @staticmethod
+    def _declared_charset_of(response: requests.Response) -> Optional[str]:
+        """
+        Get the charset declared in the Content-Type header.
+
+        Args:
+            response: HTTP response
+
+        Returns:
+            Lower-cased charset name or None when not declared
+        """
+        content_type = response.headers.get("Content-Type")
+        if not isinstance(content_type, str):
+            return None
+
+        match = re.search(r"charset=[\"']?([\w.:-]+)", content_type, re.IGNORECASE)
+        return match.group(1).lower() if match else None
+
+    def build_url(
+        self,
+        page: str,
+        race_date: date,
+        race_stadium_number: int,
+        race_number: int,
+    ) -> str:
+        """
+        Build the URL of a race page.
+
+        Args:
+            page: Page name (e.g. racelist, oddstf)
+            race_date: Parsed race date
+            race_stadium_number: Stadium number (1-24)
+            race_number: Race number (1-12)
+
+        Returns:
+            Page URL
+        """
+        return (
+            f"{self.base_url}/owpc/pc/race/{page}"
+            f"?hd={race_date.strftime('%Y%m%d')}"
+            f"&jcd={race_stadium_number:02d}"
+            f"&rno={race_number}"
+        )
+
+    def scrape_pages(
+        self,
+        method: str,
+        race_date: Union[date, datetime, str],
+        race_stadium_number: int,
+        race_number: int,
+    ) -> Dict[str, Any]:
+        """
+        Fetch the pages a scraping method needs and extract its data.
+
+        Args:
+            method: Scraping method name (key of PAGES)
+            race_date: Race date
+            race_stadium_number: Stadium number (1-24)
+            race_number: Race number (1-12)
+
+        Returns:
+            Dictionary containing scraped data
+        """
+        parsed_date = self._parse_date(race_date)
+
+        urls = {
+            page: self.build_url(page, parsed_date, race_stadium_number, race_number)
+            for page in self.PAGES[method]
+        }
+
+        soups = {}
+        try:
+            # Without a scheduler only the sleep after each request spaces
+            # them out, so concurrent fetches would multiply the request rate
+            concurrent = self.scheduler is not None and self.max_workers > 1
+            if concurrent and len(urls) > 1:
+                with ThreadPoolExecutor(
+                    max_workers=min(self.max_workers, len(urls))
+                ) as pool:
+                    futures = {
+                        page: pool.submit(self._parse_page, page, url)
+                        for page, url in urls.items()
+                    }
+                    for page, future in futures.items():
+                        soups[page] = future.result()
+            else:
+                for page, url in urls.items():
+                    soups[page] = self._parse_page(page, url)
+
+            return self.extract(
+                method, soups, parsed_date, race_stadium_number, race_number
+            )
+        finally:
+            self.release(soups)
+
+    def create_context(
+        self,
+        soup: BeautifulSoup,
+        page: str,
+        race_date: date,
+        race_stadium_number: int,
+        race_number: int,
+    ) -> ParseContext:
+        """
+        Look up the page's layout and build its parse context.
+
+        Args:
+            soup: Parsed page
+            page: Page name
+            race_date: Parsed race date
+            race_stadium_number: Stadium number (1-24)
+            race_number: Race number (1-12)
+
+        Returns:
+            Parse context for the page
+        """
+        plan = self.layouts.plan_for(page, soup)
+
+        return ParseContext(
+            soup, race_date, race_stadium_number, race_number, plan.base_level, plan
+        )
+
+    def release(self, soups: Dict[str, BeautifulSoup]) -> None:
+        """
+        Tear down parse trees once extraction has finished with them.
+
+        Trees are full of reference cycles, so without this they linger until
+        the cyclic garbage collector runs. Extracted records only hold plain
+        values, never tree nodes.
+
+        Args:
+            soups: Parsed pages keyed by page name
+        """
+        for soup in soups.values():
+            soup.decompose()
+        soups.clear()
+
+    def _parse_page(self, page: str, url: str) -> BeautifulSoup:
+        """
+        Request and parse a page, recording its tree size when tracking.
+
+        Tracing runs only around the page, unless it was already on, so the
+        rest of the process does not pay for it. tracemalloc counts every
+        thread's allocations, so the sizes are only valid while a single
+        thread fetches and parses pages.
+
+        Args:
+            page: Page name
+            url: URL to request
+
+        Returns:
+            BeautifulSoup object for parsing
+        """
+        if not self.track_memory:
+            return self.request_and_parse(url)
+
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+
+        try:
+            # The body is released before request_and_parse returns, so what
+            # is left over is the tree itself
+            before, _ = tracemalloc.get_traced_memory()
+            soup = self.request_and_parse(url)
+            tree_size = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            if started:
+                tracemalloc.stop()
+
+        if tree_size > self.peak_tree_memory.get(page, 0):
+            self.peak_tree_memory[page] = tree_size
+
+        return soup
+
+    def extract(
+        self,
+        method: str,
+        soups: Dict[str, BeautifulSoup],
+        race_date: date,
+        race_stadium_number: int,
+        race_number: int,
+    ) -> Dict[str, Any]:
+        """
+        Extract data for a scraping method from already parsed pages.
 
-        return BeautifulSoup(response.content, "html.parser")
+        Extraction never touches the network, so it can run anywhere the
+        page bytes can be sent to, including worker processes.
+
+        Args:
+            method: Scraping method name (key of PAGES)
+            soups: Parsed pages keyed by page name
+            race_date: Parsed race date
+            race_stadium_number: Stadium number (1-24)
+            race_number: Race number (1-12)
+
+        Returns:
+            Dictionary containing scraped data
+        """
+        raise NotImplementedError("Subclasses must implement extract method")
 
     def filter_xpath_text(
         self, soup: BeautifulSoup, css_selector: str
@@ -172,21 +513,34 @@ class BaseScraper(ScraperContractInterface):
             Dictionary with 'lower_limit' and 'upper_limit' keys
         """
         text = self.filter_xpath_text(soup, css_selector)
-        result = {"lower_limit": None, "upper_limit": None}
+        lower_limit, upper_limit = self.parse_odds_range(text)
 
-        if not text:
-            return result
-
-        if "-" in text:
-            parts = text.split("-")
-            if len(parts) == 2:
-                try:
-                    result["lower_limit"] = float(parts[0].strip())
-                    result["upper_limit"] = float(parts[1].strip())
-                except ValueError:
-                    pass
-
-        return result
+        return {"lower_limit": lower_limit, "upper_limit": upper_limit}
+
+    @staticmethod
+    def parse_odds_range(
+        text: Optional[str],
+    ) -> Tuple[Optional[float], Optional[float]]:
+        """
+        Parse odds range text (lower-upper format).
+
+        Args:
+            text: Range text, e.g. "1.5-2.5"
+
+        Returns:
+            Lower and upper limit, or None for both if unparsable
+        """
+        if not text or "-" not in text:
+            return None, None
+
+        parts = text.split("-")
+        if len(parts) == 2:
+            try:
+                return float(parts[0].strip()), float(parts[1].strip())
+            except ValueError:
+                pass
+
+        return None, None
 
     def _clean_text(self, text: str) -> str:
         """
@@ -0,0 +1,122 @@
+"""
+Results of batch scrapes that keep going past failed races.
+
+A race that still fails after its retries no longer throws away the races
+scraped around it: the batch returns the records it got together with the
+error of each failed race, so a retry pass can target just those races.
+"""
+
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from tenacity import RetryError
+
+# (race date, stadium number, race number)
+RaceKey = Tuple[date, int, int]
+
+# Failures of one race rather than of the batch: the page could not be
+# fetched or did not parse. Anything else is a bug and is raised.
+RACE_ERRORS: Tuple[type, ...] = (requests.RequestException, ValueError)
+
+
+def last_cause(error: BaseException) -> BaseException:
+    """
+    Unwrap a retry error to the exception of its last attempt.
+
+    Args:
+        error: Exception raised by a race
+
+    Returns:
+        The last attempt's exception, or error itself
+    """
+    if isinstance(error, RetryError):
+        return error.last_attempt.exception() or error
+    return error
+
+
+def is_race_error(error: BaseException) -> bool:
+    """
+    Tell whether an exception fails only its race.
+
+    Args:
+        error: Exception raised by a race, possibly after retries
+
+    Returns:
+        True for network and parse failures
+    """
+    return isinstance(last_cause(error), RACE_ERRORS)
+
+
+class BatchResult(dict):
+    """
+    Records keyed by stadium number and race number, plus what is missing.
+
+    Attributes:
+        errors: Exception of each race that still failed after retries
+        skipped: Reason each race was not scraped at all
+    """
+
+    def __init__(
+        self,
+        records: Optional[Dict[int, Dict[int, Any]]] = None,
+        errors: Optional[Dict[RaceKey, Exception]] = None,
+        skipped: Optional[Dict[RaceKey, str]] = None,
+    ):
+        """
+        Initialize batch result.
+
+        Args:
+            records: Records keyed by stadium number and race number
+            errors: Exceptions keyed by race
+            skipped: Skip reasons keyed by race
+        """
+        super().__init__(records or {})
+        self.errors: Dict[RaceKey, Exception] = dict(errors or {})
+        self.skipped: Dict[RaceKey, str] = dict(skipped or {})
+
+    @property
+    def ok(self) -> bool:
+        """Whether every planned race was scraped."""
+        return not self.errors
+
+    def add_error(self, key: RaceKey, error: Exception) -> None:
+        """
+        Record a failed race, unwrapping the retry error to its last cause.
+
+        Args:
+            key: Failed race
+            error: Exception raised by the race
+
+        Raises:
+            Exception: The error itself unless it is a network or parse
+                failure (see RACE_ERRORS)
+        """
+        if not is_race_error(error):
+            raise error
+        self.errors[key] = last_cause(error)
+
+    def raise_for_errors(self) -> None:
+        """
+        Raise if any race failed.
+
+        Raises:
+            BatchError: If errors is not empty
+        """
+        if self.errors:
+            raise BatchError(self) from next(iter(self.errors.values()))
+
+
+class BatchError(Exception):
+    """Raised after a batch finished with failed races."""
+
+    def __init__(self, result: BatchResult):
+        """
+        Initialize batch error.
+
+        Args:
+            result: The batch, with its records and errors
+        """
+        self.result = result
+        key, error = next(iter(result.errors.items()))
+        super().__init__(f"{len(result.errors)} races failed, first {key}: {error!r}")
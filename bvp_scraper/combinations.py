@@ -0,0 +1,449 @@
+"""
+Precomputed combination tables shared by odds and payouts.
+
+Every bet type has one immutable table mapping its combinations, as
+strings ("1-2-3", "1=2") or boat number tuples, to a dense index: the
+position of the combination in the bet type's flattened odds.
+
+Odds of ordered bet types are kept as dense arrays with one axis per
+finishing position, indexed by boat number minus one: ``odds[0, 1, 2]``
+holds the trifecta 1-2-3 and its dense index is 0 * 36 + 1 * 6 + 2 = 8.
+Combinations that cannot occur (a boat in two positions) are NaN.
+
+Unordered bet types are kept as vectors over the boat pairs in ascending
+order (1=2, 1=3, ..., 5=6), the upper triangle of the exacta matrix, or
+over the boat triples in ascending order (1=2=3, 1=2=4, ..., 4=5=6).
+Vectors of many races stack into a (races x combinations) matrix.
+
+Joining odds to payouts is then an integer operation:
+``odds.ravel()[payout["combination_index"]]``.
+"""
+
+import itertools
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+BOAT_COUNT = 6
+
+_FULL_WIDTH = str.maketrans("１２３４５６－＝", "123456-=")
+
+
+@dataclass(frozen=True)
+class CombinationTable:
+    """Lookup table between the combinations of a bet type and dense indices."""
+
+    name: str
+    positions: int
+    ordered: bool
+    separator: str
+    shape: Tuple[int, ...]  # layout of the bet type's odds
+    boats: np.ndarray  # (size, positions) boat numbers per index, 0 if none
+    lookup: np.ndarray  # dense index by boat numbers, -1 if invalid
+    strings: Tuple[str, ...]  # canonical string per index, "" if none
+    string_index: Mapping[str, int]
+
+    @property
+    def size(self) -> int:
+        """Number of dense indices, including impossible combinations."""
+        return len(self.boats)
+
+    @property
+    def indices(self) -> np.ndarray:
+        """Dense indices of every possible combination, in ascending order."""
+        return np.flatnonzero(self.boats[:, 0])
+
+    def encode(self, boats: Union[Sequence[int], np.ndarray]) -> np.ndarray:
+        """
+        Encode boat numbers to dense indices.
+
+        Args:
+            boats: Boat numbers with a last axis of length positions
+
+        Returns:
+            Dense indices, -1 where the boats form no combination
+        """
+        boats = np.asarray(boats, dtype=np.int64)
+        in_range = ((boats >= 1) & (boats <= BOAT_COUNT)).all(axis=-1)
+        clipped = np.where(in_range[..., np.newaxis], boats, 0)
+        indices = self.lookup[tuple(np.moveaxis(clipped, -1, 0))]
+        return np.where(in_range, indices, -1)
+
+    def decode(self, indices: Union[int, Sequence[int], np.ndarray]) -> np.ndarray:
+        """
+        Decode dense indices to boat numbers.
+
+        Args:
+            indices: Dense indices
+
+        Returns:
+            Boat numbers with a last axis of length positions, 0 for
+            impossible combinations
+        """
+        return self.boats[np.asarray(indices)]
+
+    def parse(self, combinations: Iterable[str]) -> np.ndarray:
+        """
+        Parse combination strings to dense indices.
+
+        Args:
+            combinations: Combination strings, e.g. "1-2-3"
+
+        Returns:
+            Dense indices, -1 for strings that are no combination
+        """
+        return np.array(
+            [self.string_index.get(_normalize(key), -1) for key in combinations],
+            dtype=np.int16,
+        )
+
+    def format(self, indices: Iterable[int]) -> List[str]:
+        """
+        Format dense indices as canonical combination strings.
+
+        Args:
+            indices: Dense indices
+
+        Returns:
+            Combination strings
+        """
+        return [self.strings[index] for index in indices]
+
+    def index_of(self, combination: Union[str, Sequence[int]]) -> int:
+        """
+        Get the dense index of one combination.
+
+        Args:
+            combination: Combination string or boat numbers
+
+        Returns:
+            Dense index
+
+        Raises:
+            ValueError: If the combination is invalid for the bet type
+        """
+        if isinstance(combination, str):
+            index = self.string_index.get(_normalize(combination), -1)
+        elif len(combination) == self.positions:
+            index = int(self.encode(combination))
+        else:
+            index = -1
+
+        if index < 0:
+            raise ValueError(f"Invalid {self.name} combination: {combination}")
+
+        return index
+
+    def empty(self) -> np.ndarray:
+        """
+        Create odds with every combination missing.
+
+        Returns:
+            float32 array of NaN in the bet type's layout
+        """
+        return np.full(self.shape, np.nan, dtype=np.float32)
+
+    def to_combinations(
+        self, odds: np.ndarray, separator: Optional[str] = None
+    ) -> Dict[str, float]:
+        """
+        Convert odds to combination strings.
+
+        Args:
+            odds: Odds in the bet type's layout
+            separator: Separator between boat numbers, default the table's
+
+        Returns:
+            Odds keyed by combination, without missing ones
+        """
+        separator = self.separator if separator is None else separator
+        flat = np.asarray(odds).ravel()
+        indices = self.indices[~np.isnan(flat[self.indices])]
+
+        return {
+            separator.join(map(str, self.boats[index])): float(flat[index])
+            for index in indices
+        }
+
+    def from_combinations(
+        self, combinations: Mapping[str, float], separator: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Convert combination strings back to odds.
+
+        Args:
+            combinations: Odds keyed by combination
+            separator: Separator between boat numbers, default the table's
+
+        Returns:
+            Odds in the bet type's layout
+
+        Raises:
+            ValueError: If a combination is invalid for the bet type
+        """
+        separator = self.separator if separator is None else separator
+        odds = self.empty()
+        flat = odds.reshape(-1)
+        for key, value in combinations.items():
+            try:
+                boats = [int(boat) for boat in key.split(separator)]
+            except ValueError:
+                raise ValueError(f"Invalid {self.name} combination: {key}") from None
+            flat[self.index_of(boats)] = value
+
+        return odds
+
+
+def _normalize(combination: str) -> str:
+    """Strip whitespace and full-width characters from a combination string."""
+    return "".join(combination.split()).translate(_FULL_WIDTH)
+
+
+def _build_table(
+    name: str, positions: int, ordered: bool, separator: str
+) -> CombinationTable:
+    """Precompute the table of one bet type."""
+    boat_numbers = range(1, BOAT_COUNT + 1)
+    if ordered:
+        combinations = list(itertools.permutations(boat_numbers, positions))
+        shape = (BOAT_COUNT,) * positions
+    else:
+        combinations = list(itertools.combinations(boat_numbers, positions))
+        shape = (len(combinations),)
+
+    size = int(np.prod(shape))
+    boats = np.zeros((size, positions), dtype=np.uint8)
+    lookup = np.full((BOAT_COUNT + 1,) * positions, -1, dtype=np.int16)
+    strings = [""] * size
+    string_index = {}
+
+    for number, combination in enumerate(combinations):
+        if ordered:
+            index = int(np.ravel_multi_index([b - 1 for b in combination], shape))
+        else:
+            index = number
+        boats[index] = combination
+        strings[index] = separator.join(map(str, combination))
+
+        # Unordered combinations are found in any boat order
+        orders = [combination] if ordered else itertools.permutations(combination)
+        for order in orders:
+            lookup[order] = index
+            string_index[separator.join(map(str, order))] = index
+
+    boats.flags.writeable = False
+    lookup.flags.writeable = False
+
+    return CombinationTable(
+        name,
+        positions,
+        ordered,
+        separator,
+        shape,
+        boats,
+        lookup,
+        tuple(strings),
+        MappingProxyType(string_index),
+    )
+
+
+# Combination table of every bet type, keyed like the scraped odds and
+# payouts without their "_odds" or "_payouts" suffix
+TABLES: Mapping[str, CombinationTable] = MappingProxyType(
+    {
+        "win": _build_table("win", 1, True, "-"),
+        "place": _build_table("place", 1, True, "-"),
+        "exacta": _build_table("exacta", 2, True, "-"),
+        "quinella": _build_table("quinella", 2, False, "="),
+        "quinella_place": _build_table("quinella_place", 2, False, "="),
+        "trifecta": _build_table("trifecta", 3, True, "-"),
+        "trio": _build_table("trio", 3, False, "="),
+    }
+)
+
+# Ordered tables by number of finishing positions
+_ORDERED = {1: TABLES["win"], 2: TABLES["exacta"], 3: TABLES["trifecta"]}
+
+# Boat number pairs of the unordered two-boat bet types, in vector order
+PAIRS: Tuple[Tuple[int, int], ...] = tuple(
+    tuple(pair) for pair in TABLES["quinella"].boats.tolist()
+)
+
+# Boat number triples of the unordered three-boat bet type, in vector order
+TRIPLES: Tuple[Tuple[int, int, int], ...] = tuple(
+    tuple(triple) for triple in TABLES["trio"].boats.tolist()
+)
+
+# Vector position of every ordered triple, indexed by boat number minus one
+# (-1 where a boat repeats); maps trifecta arrays onto trio vectors
+TRIPLE_POSITIONS = TABLES["trio"].lookup[1:, 1:, 1:]
+
+
+def empty_odds(positions: int) -> np.ndarray:
+    """
+    Create an odds array with every combination missing.
+
+    Args:
+        positions: Number of finishing positions (2 for exacta, 3 for trifecta)
+
+    Returns:
+        float32 array of NaN with one axis of 6 boats per position
+    """
+    return _ORDERED[positions].empty()
+
+
+def empty_pair_odds() -> np.ndarray:
+    """
+    Create a pair odds vector with every pair missing.
+
+    Returns:
+        float32 vector of NaN, one element per pair in PAIRS
+    """
+    return TABLES["quinella"].empty()
+
+
+def pair_index(first: int, second: int) -> int:
+    """
+    Get the vector position of an unordered pair of boats.
+
+    Args:
+        first: Boat number (1-6)
+        second: Another boat number (1-6)
+
+    Returns:
+        Index into PAIRS
+
+    Raises:
+        ValueError: If the boats do not form a pair
+    """
+    return TABLES["quinella"].index_of((first, second))
+
+
+def pairs_to_combinations(odds: np.ndarray, separator: str = "=") -> Dict[str, float]:
+    """
+    Convert a pair odds vector to combination strings.
+
+    Args:
+        odds: Pair odds vector in PAIRS order
+        separator: Separator between boat numbers
+
+    Returns:
+        Odds keyed by combination (e.g. "1=2"), without missing ones
+    """
+    return TABLES["quinella"].to_combinations(odds, separator)
+
+
+def combinations_to_pairs(
+    combinations: Dict[str, float], separator: str = "="
+) -> np.ndarray:
+    """
+    Convert combination strings back to a pair odds vector.
+
+    Args:
+        combinations: Odds keyed by combination (e.g. "1=2")
+        separator: Separator between boat numbers
+
+    Returns:
+        Pair odds vector in PAIRS order
+
+    Raises:
+        ValueError: If a combination is malformed
+    """
+    return TABLES["quinella"].from_combinations(combinations, separator)
+
+
+def empty_triple_odds() -> np.ndarray:
+    """
+    Create a triple odds vector with every triple missing.
+
+    Returns:
+        float32 vector of NaN, one element per triple in TRIPLES
+    """
+    return TABLES["trio"].empty()
+
+
+def triple_index(first: int, second: int, third: int) -> int:
+    """
+    Get the vector position of an unordered triple of boats.
+
+    Args:
+        first: Boat number (1-6)
+        second: Another boat number (1-6)
+        third: Another boat number (1-6)
+
+    Returns:
+        Index into TRIPLES
+
+    Raises:
+        ValueError: If the boats do not form a triple
+    """
+    return TABLES["trio"].index_of((first, second, third))
+
+
+def triples_to_combinations(odds: np.ndarray, separator: str = "=") -> Dict[str, float]:
+    """
+    Convert a triple odds vector to combination strings.
+
+    Args:
+        odds: Triple odds vector in TRIPLES order
+        separator: Separator between boat numbers
+
+    Returns:
+        Odds keyed by combination (e.g. "1=2=3"), without missing ones
+    """
+    return TABLES["trio"].to_combinations(odds, separator)
+
+
+def combinations_to_triples(
+    combinations: Dict[str, float], separator: str = "="
+) -> np.ndarray:
+    """
+    Convert combination strings back to a triple odds vector.
+
+    Args:
+        combinations: Odds keyed by combination (e.g. "1=2=3")
+        separator: Separator between boat numbers
+
+    Returns:
+        Triple odds vector in TRIPLES order
+
+    Raises:
+        ValueError: If a combination is malformed
+    """
+    return TABLES["trio"].from_combinations(combinations, separator)
+
+
+def array_to_combinations(odds: np.ndarray, separator: str = "-") -> Dict[str, float]:
+    """
+    Convert a dense odds array to combination strings.
+
+    Args:
+        odds: Dense odds array indexed by boat number minus one
+        separator: Separator between boat numbers
+
+    Returns:
+        Odds keyed by combination (e.g. "1-2-3"), without missing ones
+    """
+    return _ORDERED[odds.ndim].to_combinations(odds, separator)
+
+
+def combinations_to_array(
+    combinations: Dict[str, float], positions: int, separator: str = "-"
+) -> np.ndarray:
+    """
+    Convert combination strings back to a dense odds array.
+
+    Args:
+        combinations: Odds keyed by combination (e.g. "1-2-3")
+        positions: Number of finishing positions
+        separator: Separator between boat numbers
+
+    Returns:
+        Dense odds array indexed by boat number minus one
+
+    Raises:
+        ValueError: If a combination is malformed
+    """
+    return _ORDERED[positions].from_combinations(combinations, separator)
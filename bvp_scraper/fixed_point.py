@@ -0,0 +1,219 @@
+"""
+Compact fixed-point representation of odds.
+
+The site shows odds with one decimal, so odds are stored as unsigned
+integers of tenths: 12.3 is 123. Arrays use uint16 when every value fits
+and uint32 otherwise; the two largest values of the type are sentinels
+for absent (NaN) and cancelled (inf) combinations. Converting back to
+float32 gives exactly the odds parsed from the page.
+
+Compared to float32 arrays this halves memory; compared to odds kept as
+Python floats in dicts, such as win odds by boat, it saves well over an
+order of magnitude.
+"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+SCALE = 10  # Odds are stored in tenths
+
+
+def sentinels(dtype: np.dtype) -> Dict[str, int]:
+    """
+    Get the sentinel codes of an integer type.
+
+    Args:
+        dtype: np.uint16 or np.uint32
+
+    Returns:
+        Codes of "absent" and "cancelled" combinations
+    """
+    largest = int(np.iinfo(dtype).max)
+    return {"absent": largest, "cancelled": largest - 1}
+
+
+def encode_odds(values: Any, dtype: Optional[np.dtype] = None) -> np.ndarray:
+    """
+    Encode float odds as fixed-point codes.
+
+    Args:
+        values: Float odds, NaN where absent and inf where cancelled
+        dtype: np.uint16 or np.uint32; default the smallest that fits
+
+    Returns:
+        Integer codes shaped like values
+
+    Raises:
+        ValueError: If an odds value is negative or does not fit dtype
+    """
+    values = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(values)
+    codes = np.zeros(values.shape, dtype=np.int64)
+    codes[finite] = np.rint(values[finite] * SCALE)
+
+    if (codes < 0).any() or np.isneginf(values).any():
+        raise ValueError("Odds cannot be negative")
+
+    largest = int(codes.max(initial=0))
+    if dtype is None:
+        dtype = np.uint16 if largest < sentinels(np.uint16)["cancelled"] else np.uint32
+    if largest >= sentinels(dtype)["cancelled"]:
+        raise ValueError(f"Odds {largest / SCALE} do not fit {np.dtype(dtype).name}")
+
+    codes[np.isnan(values)] = sentinels(dtype)["absent"]
+    codes[np.isposinf(values)] = sentinels(dtype)["cancelled"]
+
+    return codes.astype(dtype)
+
+
+def decode_odds(codes: np.ndarray) -> np.ndarray:
+    """
+    Decode fixed-point codes to float odds.
+
+    Args:
+        codes: Integer codes from encode_odds
+
+    Returns:
+        float32 odds, NaN where absent and inf where cancelled
+    """
+    codes = np.asarray(codes)
+    codes_of = sentinels(codes.dtype)
+    # Divide in float64 so the result rounds like the parsed text did
+    values = codes / float(SCALE)
+    values[codes == codes_of["absent"]] = np.nan
+    values[codes == codes_of["cancelled"]] = np.inf
+
+    return values.astype(np.float32)
+
+
+class FixedPointOdds:
+    """Odds array stored as fixed-point codes."""
+
+    __slots__ = ("codes",)
+
+    def __init__(self, codes: np.ndarray):
+        """
+        Wrap fixed-point codes.
+
+        Args:
+            codes: uint16 or uint32 codes from encode_odds
+        """
+        self.codes = codes
+
+    @classmethod
+    def from_float(cls, values: Any) -> "FixedPointOdds":
+        """
+        Encode float odds.
+
+        Args:
+            values: Float odds, NaN where absent and inf where cancelled
+
+        Returns:
+            Fixed-point odds
+        """
+        return cls(encode_odds(values))
+
+    @property
+    def shape(self) -> tuple:
+        """Shape of the odds."""
+        return self.codes.shape
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the codes."""
+        return self.codes.nbytes
+
+    def to_float(self) -> np.ndarray:
+        """
+        Decode to float odds.
+
+        Returns:
+            float32 odds, NaN where absent and inf where cancelled
+        """
+        return decode_odds(self.codes)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        """Decode when used as a NumPy array."""
+        values = self.to_float()
+        return values if dtype is None else values.astype(dtype)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare decoded odds, NaN equal to NaN."""
+        if not isinstance(other, FixedPointOdds):
+            return NotImplemented
+        return np.array_equal(self.to_float(), other.to_float(), equal_nan=True)
+
+    def __repr__(self) -> str:
+        """Show the decoded odds."""
+        return f"FixedPointOdds({self.to_float()!r})"
+
+
+def compact_odds(odds: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert the odds arrays of a scraped odds record to fixed point.
+
+    Odds arrays and the limits of range odds are converted, and win odds
+    by boat become a 6-element vector indexed by boat number minus one;
+    fields other than odds are kept as they are.
+
+    Args:
+        odds: Odds as returned by the odds scraper
+
+    Returns:
+        New odds record with FixedPointOdds in place of float arrays
+    """
+    return {
+        name: _convert(
+            _boat_vector(value) if name == "win_odds" else value, _to_fixed_point
+        )
+        for name, value in odds.items()
+    }
+
+
+def expand_odds(odds: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert the fixed-point odds of a record back to float32 arrays.
+
+    Args:
+        odds: Odds record from compact_odds
+
+    Returns:
+        New odds record with float32 arrays; win odds stay a vector
+    """
+    return {name: _convert(value, _to_float) for name, value in odds.items()}
+
+
+def _convert(value: Any, convert) -> Any:
+    """Convert an odds field, descending into range odds."""
+    if isinstance(value, dict) and "lower_limit" in value:
+        return {limit: convert(limits) for limit, limits in value.items()}
+
+    return convert(value)
+
+
+def _boat_vector(value: Any) -> Any:
+    """Turn odds keyed by boat number into a float32 vector, NaN where absent."""
+    if not isinstance(value, dict):
+        return value
+
+    return np.array(
+        [np.nan if odds is None else odds for _, odds in sorted(value.items())],
+        dtype=np.float32,
+    )
+
+
+def _to_fixed_point(value: Any) -> Any:
+    """Encode a float array, leaving other values alone."""
+    if isinstance(value, np.ndarray) and value.dtype.kind == "f":
+        return FixedPointOdds.from_float(value)
+
+    return value
+
+
+def _to_float(value: Any) -> Any:
+    """Decode fixed-point odds, leaving other values alone."""
+    if isinstance(value, FixedPointOdds):
+        return value.to_float()
+
+    return value
@@ -0,0 +1,285 @@
+"""
+Durable checkpoint journal for long-running backfills.
+
+The journal is a SQLite database in WAL mode holding one row per
+(kind, race date, stadium, race): planned, done (with where its output
+went) or failed (with the error). Every change is committed on its own,
+so a crash loses at most the race being written. Restarting a backfill
+with the same journal skips the races already done and tries the
+planned and failed ones again.
+"""
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+# (race date, stadium number, race number)
+RaceKey = Tuple[date, int, int]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS races (
+    kind TEXT NOT NULL,
+    race_date TEXT NOT NULL,
+    race_stadium_number INTEGER NOT NULL,
+    race_number INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    output TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL,
+    PRIMARY KEY (kind, race_date, race_stadium_number, race_number)
+) WITHOUT ROWID
+"""
+
+
+@dataclass(frozen=True)
+class JournalProgress:
+    """Progress of one kind of backfill."""
+
+    total: int
+    done: int
+    failed: int
+    pending: int
+    eta: Optional[timedelta]  # None until this run has finished a race
+
+
+class BackfillJournal:
+    """SQLite journal of completed and failed backfill races."""
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        """
+        Open or create a journal.
+
+        Args:
+            path: Database file
+            clock: Current time in seconds
+        """
+        self.path = path
+        self.clock = clock
+        self._started_at = clock()
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(_SCHEMA)
+
+    def __enter__(self) -> "BackfillJournal":
+        """Use the journal as a context manager that closes on exit."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the journal."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def plan(self, kind: str, keys: Iterable[RaceKey]) -> None:
+        """
+        Record races to scrape; races already in the journal are kept.
+
+        Args:
+            kind: Scraping kind, e.g. "results"
+            keys: (race date, stadium number, race number) of the races
+        """
+        rows = [
+            (kind, race_date.isoformat(), stadium, race, "planned")
+            for race_date, stadium, race in keys
+        ]
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR IGNORE INTO races"
+                " (kind, race_date, race_stadium_number, race_number, status)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def mark_done(
+        self,
+        kind: str,
+        race_date: date,
+        race_stadium_number: int,
+        race_number: int,
+        output: Optional[str] = None,
+    ) -> None:
+        """
+        Record a race as done.
+
+        Args:
+            kind: Scraping kind
+            race_date: Race date
+            race_stadium_number: Stadium number (1-24)
+            race_number: Race number (1-12)
+            output: Where the record was written; an earlier output is kept
+                when None
+        """
+        self._upsert(
+            kind, race_date, race_stadium_number, race_number, "done", output, None
+        )
+
+    def mark_failed(
+        self,
+        kind: str,
+        race_date: date,
+        race_stadium_number: int,
+        race_number: int,
+        error: str,
+    ) -> None:
+        """
+        Record a race as failed.
+
+        Args:
+            kind: Scraping kind
+            race_date: Race date
+            race_stadium_number: Stadium number (1-24)
+            race_number: Race number (1-12)
+            error: Error description
+        """
+        self._upsert(
+            kind, race_date, race_stadium_number, race_number, "failed", None, error
+        )
+
+    def completed(self, kind: str) -> Set[RaceKey]:
+        """
+        Get the races already done.
+
+        Args:
+            kind: Scraping kind
+
+        Returns:
+            Keys of the done races
+        """
+        return set(self._keys(kind, "done"))
+
+    def failures(self, kind: str) -> Dict[RaceKey, str]:
+        """
+        Get the races whose last attempt failed.
+
+        Args:
+            kind: Scraping kind
+
+        Returns:
+            Error descriptions keyed by race
+        """
+        return self._keys(kind, "failed")
+
+    def output_of(
+        self, kind: str, race_date: date, race_stadium_number: int, race_number: int
+    ) -> Optional[str]:
+        """
+        Get where a done race was written.
+
+        Args:
+            kind: Scraping kind
+            race_date: Race date
+            race_stadium_number: Stadium number (1-24)
+            race_number: Race number (1-12)
+
+        Returns:
+            Output location, or None if unknown or not done
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT output FROM races WHERE kind = ? AND race_date = ?"
+                " AND race_stadium_number = ? AND race_number = ?"
+                " AND status = 'done'",
+                (kind, race_date.isoformat(), race_stadium_number, race_number),
+            ).fetchone()
+
+        return row[0] if row else None
+
+    def progress(self, kind: str) -> JournalProgress:
+        """
+        Summarize the progress of a backfill.
+
+        The ETA extrapolates the rate at which this run has been finishing
+        races to the races not done yet.
+
+        Args:
+            kind: Scraping kind
+
+        Returns:
+            Race counts by status and the estimated time left
+        """
+        with self._lock:
+            counts = dict(
+                self._connection.execute(
+                    "SELECT status, COUNT(*) FROM races WHERE kind = ? GROUP BY status",
+                    (kind,),
+                ).fetchall()
+            )
+            (done_this_run,) = self._connection.execute(
+                "SELECT COUNT(*) FROM races WHERE kind = ? AND status = 'done'"
+                " AND updated_at >= ?",
+                (kind, self._started_at),
+            ).fetchone()
+
+        done = counts.get("done", 0)
+        failed = counts.get("failed", 0)
+        pending = counts.get("planned", 0)
+        total = done + failed + pending
+
+        eta = None
+        elapsed = self.clock() - self._started_at
+        if done_this_run and elapsed > 0:
+            eta = timedelta(seconds=(failed + pending) * elapsed / done_this_run)
+
+        return JournalProgress(total, done, failed, pending, eta)
+
+    def _upsert(
+        self,
+        kind: str,
+        race_date: date,
+        race_stadium_number: int,
+        race_number: int,
+        status: str,
+        output: Optional[str],
+        error: Optional[str],
+    ) -> None:
+        """Write the status of a race, counting the attempt."""
+        # Marking a done race done again, e.g. to add its output, is not
+        # another attempt; SET expressions see the row before the update
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO races (kind, race_date, race_stadium_number,"
+                " race_number, status, output, error, attempts, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, 1, ?)"
+                " ON CONFLICT (kind, race_date, race_stadium_number, race_number)"
+                " DO UPDATE SET status = excluded.status,"
+                " output = COALESCE(excluded.output, output),"
+                " error = excluded.error,"
+                " attempts = attempts"
+                " + (status <> 'done' OR excluded.status <> 'done'),"
+                " updated_at = excluded.updated_at",
+                (
+                    kind,
+                    race_date.isoformat(),
+                    race_stadium_number,
+                    race_number,
+                    status,
+                    output,
+                    error,
+                    self.clock(),
+                ),
+            )
+
+    def _keys(self, kind: str, status: str) -> Dict[RaceKey, Optional[str]]:
+        """Get the races of a status, with their errors."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT race_date, race_stadium_number, race_number, error"
+                " FROM races WHERE kind = ? AND status = ?",
+                (kind, status),
+            ).fetchall()
+
+        return {
+            (date.fromisoformat(race_date), stadium, race): error
+            for race_date, stadium, race, error in rows
+        }
@@ -0,0 +1,232 @@
+"""
+Page layout detection with a cache of known layouts.
+
+Race pages come in a few structural variants that shift the position of
+the content blocks (the "base level"). Probing for the variant with a deep
+descendant selector on every page is expensive, so each page is reduced
+to a cheap structural fingerprint instead: the shape of the content
+container plus the level signal LEVEL_PROBE looks for, checked only where
+the probe expects it. Known fingerprints map straight
+to a precompiled extraction plan; an unknown one is probed once, cached
+and reported.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from bs4 import BeautifulSoup
+from bs4.element import Tag
+
+logger = logging.getLogger(__name__)
+
+# Legacy probe: the extra navigation block only exists on level 1 pages
+LEVEL_PROBE = "body main div div div div:nth-child(2) div:nth-child(3) ul li"
+
+# CSS API used to compile selectors ahead of time
+_css = BeautifulSoup("", "html.parser").css
+
+# (tag, classes, first child tag) of each block of the content container
+Shape = Tuple[Tuple[str, Tuple[str, ...], Optional[str]], ...]
+
+# Container shape and whether the level 1 navigation block is present
+Fingerprint = Tuple[Shape, bool]
+
+
+@dataclass(frozen=True)
+class LayoutPlan:
+    """Extraction plan for one layout of one page type."""
+
+    page: str
+    base_level: int
+    fingerprint: Optional[Fingerprint]
+    selectors: Dict[str, Any] = field(default_factory=dict)
+
+
+class LayoutDetector:
+    """Maps page fingerprints to extraction plans, learning new layouts."""
+
+    def __init__(self, templates: Dict[str, Dict[str, str]]):
+        """
+        Initialize layout detector.
+
+        Args:
+            templates: Selector templates keyed by page name and selector
+                name. ``{level}`` and ``{level + N}`` are replaced with the
+                layout's base level; ``{boat}`` expands a template into one
+                selector per boat (1-6).
+        """
+        self.templates = templates
+        self._plans: Dict[Tuple[str, Fingerprint], LayoutPlan] = {}
+        self._unfingerprinted: Dict[Tuple[str, int], LayoutPlan] = {}
+        # Fingerprints whose level signal disagreed with the probe
+        self._untrusted: Set[Tuple[str, Fingerprint]] = set()
+
+    def plan_for(self, page: str, soup: BeautifulSoup) -> LayoutPlan:
+        """
+        Get the extraction plan for a parsed page.
+
+        Args:
+            page: Page name
+            soup: Parsed page
+
+        Returns:
+            Extraction plan for the page's layout
+        """
+        fingerprint = self.fingerprint(soup)
+        if fingerprint is None or (page, fingerprint) in self._untrusted:
+            # Unexpected structure: fall back to probing this page
+            return self._probed_plan(page, soup)
+
+        plan = self._plans.get((page, fingerprint))
+        if plan is None:
+            plan = self._learn(page, fingerprint, soup)
+
+        return plan
+
+    def known_layouts(self) -> Dict[str, List[LayoutPlan]]:
+        """
+        List the layouts seen so far.
+
+        Returns:
+            Plans keyed by page name
+        """
+        layouts: Dict[str, List[LayoutPlan]] = {}
+        for (page, _), plan in self._plans.items():
+            layouts.setdefault(page, []).append(plan)
+
+        return layouts
+
+    @staticmethod
+    def fingerprint(soup: BeautifulSoup) -> Optional[Fingerprint]:
+        """
+        Reduce a page to the shape of its main content container.
+
+        Only direct children are walked, plus the one block in which
+        LEVEL_PROBE looks for the level 1 navigation, so this stays cheap
+        regardless of page size while telling the levels apart.
+
+        Args:
+            soup: Parsed page
+
+        Returns:
+            Fingerprint, or None when the page lacks the expected skeleton
+        """
+        node = soup.find("main")
+        for _ in range(3):
+            if node is None:
+                return None
+            node = node.find("div", recursive=False)
+
+        if node is None:
+            return None
+
+        blocks = node.find_all(True, recursive=False)
+        if len(blocks) < 2:
+            return None
+
+        children = blocks[1].find_all(True, recursive=False)
+        shape = []
+        for child in children:
+            first = next(
+                (grand for grand in child.children if isinstance(grand, Tag)), None
+            )
+            shape.append(
+                (
+                    child.name,
+                    tuple(child.get("class") or ()),
+                    first.name if first is not None else None,
+                )
+            )
+
+        navigation = (
+            len(children) >= 3
+            and children[2].name == "div"
+            and children[2].select_one("ul li") is not None
+        )
+
+        return tuple(shape), navigation
+
+    @staticmethod
+    def probe_base_level(soup: BeautifulSoup) -> int:
+        """
+        Determine the base level with the full descendant probe.
+
+        Args:
+            soup: Parsed page
+
+        Returns:
+            Base level (0 or 1)
+        """
+        return 1 if soup.select_one(LEVEL_PROBE) else 0
+
+    def _learn(
+        self, page: str, fingerprint: Fingerprint, soup: BeautifulSoup
+    ) -> LayoutPlan:
+        """Probe an unseen layout once and cache its plan."""
+        base_level = self.probe_base_level(soup)
+        if base_level != int(fingerprint[1]):
+            # The probe matched away from where the fingerprint looks, so the
+            # fingerprint cannot tell the level: probe every such page
+            logger.warning(
+                "%s layout does not show its base level %d in %r; probing it",
+                page,
+                base_level,
+                fingerprint,
+            )
+            self._untrusted.add((page, fingerprint))
+            return self._probed_plan(page, soup)
+
+        plan = self._compile(page, base_level, fingerprint)
+
+        known = [p for (known_page, _), p in self._plans.items() if known_page == page]
+        if known:
+            logger.warning(
+                "New %s layout detected (base level %d, %d known): %r",
+                page,
+                base_level,
+                len(known),
+                fingerprint,
+            )
+        else:
+            logger.info(
+                "Learned %s layout (base level %d): %r", page, base_level, fingerprint
+            )
+
+        self._plans.setdefault((page, fingerprint), plan)
+        return plan
+
+    def _probed_plan(self, page: str, soup: BeautifulSoup) -> LayoutPlan:
+        """Get the plan of a page's probed level, without a fingerprint."""
+        base_level = self.probe_base_level(soup)
+        key = (page, base_level)
+        if key not in self._unfingerprinted:
+            self._unfingerprinted[key] = self._compile(page, base_level, None)
+        return self._unfingerprinted[key]
+
+    def _compile(
+        self, page: str, base_level: int, fingerprint: Optional[Fingerprint]
+    ) -> LayoutPlan:
+        """Compile the selector templates of a page for a base level."""
+        selectors: Dict[str, Any] = {}
+        for name, template in self.templates.get(page, {}).items():
+            selector = _expand_level(template, base_level)
+            if "{boat}" in selector:
+                selectors[name] = tuple(
+                    _css.compile(selector.replace("{boat}", str(boat)))
+                    for boat in range(1, 7)
+                )
+            else:
+                selectors[name] = _css.compile(selector)
+
+        return LayoutPlan(page, base_level, fingerprint, selectors)
+
+
+def _expand_level(template: str, base_level: int) -> str:
+    """Replace ``{level}`` and ``{level + N}`` placeholders."""
+    return re.sub(
+        r"\{level(?:\s*\+\s*(\d+))?\}",
+        lambda match: str(base_level + int(match.group(1) or 0)),
+        template,
+    )
@@ -0,0 +1,230 @@
+"""
+Change detection for successive odds snapshots.
+
+Consecutive polls of a race mostly repeat the same odds. The encoder keeps
+the last odds of every race and bet type and emits only the combinations
+that changed, plus a full keyframe at regular intervals so that a reader
+can start from any keyframe. The decoder rebuilds full odds from them.
+"""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .fixed_point import FixedPointOdds
+from .poller import OddsSnapshot
+
+# (race date, stadium number, race number, bet type)
+SeriesKey = Tuple[date, int, int, str]
+
+
+@dataclass(frozen=True)
+class OddsDelta:
+    """Changed odds of one race and bet type at one point in time."""
+
+    race_date: date
+    race_stadium_number: int
+    race_number: int
+    bet_type: str
+    taken_at: datetime
+    keyframe: bool
+    indices: np.ndarray  # uint16 positions in the flattened odds
+    values: np.ndarray  # float32 odds at those positions
+
+    @property
+    def key(self) -> SeriesKey:
+        """Series the delta belongs to."""
+        return (
+            self.race_date,
+            self.race_stadium_number,
+            self.race_number,
+            self.bet_type,
+        )
+
+
+def flatten_odds(odds: Dict[str, Any], ravel: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Flatten scraped odds to one float32 vector per bet type.
+
+    Odds arrays are raveled, fixed-point odds are decoded, win odds become a
+    6-element vector by boat and range odds are split into
+    "<bet type>.lower_limit" and "<bet type>.upper_limit". Fields other
+    than odds are left out.
+
+    Args:
+        odds: Odds as returned by the odds scraper
+        ravel: Flatten odds arrays; False keeps their shape
+
+    Returns:
+        Flat odds vectors keyed by bet type
+    """
+    flat = {}
+    for name, value in odds.items():
+        if not name.endswith("_odds"):
+            continue
+
+        if isinstance(value, np.ndarray):
+            flat[name] = value.astype(np.float32)
+        elif isinstance(value, FixedPointOdds):
+            flat[name] = value.to_float()
+        elif isinstance(value, dict) and "lower_limit" in value:
+            for limit in ("lower_limit", "upper_limit"):
+                flat[f"{name}.{limit}"] = np.array(value[limit], dtype=np.float32)
+        elif isinstance(value, dict):
+            flat[name] = np.array(
+                [np.nan if odd is None else odd for odd in value.values()],
+                dtype=np.float32,
+            )
+
+    if ravel:
+        return {name: values.ravel() for name, values in flat.items()}
+
+    return flat
+
+
+class OddsDeltaEncoder:
+    """Turns odds snapshots into deltas with periodic keyframes."""
+
+    def __init__(
+        self,
+        sink: Optional[Callable[[OddsDelta], None]] = None,
+        keyframe_interval: float = 300.0,
+    ):
+        """
+        Initialize delta encoder.
+
+        Args:
+            sink: Optional callable receiving every delta; makes the encoder
+                usable as an OddsPoller sink
+            keyframe_interval: Seconds after which a series gets a new
+                keyframe
+        """
+        self.sink = sink
+        self.keyframe_interval = timedelta(seconds=keyframe_interval)
+        self._last: Dict[SeriesKey, np.ndarray] = {}
+        self._keyframed_at: Dict[SeriesKey, datetime] = {}
+
+    def __call__(self, snapshot: OddsSnapshot) -> None:
+        """
+        Encode a snapshot and pass its deltas to the sink, if any.
+
+        The state of a race is dropped after its last (post-deadline) poll.
+
+        Args:
+            snapshot: Odds snapshot
+        """
+        deltas = self.encode(snapshot)
+        if self.sink is not None:
+            for delta in deltas:
+                self.sink(delta)
+
+        if snapshot.taken_at >= snapshot.closed_at:
+            self.forget(
+                snapshot.race_date, snapshot.race_stadium_number, snapshot.race_number
+            )
+
+    def encode(self, snapshot: OddsSnapshot) -> List[OddsDelta]:
+        """
+        Encode a snapshot against the previous one of its race.
+
+        Args:
+            snapshot: Odds snapshot
+
+        Returns:
+            One delta per bet type that changed or is due for a keyframe
+        """
+        deltas = []
+        for bet_type, odds in flatten_odds(snapshot.odds).items():
+            key = (
+                snapshot.race_date,
+                snapshot.race_stadium_number,
+                snapshot.race_number,
+                bet_type,
+            )
+            previous = self._last.get(key)
+            keyframed_at = self._keyframed_at.get(key)
+
+            if (
+                previous is None
+                or previous.shape != odds.shape
+                or snapshot.taken_at - keyframed_at >= self.keyframe_interval
+            ):
+                indices = np.arange(odds.size, dtype=np.uint16)
+                keyframe = True
+                self._keyframed_at[key] = snapshot.taken_at
+            else:
+                indices = np.flatnonzero(changed(previous, odds)).astype(np.uint16)
+                keyframe = False
+                if not indices.size:
+                    continue
+
+            self._last[key] = odds
+            deltas.append(
+                OddsDelta(*key, snapshot.taken_at, keyframe, indices, odds[indices])
+            )
+
+        return deltas
+
+    def forget(
+        self, race_date: date, race_stadium_number: int, race_number: int
+    ) -> None:
+        """
+        Drop the state of a race, e.g. once it has closed.
+
+        Args:
+            race_date: Race date
+            race_stadium_number: Stadium number (1-24)
+            race_number: Race number (1-12)
+        """
+        for key in [
+            key
+            for key in self._last
+            if key[:3] == (race_date, race_stadium_number, race_number)
+        ]:
+            del self._last[key]
+            del self._keyframed_at[key]
+
+
+class OddsDeltaDecoder:
+    """Rebuilds full odds vectors from a stream of deltas."""
+
+    def __init__(self):
+        """Initialize delta decoder."""
+        self._odds: Dict[SeriesKey, np.ndarray] = {}
+
+    def apply(self, delta: OddsDelta) -> Optional[np.ndarray]:
+        """
+        Apply a delta to its series.
+
+        Args:
+            delta: Odds delta
+
+        Returns:
+            Copy of the full flattened odds after the delta, or None while the
+            series has not seen a keyframe yet
+        """
+        if delta.keyframe:
+            self._odds[delta.key] = delta.values.copy()
+        elif delta.key in self._odds:
+            self._odds[delta.key][delta.indices] = delta.values
+        else:
+            return None
+
+        return self._odds[delta.key].copy()
+
+
+def changed(previous: np.ndarray, current: np.ndarray) -> np.ndarray:
+    """
+    Compare two odds vectors, treating NaN as equal to NaN.
+
+    Args:
+        previous: Earlier odds
+        current: Later odds
+
+    Returns:
+        Boolean mask of the positions whose odds differ
+    """
+    same = (previous == current) | (np.isnan(previous) & np.isnan(current))
+    return ~same
@@ -0,0 +1,315 @@
+"""
+Append-only on-disk store for odds time series.
+
+A store is a directory of two files:
+
+- ``index.bin``: one fixed-width record per (race, bet type, capture time),
+  appended in write order and read through a memory map
+- ``data.bin``: zlib-compressed chunks of float32 odds, each holding the
+  values of many index records
+
+Queries filter the memory-mapped index with array operations and then
+decompress only the chunks holding the matching records, so one race's
+history or a month of final odds never touches unrelated data.
+"""
+
+import os
+import zlib
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .odds_delta import flatten_odds
+from .poller import OddsSnapshot
+
+# Bet types as named by flatten_odds; the position is the stored code
+BET_TYPES: Tuple[str, ...] = (
+    "win_odds",
+    "place_odds.lower_limit",
+    "place_odds.upper_limit",
+    "exacta_odds",
+    "quinella_odds",
+    "quinella_place_odds.lower_limit",
+    "quinella_place_odds.upper_limit",
+    "trifecta_odds",
+    "trio_odds",
+)
+
+INDEX_DTYPE = np.dtype(
+    [
+        ("race_date", "datetime64[D]"),
+        ("race_stadium_number", "u1"),
+        ("race_number", "u1"),
+        ("bet_type", "u1"),
+        ("taken_at", "datetime64[us]"),
+        ("count", "u2"),  # number of float32 values
+        ("chunk_offset", "u8"),  # byte offset of the chunk in data.bin
+        ("chunk_size", "u4"),  # compressed chunk size in bytes
+        ("value_offset", "u4"),  # first value of the record in the chunk
+    ]
+)
+
+# Index fields known when a record is appended, in row tuple order
+_ROW_FIELDS = (
+    "race_date",
+    "race_stadium_number",
+    "race_number",
+    "bet_type",
+    "taken_at",
+    "count",
+)
+
+
+class OddsStore:
+    """Append-only columnar store of odds snapshots."""
+
+    def __init__(self, directory: str, chunk_rows: int = 512):
+        """
+        Open or create a store.
+
+        Args:
+            directory: Store directory
+            chunk_rows: Records buffered before a chunk is compressed and
+                written
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.chunk_rows = chunk_rows
+        self._index_path = os.path.join(directory, "index.bin")
+        self._data_path = os.path.join(directory, "data.bin")
+        self._rows: List[Tuple] = []
+        self._values: List[np.ndarray] = []
+
+    def __enter__(self) -> "OddsStore":
+        """Use the store as a context manager that flushes on exit."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Flush the buffered records."""
+        self.flush()
+
+    def __call__(self, snapshot: OddsSnapshot) -> None:
+        """
+        Append a snapshot; makes the store usable as an OddsPoller sink.
+
+        Args:
+            snapshot: Odds snapshot
+        """
+        self.append_snapshot(snapshot)
+
+    def append_snapshot(self, snapshot: OddsSnapshot) -> None:
+        """
+        Append every bet type of a snapshot.
+
+        Args:
+            snapshot: Odds snapshot
+        """
+        for bet_type, values in flatten_odds(snapshot.odds).items():
+            self.append(
+                snapshot.race_date,
+                snapshot.race_stadium_number,
+                snapshot.race_number,
+                bet_type,
+                snapshot.taken_at,
+                values,
+            )
+
+    def append(
+        self,
+        race_date: date,
+        race_stadium_number: int,
+        race_number: int,
+        bet_type: str,
+        taken_at: datetime,
+        values: np.ndarray,
+    ) -> None:
+        """
+        Append the odds of one race and bet type.
+
+        Records become readable once their chunk is flushed.
+
+        Args:
+            race_date: Race date
+            race_stadium_number: Stadium number (1-24)
+            race_number: Race number (1-12)
+            bet_type: Bet type, one of BET_TYPES
+            taken_at: Capture time
+            values: Flat odds vector
+
+        Raises:
+            ValueError: If the bet type is unknown
+        """
+        if bet_type not in BET_TYPES:
+            raise ValueError(f"Unknown bet type: {bet_type}")
+
+        values = np.asarray(values, dtype=np.float32).ravel()
+        self._rows.append(
+            (
+                np.datetime64(race_date, "D"),
+                race_stadium_number,
+                race_number,
+                BET_TYPES.index(bet_type),
+                np.datetime64(taken_at, "us"),
+                values.size,
+            )
+        )
+        self._values.append(values)
+
+        if len(self._rows) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        """Compress the buffered records into a chunk and write it."""
+        if not self._rows:
+            return
+
+        chunk = zlib.compress(np.concatenate(self._values).tobytes())
+        with open(self._data_path, "ab") as data:
+            chunk_offset = data.tell()
+            data.write(chunk)
+
+        index = np.zeros(len(self._rows), dtype=INDEX_DTYPE)
+        for position, name in enumerate(_ROW_FIELDS):
+            index[name] = [row[position] for row in self._rows]
+        index["chunk_offset"] = chunk_offset
+        index["chunk_size"] = len(chunk)
+        index["value_offset"] = np.cumsum(index["count"]) - index["count"]
+
+        with open(self._index_path, "ab") as index_file:
+            index_file.write(index.tobytes())
+
+        self._rows.clear()
+        self._values.clear()
+
+    def index(self) -> np.ndarray:
+        """
+        Get the index of all flushed records.
+
+        Returns:
+            Read-only memory-mapped structured array of INDEX_DTYPE
+        """
+        if not os.path.exists(self._index_path):
+            return np.empty(0, dtype=INDEX_DTYPE)
+
+        size = os.path.getsize(self._index_path) // INDEX_DTYPE.itemsize
+        if not size:
+            return np.empty(0, dtype=INDEX_DTYPE)
+
+        return np.memmap(self._index_path, dtype=INDEX_DTYPE, mode="r", shape=(size,))
+
+    def read(self, records: np.ndarray) -> List[np.ndarray]:
+        """
+        Load the odds of index records.
+
+        Args:
+            records: Records taken from index()
+
+        Returns:
+            Flat odds vector of every record, in the same order
+        """
+        if not len(records):
+            return []
+
+        data = np.memmap(self._data_path, dtype=np.uint8, mode="r")
+        chunks: Dict[int, np.ndarray] = {}
+
+        values = []
+        for record in records:
+            offset = int(record["chunk_offset"])
+            if offset not in chunks:
+                compressed = data[offset : offset + int(record["chunk_size"])]
+                chunks[offset] = np.frombuffer(
+                    zlib.decompress(compressed.tobytes()), dtype=np.float32
+                )
+            start = int(record["value_offset"])
+            values.append(chunks[offset][start : start + int(record["count"])].copy())
+
+        return values
+
+    def history(
+        self,
+        race_date: Union[date, str],
+        race_stadium_number: int,
+        race_number: int,
+        bet_type: str,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Load the full odds history of one race and bet type.
+
+        Args:
+            race_date: Race date
+            race_stadium_number: Stadium number (1-24)
+            race_number: Race number (1-12)
+            bet_type: Bet type, one of BET_TYPES
+
+        Returns:
+            Capture times (datetime64[us]) and a (captures x values) matrix,
+            ordered by capture time
+        """
+        index = self.index()
+        mask = (
+            (index["race_date"] == np.datetime64(race_date, "D"))
+            & (index["race_stadium_number"] == race_stadium_number)
+            & (index["race_number"] == race_number)
+            & (index["bet_type"] == _bet_type_code(bet_type))
+        )
+        records = np.sort(index[mask], order="taken_at")
+
+        return records["taken_at"], _stack(self.read(records))
+
+    def final_odds(
+        self,
+        bet_type: str,
+        start: Union[date, str],
+        end: Union[date, str],
+        stadiums: Optional[Iterable[int]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Load the last captured odds of every race in a date range.
+
+        Args:
+            bet_type: Bet type, one of BET_TYPES
+            start: First race date
+            end: Last race date (inclusive)
+            stadiums: Optional stadium numbers to restrict to
+
+        Returns:
+            Index records of the races and a (races x values) matrix
+        """
+        index = self.index()
+        mask = (
+            (index["bet_type"] == _bet_type_code(bet_type))
+            & (index["race_date"] >= np.datetime64(start, "D"))
+            & (index["race_date"] <= np.datetime64(end, "D"))
+        )
+        if stadiums is not None:
+            mask &= np.isin(index["race_stadium_number"], list(stadiums))
+
+        records = np.sort(
+            index[mask],
+            order=["race_date", "race_stadium_number", "race_number", "taken_at"],
+        )
+        race_keys = records[["race_date", "race_stadium_number", "race_number"]]
+        # The last capture of each race is where the next record's race differs
+        last = np.ones(len(records), dtype=bool)
+        last[:-1] = race_keys[1:] != race_keys[:-1]
+        records = records[last]
+
+        return records, _stack(self.read(records))
+
+
+def _bet_type_code(bet_type: str) -> int:
+    """Get the stored code of a bet type."""
+    try:
+        return BET_TYPES.index(bet_type)
+    except ValueError:
+        raise ValueError(f"Unknown bet type: {bet_type}") from None
+
+
+def _stack(values: List[np.ndarray]) -> np.ndarray:
+    """Stack odds vectors into a matrix, empty when there are none."""
+    if not values:
+        return np.empty((0, 0), dtype=np.float32)
+
+    return np.stack(values)
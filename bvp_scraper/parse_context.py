@@ -0,0 +1,41 @@
+"""
+Per-page state shared by the extraction helpers of a scraper.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Optional
+
+from bs4 import BeautifulSoup
+
+from .layout import LayoutPlan
+
+
+@dataclass(frozen=True)
+class ParseContext:
+    """
+    Everything extraction needs to know about the page being parsed.
+
+    Scrapers keep no per-page state on the instance, so one scraper can
+    serve many threads at once; the context travels through the helpers
+    instead.
+    """
+
+    soup: BeautifulSoup
+    race_date: date
+    race_stadium_number: int
+    race_number: int
+    base_level: int = 0  # 1 when the page carries an extra navigation block
+    plan: Optional[LayoutPlan] = None
+
+    def selector(self, name: str) -> Any:
+        """
+        Get a precompiled selector from the page's extraction plan.
+
+        Args:
+            name: Selector name
+
+        Returns:
+            Compiled selector, or a tuple of them for per-boat selectors
+        """
+        return self.plan.selectors[name]
@@ -0,0 +1,146 @@
+"""
+Process-pool parse stage for the fetch/parse pipeline.
+
+Network I/O stays in threads of the calling process; only raw page bytes
+are sent to worker processes, which parse them and run the scraper's
+extraction. Records come back packed as tuples so that field names are
+pickled once per batch rather than once per record.
+"""
+
+from datetime import date
+from importlib import import_module
+from typing import Any, Dict, List, Optional, Tuple
+
+from .base_scraper import BaseScraper
+
+# Raw page as fetched: body bytes and declared charset
+RawPage = Tuple[bytes, Optional[str]]
+
+# Pages of one race: (stadium number, race number, pages by name)
+RaceBatchItem = Tuple[int, int, Dict[str, RawPage]]
+
+# Field-name tuples shared by the batch, and one packed value per race
+PackedBatch = Tuple[List[Tuple[Any, ...]], List[Tuple[int, int, Any]]]
+
+# Schema index marking a packed tuple rather than a packed dict
+TUPLE = -1
+
+# Scraper instances of the current worker process, by class path
+_worker_scrapers: Dict[Tuple[str, str], BaseScraper] = {}
+
+
+def extract_batch(
+    module_name: str,
+    class_name: str,
+    method: str,
+    race_date: date,
+    items: List[RaceBatchItem],
+    settings: Optional[Dict[str, Any]] = None,
+) -> PackedBatch:
+    """
+    Parse and extract a batch of races inside a worker process.
+
+    Args:
+        module_name: Module of the scraper class
+        class_name: Scraper class name
+        method: Scraping method name (key of the scraper's PAGES)
+        race_date: Parsed race date
+        items: Raw pages of each race in the batch
+        settings: Scraper attributes to set first, e.g. compact odds
+
+    Returns:
+        Packed records for the batch
+    """
+    scraper = _worker_scraper(module_name, class_name)
+    for name, value in (settings or {}).items():
+        setattr(scraper, name, value)
+
+    records = []
+    for stadium_number, race_number, pages in items:
+        soups = {
+            page: scraper.parse_html(content, declared_charset)
+            for page, (content, declared_charset) in pages.items()
+        }
+        pages.clear()
+        try:
+            record = scraper.extract(
+                method, soups, race_date, stadium_number, race_number
+            )
+        finally:
+            scraper.release(soups)
+        records.append((stadium_number, race_number, record))
+
+    return pack_records(records)
+
+
+def pack_records(records: List[Tuple[int, int, Any]]) -> PackedBatch:
+    """
+    Pack records so that repeated dict keys are stored once per batch.
+
+    Every dict becomes a ``(schema index, values)`` tuple and every tuple of
+    the record a ``(TUPLE, items)`` tuple, so both unpack as they were.
+    Lists are packed item by item.
+
+    Args:
+        records: (stadium number, race number, record) tuples
+
+    Returns:
+        Schemas and packed records
+    """
+    schemas: List[Tuple[Any, ...]] = []
+    schema_index: Dict[Tuple[Any, ...], int] = {}
+
+    def pack(value: Any) -> Any:
+        if isinstance(value, tuple):
+            return (TUPLE, tuple(pack(item) for item in value))
+        if isinstance(value, list):
+            return [pack(item) for item in value]
+        if not isinstance(value, dict):
+            return value
+
+        keys = tuple(value)
+        index = schema_index.get(keys)
+        if index is None:
+            index = schema_index[keys] = len(schemas)
+            schemas.append(keys)
+
+        return (index, tuple(pack(item) for item in value.values()))
+
+    packed = [(stadium, race, pack(record)) for stadium, race, record in records]
+    return schemas, packed
+
+
+def unpack_records(batch: PackedBatch) -> List[Tuple[int, int, Any]]:
+    """
+    Rebuild records packed by pack_records.
+
+    Args:
+        batch: Schemas and packed records
+
+    Returns:
+        (stadium number, race number, record) tuples
+    """
+    schemas, packed = batch
+
+    def unpack(value: Any) -> Any:
+        if isinstance(value, list):
+            return [unpack(item) for item in value]
+        if not isinstance(value, tuple):
+            return value
+
+        index, values = value
+        if index == TUPLE:
+            return tuple(unpack(item) for item in values)
+        return dict(zip(schemas[index], (unpack(item) for item in values)))
+
+    return [(stadium, race, unpack(record)) for stadium, race, record in packed]
+
+
+def _worker_scraper(module_name: str, class_name: str) -> BaseScraper:
+    """Get the scraper instance of the current worker process."""
+    key = (module_name, class_name)
+    if key not in _worker_scrapers:
+        scraper_class = getattr(import_module(module_name), class_name)
+        _worker_scrapers[key] = scraper_class()
+
+    return _worker_scrapers[key]
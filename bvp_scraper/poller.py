@@ -0,0 +1,253 @@
+"""
+Live odds poller covering every open race of a day.
+
+Each race is polled more often as its betting deadline approaches and
+rarely while the deadline is far away. Polls go through the core's
+FetchScheduler in the live_odds lane, so they share one request budget
+with anything else using the scheduler, such as a backfill: when the
+wanted polling rate of the day exceeds the budget, every interval is
+stretched by the same factor, so no race drops out.
+"""
+
+import heapq
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from .batch import BatchError
+from .scheduler import FetchScheduler
+from .scraper_core import ScraperCore
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class OddsSnapshot:
+    """Odds of one race at one point in time."""
+
+    race_date: date
+    race_stadium_number: int
+    race_number: int
+    taken_at: datetime
+    closed_at: datetime
+    odds: Dict[str, Any]
+
+
+class OddsPoller:
+    """Polls the odds of all open races of a day into a sink."""
+
+    def __init__(
+        self,
+        sink: Callable[[OddsSnapshot], None],
+        scraper_core: Optional[ScraperCore] = None,
+        requests_per_second: float = 1.0,
+        min_interval: float = 10.0,
+        max_interval: float = 600.0,
+        lead_ratio: float = 0.1,
+        clock: Callable[[], datetime] = datetime.now,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        Initialize odds poller.
+
+        Args:
+            sink: Called with every snapshot taken
+            scraper_core: Optional ScraperCore instance; share its scheduler
+                with other cores to keep them all within one budget
+            requests_per_second: Page requests allowed per second, all races
+                together, when the core has no scheduler yet; one with this
+                rate is attached to it
+            min_interval: Shortest seconds between polls of one race
+            max_interval: Longest seconds between polls of one race
+            lead_ratio: Wanted interval as a fraction of the time left until
+                the deadline, before clamping
+            clock: Current local time (the site's deadlines are local time)
+            sleep: Sleep function
+
+        Raises:
+            ValueError: If the core sends its requests in a lane other than
+                live_odds
+        """
+        self.sink = sink
+        self.scraper_core = scraper_core or ScraperCore()
+        if self.scraper_core.lane not in (None, "live_odds"):
+            raise ValueError(
+                f"Odds polls need the live_odds lane, not {self.scraper_core.lane}; "
+                "share the core's scheduler instead of the core"
+            )
+        if self.scraper_core.scheduler is None:
+            self.scraper_core.attach_scheduler(FetchScheduler(requests_per_second))
+        self.scheduler: FetchScheduler = self.scraper_core.scheduler
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.lead_ratio = lead_ratio
+        self.clock = clock
+        self.sleep = sleep
+
+        self.requests_per_poll = self.scraper_core.pages_per_race("odds")
+
+        self.race_date: Optional[date] = None
+        self._deadlines: Dict[Tuple[int, int], datetime] = {}
+        self._queue: List[Tuple[datetime, int, int]] = []
+        self._running = False
+
+    def load(self, race_date: Union[date, datetime, str]) -> int:
+        """
+        Track every race of a day whose deadline has not passed yet.
+
+        Args:
+            race_date: Race date
+
+        Returns:
+            Number of races tracked
+        """
+        programs = self.scraper_core.scrape_programs(race_date)
+        self.race_date = self.scraper_core.parse_date(race_date)
+
+        now = self.clock()
+        for stadium_number, races in programs.items():
+            for race_number, program in races.items():
+                closed_at = program.get("race_closed_at")
+                if not closed_at:
+                    continue
+
+                deadline = datetime.strptime(closed_at, "%Y-%m-%d %H:%M:%S")
+                if deadline > now:
+                    self.track(stadium_number, race_number, deadline)
+
+        return len(self._deadlines)
+
+    def track(
+        self, race_stadium_number: int, race_number: int, deadline: datetime
+    ) -> None:
+        """
+        Track a race and poll it as soon as the budget allows.
+
+        Args:
+            race_stadium_number: Stadium number (1-24)
+            race_number: Race number (1-12)
+            deadline: Betting deadline of the race
+        """
+        key = (race_stadium_number, race_number)
+        if key not in self._deadlines:
+            heapq.heappush(self._queue, (self.clock(), *key))
+        self._deadlines[key] = deadline
+
+    def interval_for(self, deadline: datetime, now: datetime) -> float:
+        """
+        Get the seconds until the next poll of a race.
+
+        Args:
+            deadline: Betting deadline of the race
+            now: Current time
+
+        Returns:
+            Interval in seconds, stretched to fit the request budget
+        """
+        return self._wanted_interval(deadline, now) * self._stretch(now)
+
+    def run(self, until: Optional[datetime] = None) -> None:
+        """
+        Poll until every tracked race has closed, stop() is called or a time.
+
+        Args:
+            until: Optional time to stop at
+        """
+        self._running = True
+        while self._running and self._queue:
+            if until is not None and self.clock() >= until:
+                break
+            self.step()
+
+    def stop(self) -> None:
+        """Stop a running poll loop after the current poll."""
+        self._running = False
+
+    def step(self) -> Optional[OddsSnapshot]:
+        """
+        Wait for the next due race, poll it and reschedule it.
+
+        The poll's page requests then wait for their slots in the
+        scheduler's live_odds lane.
+
+        Returns:
+            Snapshot taken, or None when nothing was polled
+        """
+        if not self._queue:
+            return None
+
+        due, stadium_number, race_number = heapq.heappop(self._queue)
+        wait = (due - self.clock()).total_seconds()
+        if wait > 0:
+            self.sleep(wait)
+
+        deadline = self._deadlines[stadium_number, race_number]
+        snapshot = self._poll(stadium_number, race_number, deadline)
+
+        now = self.clock()
+        if now < deadline:
+            next_due = now + timedelta(seconds=self.interval_for(deadline, now))
+            heapq.heappush(self._queue, (next_due, stadium_number, race_number))
+        else:
+            # The poll at or after the deadline is the race's last
+            del self._deadlines[stadium_number, race_number]
+
+        return snapshot
+
+    def _poll(
+        self, race_stadium_number: int, race_number: int, deadline: datetime
+    ) -> Optional[OddsSnapshot]:
+        """Scrape the odds of a race and hand them to the sink."""
+        taken_at = self.clock()
+        try:
+            response = self.scraper_core.scrape_odds(
+                self.race_date, race_stadium_number, race_number, raise_on_error=True
+            )
+        except BatchError as e:
+            logger.warning(
+                "Odds poll of stadium %d race %d failed: %s",
+                race_stadium_number,
+                race_number,
+                e,
+            )
+            return None
+
+        odds = response.get(race_stadium_number, {}).get(race_number)
+        if odds is None:
+            # Planning skipped the race, e.g. its meet was cancelled
+            logger.info(
+                "Odds poll of stadium %d race %d skipped: %s",
+                race_stadium_number,
+                race_number,
+                response.skipped.get(
+                    (self.race_date, race_stadium_number, race_number)
+                ),
+            )
+            return None
+
+        snapshot = OddsSnapshot(
+            self.race_date,
+            race_stadium_number,
+            race_number,
+            taken_at,
+            deadline,
+            odds,
+        )
+        self.sink(snapshot)
+        return snapshot
+
+    def _wanted_interval(self, deadline: datetime, now: datetime) -> float:
+        """Interval proportional to the time left, within the bounds."""
+        remaining = (deadline - now).total_seconds()
+        interval = remaining * self.lead_ratio
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def _stretch(self, now: datetime) -> float:
+        """Factor stretching all intervals so the wanted rate fits the budget."""
+        wanted_rate = sum(
+            self.requests_per_poll / self._wanted_interval(deadline, now)
+            for deadline in self._deadlines.values()
+        )
+        return max(wanted_rate / self.scheduler.requests_per_second, 1.0)
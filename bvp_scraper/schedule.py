@@ -0,0 +1,112 @@
+"""
+Per-date cache of the race schedule from the stadium index page.
+
+Every scrape kind needs the stadiums holding races on a date. The cache
+fetches the index page once per date and shares it: schedules of past
+dates never change and are kept for good, while today's (and future
+dates') expire after a short TTL because meets can still be cancelled.
+"""
+
+import copy
+import threading
+import time
+from datetime import date
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Stadium information keyed by stadium number, as scraped from the index
+Schedule = Dict[int, Dict[str, Any]]
+
+
+class ScheduleCache:
+    """Thread-safe per-date cache of stadium schedules."""
+
+    def __init__(
+        self,
+        loader: Callable[[date], Schedule],
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        today: Callable[[], date] = date.today,
+    ):
+        """
+        Initialize schedule cache.
+
+        Args:
+            loader: Scrapes the schedule of a date
+            ttl: Seconds the schedule of today or a future date stays valid
+            clock: Monotonic time in seconds
+            today: Current local date (the site's dates are local dates)
+        """
+        self.loader = loader
+        self.ttl = ttl
+        self.clock = clock
+        self.today = today
+        self._schedules: Dict[date, Tuple[float, Schedule]] = {}
+        self._lock = threading.Lock()
+        self._loading: Dict[date, threading.Lock] = {}
+
+    def get(self, race_date: date) -> Schedule:
+        """
+        Get the schedule of a date, scraping it only when not cached.
+
+        Concurrent calls for the same date wait for a single load.
+
+        Args:
+            race_date: Race date
+
+        Returns:
+            Copy of the stadium information keyed by stadium number
+        """
+        schedule = self._cached(race_date)
+        if schedule is not None:
+            return copy.deepcopy(schedule)
+
+        with self._lock:
+            loading = self._loading.setdefault(race_date, threading.Lock())
+
+        with loading:
+            # Another thread may have loaded it while this one waited
+            schedule = self._cached(race_date)
+            if schedule is None:
+                schedule = self.loader(race_date)
+                if race_date < self.today():
+                    expires_at = float("inf")
+                else:
+                    expires_at = self.clock() + self.ttl
+                with self._lock:
+                    self._schedules[race_date] = (expires_at, schedule)
+                    self._loading.pop(race_date, None)
+
+        return copy.deepcopy(schedule)
+
+    def peek(self, race_date: date) -> Optional[Schedule]:
+        """
+        Get the schedule of a date only if it is cached, never scraping it.
+
+        Args:
+            race_date: Race date
+
+        Returns:
+            Copy of the stadium information, or None when not cached
+        """
+        schedule = self._cached(race_date)
+        return None if schedule is None else copy.deepcopy(schedule)
+
+    def invalidate(self, race_date: date) -> None:
+        """
+        Drop the cached schedule of a date.
+
+        Args:
+            race_date: Race date
+        """
+        with self._lock:
+            self._schedules.pop(race_date, None)
+
+    def _cached(self, race_date: date) -> Optional[Schedule]:
+        """Get the cached schedule of a date if still valid, else None."""
+        with self._lock:
+            entry = self._schedules.get(race_date)
+
+        if entry is None or entry[0] <= self.clock():
+            return None
+
+        return entry[1]
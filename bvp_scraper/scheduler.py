@@ -0,0 +1,154 @@
+"""
+Fetch scheduler sharing one request rate budget between priority lanes.
+
+Every page request asks the scheduler for a slot in its lane first. Slots
+come from one global token bucket, so all scrapers sharing a scheduler
+stay within a single rate however many threads or cores use them.
+
+When requests wait, the lanes share the slots by weight (stride
+scheduling): a lane with weight 8 gets eight slots for each slot of a
+waiting lane with weight 1. A lane that becomes busy starts at the
+current virtual time, so a live odds request arriving behind thousands of
+queued backfill pages gets the very next slot, while backfill still
+progresses at its share rather than starving.
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+# Lanes from highest to lowest priority; the order breaks ties
+LANES: Tuple[str, ...] = ("live_odds", "preview", "result", "backfill")
+
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    "live_odds": 8.0,
+    "preview": 4.0,
+    "result": 2.0,
+    "backfill": 1.0,
+}
+
+
+class FetchScheduler:
+    """Grants page requests by lane within one global rate budget."""
+
+    def __init__(
+        self,
+        requests_per_second: float = 1.0,
+        burst: int = 1,
+        weights: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize fetch scheduler.
+
+        Args:
+            requests_per_second: Requests allowed per second, all lanes
+                together
+            burst: Requests allowed back to back after an idle period
+            weights: Optional share of each lane, overriding DEFAULT_WEIGHTS
+            clock: Monotonic time in seconds
+
+        Raises:
+            ValueError: If a weight names an unknown lane or is not positive
+        """
+        self.weights = dict(DEFAULT_WEIGHTS)
+        for lane, weight in (weights or {}).items():
+            if lane not in DEFAULT_WEIGHTS:
+                raise ValueError(f"Unknown lane: {lane}")
+            if weight <= 0:
+                raise ValueError(f"Weight of lane {lane} must be positive")
+            self.weights[lane] = weight
+
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.clock = clock
+        self.granted: Dict[str, int] = dict.fromkeys(LANES, 0)
+
+        self._condition = threading.Condition()
+        self._queues: Dict[str, Deque[int]] = {lane: deque() for lane in LANES}
+        self._passes: Dict[str, float] = dict.fromkeys(LANES, 0.0)
+        self._virtual_time = 0.0
+        self._tokens = float(burst)
+        self._refilled_at = clock()
+        self._tickets = itertools.count()
+
+    def acquire(self, lane: str) -> None:
+        """
+        Block until a request of the lane may be sent.
+
+        Args:
+            lane: Lane of the request, one of LANES
+
+        Raises:
+            ValueError: If the lane is unknown
+        """
+        if lane not in self._queues:
+            raise ValueError(f"Unknown lane: {lane}")
+
+        with self._condition:
+            queue = self._queues[lane]
+            if not queue:
+                # An idle lane neither banks credit nor waits behind busy ones
+                self._passes[lane] = max(self._passes[lane], self._virtual_time)
+            ticket = next(self._tickets)
+            queue.append(ticket)
+
+            try:
+                while True:
+                    if queue[0] != ticket or self._next_lane() != lane:
+                        self._condition.wait()
+                        continue
+
+                    wait = self._take_token()
+                    if wait > 0:
+                        # Woken early when a request of another lane arrives
+                        self._condition.wait(wait)
+                        continue
+
+                    queue.popleft()
+                    self._virtual_time = self._passes[lane]
+                    self._passes[lane] += 1.0 / self.weights[lane]
+                    self.granted[lane] += 1
+                    return
+            except BaseException:
+                if ticket in queue:
+                    queue.remove(ticket)
+                raise
+            finally:
+                self._condition.notify_all()
+
+    def queued(self) -> Dict[str, int]:
+        """
+        Count the requests waiting in each lane.
+
+        Returns:
+            Waiting requests keyed by lane
+        """
+        with self._condition:
+            return {lane: len(queue) for lane, queue in self._queues.items()}
+
+    def _next_lane(self) -> Optional[str]:
+        """Lane served next: lowest virtual pass, then highest priority."""
+        waiting = [
+            (self._passes[lane], priority, lane)
+            for priority, lane in enumerate(LANES)
+            if self._queues[lane]
+        ]
+        return min(waiting)[2] if waiting else None
+
+    def _take_token(self) -> float:
+        """Take a token from the bucket; seconds until one exists if empty."""
+        now = self.clock()
+        self._tokens = min(
+            self.burst,
+            self._tokens + (now - self._refilled_at) * self.requests_per_second,
+        )
+        self._refilled_at = now
+
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+
+        return (1 - self._tokens) / self.requests_per_second
@@ -3,9 +3,19 @@ Main Scraper class providing singleton-like interface.
 """
 
 from datetime import date, datetime
-from typing import Any, Dict, Optional, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+)
 
-from .scraper_core import ScraperCore
+from .batch import BatchResult
+from .scraper_core import BUNDLE_PARTS, ScraperCore
 
 
 class Scraper:
@@ -82,11 +92,12 @@ class Scraper:
         race_date: Union[date, datetime, str],
         race_stadium_number: Optional[int] = None,
         race_number: Optional[int] = None,
+        raise_on_error: Optional[bool] = None,
     ) -> Dict[str, Any]:
         """Scrape race programs."""
         instance = Scraper.get_instance()
         return instance._scraper_core.scrape_programs(
-            race_date, race_stadium_number, race_number
+            race_date, race_stadium_number, race_number, raise_on_error=raise_on_error
         )
 
     @staticmethod
@@ -94,11 +105,12 @@ class Scraper:
         race_date: Union[date, datetime, str],
         race_stadium_number: Optional[int] = None,
         race_number: Optional[int] = None,
+        raise_on_error: Optional[bool] = None,
     ) -> Dict[str, Any]:
         """Scrape race previews."""
         instance = Scraper.get_instance()
         return instance._scraper_core.scrape_previews(
-            race_date, race_stadium_number, race_number
+            race_date, race_stadium_number, race_number, raise_on_error=raise_on_error
         )
 
     @staticmethod
@@ -106,11 +118,12 @@ class Scraper:
         race_date: Union[date, datetime, str],
         race_stadium_number: Optional[int] = None,
         race_number: Optional[int] = None,
+        raise_on_error: Optional[bool] = None,
     ) -> Dict[str, Any]:
         """Scrape all odds."""
         instance = Scraper.get_instance()
         return instance._scraper_core.scrape_odds(
-            race_date, race_stadium_number, race_number
+            race_date, race_stadium_number, race_number, raise_on_error=raise_on_error
         )
 
     @staticmethod
@@ -118,11 +131,12 @@ class Scraper:
         race_date: Union[date, datetime, str],
         race_stadium_number: Optional[int] = None,
         race_number: Optional[int] = None,
+        raise_on_error: Optional[bool] = None,
     ) -> Dict[str, Any]:
         """Scrape race results."""
         instance = Scraper.get_instance()
         return instance._scraper_core.scrape_results(
-            race_date, race_stadium_number, race_number
+            race_date, race_stadium_number, race_number, raise_on_error=raise_on_error
         )
 
     @staticmethod
@@ -130,3 +144,104 @@ class Scraper:
         """Scrape stadium information."""
         instance = Scraper.get_instance()
         return instance._scraper_core.scrape_stadiums(race_date)
+
+    @staticmethod
+    def scrape_range(
+        kind: str,
+        start: Union[date, datetime, str],
+        end: Union[date, datetime, str],
+        stadiums: Optional[Iterable[int]] = None,
+    ) -> Iterator[Tuple[date, int, int, Dict[str, Any]]]:
+        """Scrape every race of a date range, yielding records as they finish."""
+        instance = Scraper.get_instance()
+        return instance._scraper_core.scrape_range(kind, start, end, stadiums)
+
+    @staticmethod
+    def scrape_race_bundle(
+        race_date: Union[date, datetime, str],
+        race_stadium_number: Optional[int] = None,
+        race_number: Optional[int] = None,
+        parts: Iterable[str] = BUNDLE_PARTS,
+        raise_on_error: Optional[bool] = None,
+    ) -> BatchResult:
+        """Scrape several kinds of each race in one pass."""
+        instance = Scraper.get_instance()
+        return instance._scraper_core.scrape_race_bundle(
+            race_date,
+            race_stadium_number,
+            race_number,
+            parts,
+            raise_on_error=raise_on_error,
+        )
+
+    @staticmethod
+    def iter_programs(
+        race_date: Union[date, datetime, str],
+        race_stadium_number: Optional[int] = None,
+        race_number: Optional[int] = None,
+    ) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        """Stream race programs, yielding each record as soon as it is ready."""
+        instance = Scraper.get_instance()
+        return instance._scraper_core.iter_races(
+            "programs", race_date, race_stadium_number, race_number
+        )
+
+    @staticmethod
+    def aiter_programs(
+        race_date: Union[date, datetime, str],
+        race_stadium_number: Optional[int] = None,
+        race_number: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[int, int, Dict[str, Any]]]:
+        """Stream race programs asynchronously."""
+        instance = Scraper.get_instance()
+        return instance._scraper_core.aiter_races(
+            "programs", race_date, race_stadium_number, race_number
+        )
+
+    @staticmethod
+    def iter_odds(
+        race_date: Union[date, datetime, str],
+        race_stadium_number: Optional[int] = None,
+        race_number: Optional[int] = None,
+    ) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        """Stream all odds, yielding each record as soon as it is ready."""
+        instance = Scraper.get_instance()
+        return instance._scraper_core.iter_races(
+            "odds", race_date, race_stadium_number, race_number
+        )
+
+    @staticmethod
+    def aiter_odds(
+        race_date: Union[date, datetime, str],
+        race_stadium_number: Optional[int] = None,
+        race_number: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[int, int, Dict[str, Any]]]:
+        """Stream all odds asynchronously."""
+        instance = Scraper.get_instance()
+        return instance._scraper_core.aiter_races(
+            "odds", race_date, race_stadium_number, race_number
+        )
+
+    @staticmethod
+    def iter_results(
+        race_date: Union[date, datetime, str],
+        race_stadium_number: Optional[int] = None,
+        race_number: Optional[int] = None,
+    ) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        """Stream race results, yielding each record as soon as it is ready."""
+        instance = Scraper.get_instance()
+        return instance._scraper_core.iter_races(
+            "results", race_date, race_stadium_number, race_number
+        )
+
+    @staticmethod
+    def aiter_results(
+        race_date: Union[date, datetime, str],
+        race_stadium_number: Optional[int] = None,
+        race_number: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[int, int, Dict[str, Any]]]:
+        """Stream race results asynchronously."""
+        instance = Scraper.get_instance()
+        return instance._scraper_core.aiter_races(
+            "results", race_date, race_stadium_number, race_number
+        )
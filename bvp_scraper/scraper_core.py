@@ -2,29 +2,113 @@
 Core scraper class that manages all specific scrapers.
 """
 
+import asyncio
+import itertools
+import logging
 import re
-from datetime import date, datetime
+import threading
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from datetime import date, datetime, timedelta
 from functools import partial
-from typing import Any, Dict, List, Optional, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import requests
 from tenacity import retry, stop_after_attempt, wait_fixed
 
 from .base_scraper import BaseScraper
+from .batch import BatchResult
+from .journal import BackfillJournal
+from .pipeline import extract_batch, unpack_records
+from .schedule import Schedule, ScheduleCache
+from .scheduler import FetchScheduler
+
+logger = logging.getLogger(__name__)
+
+# (race date, stadium number, race number)
+RaceKey = Tuple[date, int, int]
+
+# Parts of a race bundle by default: every per-race page of the site
+BUNDLE_PARTS: Tuple[str, ...] = ("programs", "previews", "odds", "results")
 
 
 class ScraperCore:
     """Core scraper that manages and orchestrates all specific scrapers."""
 
-    def __init__(self, session: Optional[requests.Session] = None):
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        stream: bool = False,
+        io_workers: int = 1,
+        parse_workers: int = 0,
+        track_memory: bool = False,
+        scheduler: Optional[FetchScheduler] = None,
+        lane: Optional[str] = None,
+        schedule_ttl: float = 60.0,
+        odds_cache_ttl: float = 0.0,
+        compact_odds: bool = False,
+    ):
         """
         Initialize scraper core.
 
         Args:
             session: Optional requests session for connection reuse
+            stream: Stop downloading pages once the part extraction needs is in
+            io_workers: Threads fetching page bytes in pipeline mode
+            parse_workers: Processes parsing pages; 0 disables pipeline mode
+            track_memory: Record peak parse-tree memory per page type; valid
+                with a single fetching thread only
+            scheduler: Optional fetch scheduler shared with other cores; it
+                replaces the fixed sleep after each request
+            lane: Scheduler lane of every request, e.g. "backfill"; default
+                each scraper's own lane
+            schedule_ttl: Seconds today's stadium schedule is reused; past
+                dates are cached for good
+            odds_cache_ttl: Seconds extracted odds pages are reused by the
+                other bet types on them, e.g. exacta then quinella; 0 always
+                fetches fresh odds
+            compact_odds: Return odds as fixed-point FixedPointOdds (see
+                bvp_scraper.fixed_point), win odds included
         """
         self.session = session or requests.Session()
+        self.stream = stream
+        self.io_workers = io_workers
+        self.parse_workers = parse_workers
+        self.track_memory = track_memory
+        self.scheduler = scheduler
+        self.lane = lane
+        self.odds_cache_ttl = odds_cache_ttl
+        self.compact_odds = compact_odds
+        # Stadium index of each date, shared by every scrape kind
+        self.schedules = ScheduleCache(self._load_schedule, schedule_ttl)
+        self.clock: Callable[[], datetime] = datetime.now  # Site's local time
+        # Betting deadlines still ahead in scraped programs; passed ones are
+        # evicted as new ones come in
+        self._deadlines: Dict[RaceKey, datetime] = {}
+        self._deadlines_lock = threading.Lock()
+        # One instance per scraper class; scrapers are reentrant, so all
+        # methods and threads share it
         self._scraper_instances: Dict[str, BaseScraper] = {}
+        # Pipeline pools, created on first use and shut down by close()
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self._pools_lock = threading.Lock()
 
         # Mapping of method names to scraper classes
         self._scraper_classes: Dict[str, str] = {
@@ -62,66 +146,851 @@ class ScraperCore:
             Callable method
         """
         if name in self._scraper_classes:
-            return lambda *args: self._scrape_method(name, *args)
+            return lambda *args, **kwargs: self._scrape_method(name, *args, **kwargs)
+
+        # iter_<kind> and aiter_<kind> stream the races of a per-race kind
+        prefix, _, kind = name.partition("_")
+        if prefix in ("iter", "aiter") and f"scrape_{kind}" in self._scraper_classes:
+            if kind != "stadiums":
+                return partial(getattr(self, f"{prefix}_races"), kind)
 
         raise AttributeError(
             f"'{self.__class__.__name__}' object has no attribute '{name}'"
         )
 
+    def __enter__(self) -> "ScraperCore":
+        """Use the core as a context manager that closes on exit."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the core."""
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the pipeline pools; later calls start new ones."""
+        with self._pools_lock:
+            pools = [self._io_pool, self._parse_pool]
+            self._io_pool = self._parse_pool = None
+
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown()
+
+    def peak_tree_memory(self) -> Dict[str, int]:
+        """
+        Report the largest parse tree seen for each page type.
+
+        Only pages parsed in this process are measured, so pipeline mode
+        reports nothing. Requires track_memory, and the sizes are only valid
+        when pages are fetched and parsed by a single thread (one worker and
+        no scheduler-driven concurrent page fetches): tracemalloc counts
+        the allocations of every thread.
+
+        Returns:
+            Peak tree size in bytes, keyed by page name
+        """
+        peaks: Dict[str, int] = {}
+        for scraper in self._scraper_instances.values():
+            for page, size in scraper.peak_tree_memory.items():
+                peaks[page] = max(peaks.get(page, 0), size)
+
+        return peaks
+
+    def attach_scheduler(self, scheduler: FetchScheduler) -> None:
+        """
+        Attach a fetch scheduler to the core and every scraper it has made.
+
+        Args:
+            scheduler: Scheduler to share, e.g. with other cores
+        """
+        self.scheduler = scheduler
+        for scraper in self._scraper_instances.values():
+            scraper.scheduler = scheduler
+
+    def pages_per_race(self, kind: str) -> int:
+        """
+        Count the page requests scraping one race of a kind takes.
+
+        Args:
+            kind: Scraping kind, e.g. "odds" or "win_odds"
+
+        Returns:
+            Number of pages fetched per race
+
+        Raises:
+            ValueError: If the kind is not a per-race kind
+        """
+        method_name = self._race_method_name(kind)
+        scraper = self._get_scraper_instance(method_name)
+        return len(scraper.PAGES[self._resolve_scraper_method(scraper, method_name)])
+
+    def scrape_range(
+        self,
+        kind: str,
+        start: Union[date, datetime, str],
+        end: Union[date, datetime, str],
+        stadiums: Optional[Iterable[int]] = None,
+        workers: Optional[int] = None,
+        on_error: Optional[Callable[[date, int, int, Exception], None]] = None,
+        on_skip: Optional[Callable[[date, int, int, str], None]] = None,
+        journal: Optional[BackfillJournal] = None,
+        output_for: Optional[
+            Callable[[date, int, int, Dict[str, Any]], Optional[str]]
+        ] = None,
+    ) -> Iterator[Tuple[date, int, int, Dict[str, Any]]]:
+        """
+        Scrape every race of a date range, yielding records as they finish.
+
+        The whole range is planned up front: the stadiums holding races on
+        each date are looked up in parallel (unless given) and every
+        (date, stadium, race) is queued. The races are then scraped in
+        parallel across dates and stadiums, with a bounded number in
+        flight. They share the core's FetchScheduler; without one, a
+        scheduler keeping them to the pace of a single thread is attached.
+
+        Args:
+            kind: Scraping kind, e.g. "results", "programs" or "win_odds"
+            start: First race date
+            end: Last race date (inclusive)
+            stadiums: Optional stadium numbers to restrict to
+            workers: Races scraped at the same time; default io_workers
+            on_error: Called with the race key and exception of a race that
+                still fails after retries; without it the failure is raised
+            on_skip: Called with the race key and reason of each race the
+                plan leaves out
+            journal: Optional checkpoint journal; races it has done are
+                skipped, failures are recorded and a race is marked done once
+                the consumer asks for the next record. A record the loop
+                stops at (break or exception) is not marked done, so a
+                restart scrapes it again.
+            output_for: Called with the race key and record of a race being
+                marked done; returns where the consumer wrote it, which is
+                recorded in the journal
+
+        Yields:
+            (race date, stadium number, race number, record) tuples in
+            completion order
+
+        Raises:
+            ValueError: If the kind is not a per-race kind or a stadium
+                number is invalid
+        """
+        method_name = self._race_method_name(kind)
+        scraper = self._get_scraper_instance(method_name)
+        workers = max(workers or self.io_workers, 1)
+        self._ensure_rate_budget(workers)
+        kind = method_name[len("scrape_") :]
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            plan, skipped = self._plan_range(pool, method_name, start, end, stadiums)
+            self._report_skipped(method_name, skipped, on_skip)
+            if journal is not None:
+                journal.plan(kind, plan)
+                done = journal.completed(kind)
+                plan = [key for key in plan if key not in done]
+
+            def failed(key: RaceKey, error: Exception) -> None:
+                if journal is not None:
+                    journal.mark_failed(kind, *key, repr(error))
+                if on_error is None:
+                    raise error
+                on_error(*key, error)
+
+            for key, record in self._stream_races(
+                pool,
+                self._retrying_scrape(scraper, method_name),
+                plan,
+                workers * 2,
+                failed,
+            ):
+                yield (*key, record)
+                # The consumer has handled the record once it asks for more
+                if journal is not None:
+                    output = None if output_for is None else output_for(*key, record)
+                    journal.mark_done(kind, *key, output)
+
+    def iter_races(
+        self,
+        kind: str,
+        race_date: Union[date, datetime, str],
+        race_stadium_number: Optional[int] = None,
+        race_number: Optional[int] = None,
+        workers: Optional[int] = None,
+        on_error: Optional[Callable[[date, int, int, Exception], None]] = None,
+        on_skip: Optional[Callable[[date, int, int, str], None]] = None,
+    ) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        """
+        Scrape the races of a date, yielding each record as soon as it is ready.
+
+        Unlike the scrape_* methods nothing is collected: at most twice as
+        many races as workers are in flight, so memory stays flat however
+        many races there are. Also available as iter_<kind>, e.g.
+        iter_results(race_date).
+
+        Args:
+            kind: Scraping kind, e.g. "results", "programs" or "odds"
+            race_date: Race date
+            race_stadium_number: Stadium number (1-24), None for all stadiums
+            race_number: Race number (1-12), None for all races
+            workers: Races scraped at the same time; default io_workers
+            on_error: Called with the race key and exception of a race that
+                still fails after retries; without it the failure is raised
+            on_skip: Called with the race key and reason of each race the
+                plan leaves out
+
+        Yields:
+            (stadium number, race number, record) tuples in completion order
+
+        Raises:
+            ValueError: If the kind is not a per-race kind or parameters are
+                invalid
+        """
+        method_name = self._race_method_name(kind)
+        planned, skipped = self.plan_races(
+            method_name, race_date, race_stadium_number, race_number
+        )
+        self._report_skipped(method_name, skipped, on_skip)
+
+        def failed(key: RaceKey, error: Exception) -> None:
+            if on_error is None:
+                raise error
+            on_error(*key, error)
+
+        scraper = self._get_scraper_instance(method_name)
+        workers = max(workers or self.io_workers, 1)
+        self._ensure_rate_budget(workers)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for (_, stadium_num, race_num), record in self._stream_races(
+                pool,
+                self._retrying_scrape(scraper, method_name),
+                planned,
+                workers * 2,
+                failed,
+            ):
+                yield stadium_num, race_num, record
+
+    async def aiter_races(
+        self,
+        kind: str,
+        race_date: Union[date, datetime, str],
+        race_stadium_number: Optional[int] = None,
+        race_number: Optional[int] = None,
+        workers: Optional[int] = None,
+        on_error: Optional[Callable[[date, int, int, Exception], None]] = None,
+        on_skip: Optional[Callable[[date, int, int, str], None]] = None,
+    ) -> AsyncIterator[Tuple[int, int, Dict[str, Any]]]:
+        """
+        Async counterpart of iter_races, also available as aiter_<kind>.
+
+        Scraping runs in the event loop's default executor, so the loop
+        stays free while pages download. Arguments are those of iter_races.
+
+        Yields:
+            (stadium number, race number, record) tuples in completion order
+        """
+        records = self.iter_races(
+            kind,
+            race_date,
+            race_stadium_number,
+            race_number,
+            workers,
+            on_error,
+            on_skip,
+        )
+        loop = asyncio.get_running_loop()
+        finished = object()
+        try:
+            while True:
+                item = await loop.run_in_executor(None, next, records, finished)
+                if item is finished:
+                    return
+                yield item
+        finally:
+            # Stop the scraping threads when the consumer stops early
+            await loop.run_in_executor(None, records.close)
+
+    def scrape_race_bundle(
+        self,
+        race_date: Union[date, datetime, str],
+        race_stadium_number: Optional[int] = None,
+        race_number: Optional[int] = None,
+        parts: Iterable[str] = BUNDLE_PARTS,
+        workers: Optional[int] = None,
+        raise_on_error: Optional[bool] = None,
+    ) -> BatchResult:
+        """
+        Scrape several kinds of each race in one pass.
+
+        The races of every part are planned against one stadium lookup, and
+        each race's pages are fetched once however many parts use them, e.g.
+        "odds" and "win_odds" share a page. Races are scraped in parallel,
+        each page with its own retries. Parts that cannot be scraped yet,
+        such as results of races not run, are left out of a race's bundle
+        and reported in skipped; races that still fail after retries are
+        left out and reported in the result's errors.
+
+        Args:
+            race_date: Race date
+            race_stadium_number: Stadium number (1-24), None for all stadiums
+            race_number: Race number (1-12), None for all races
+            parts: Scraping kinds to bundle, e.g. "programs" or "win_odds"
+            workers: Races scraped at the same time; default io_workers
+            raise_on_error: Raise BatchError once every race has been tried
+                if any failed; default only when a single race is asked for
+
+        Returns:
+            Records keyed by stadium number, race number and part
+
+        Raises:
+            ValueError: If a part is not a per-race kind or parameters are
+                invalid
+            BatchError: If raise_on_error and a race failed
+        """
+        parsed_date = self.parse_date(race_date)
+        method_names = {part: self._race_method_name(part) for part in parts}
+
+        # Parts to scrape of each race, and why the others are skipped
+        bundles: Dict[RaceKey, List[str]] = {}
+        skipped: Dict[RaceKey, List[str]] = {}
+        for part, method_name in method_names.items():
+            planned, part_skipped = self.plan_races(
+                method_name, parsed_date, race_stadium_number, race_number
+            )
+            for key in planned:
+                bundles.setdefault(key, []).append(part)
+            for key, reason in part_skipped.items():
+                skipped.setdefault(key, []).append(f"{part}: {reason}")
+        response = BatchResult(
+            skipped={key: "; ".join(reasons) for key, reasons in skipped.items()}
+        )
+        if response.skipped:
+            logger.info("Skipped parts of %d races", len(response.skipped))
+        records: Dict[RaceKey, Dict[str, Any]] = {}
+        workers = max(workers or self.io_workers, 1)
+        self._ensure_rate_budget(workers)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            records.update(
+                self._stream_races(
+                    pool,
+                    lambda key: self._scrape_bundle(key, bundles[key], method_names),
+                    bundles,
+                    workers * 2,
+                    response.add_error,
+                )
+            )
+
+        # Keep the planned order; fully skipped stadiums stay empty
+        for key in sorted({*bundles, *skipped}, key=lambda key: key[1:]):
+            _, stadium_num, race_num = key
+            response.setdefault(stadium_num, {})
+            if key in records:
+                response[stadium_num][race_num] = records[key]
+
+        if raise_on_error is None:
+            raise_on_error = race_stadium_number is not None and race_number is not None
+        self._finish_batch("scrape_race_bundle", response, raise_on_error)
+        return response
+
+    def _scrape_bundle(
+        self, key: RaceKey, parts: List[str], method_names: Dict[str, str]
+    ) -> Dict[str, Any]:
+        """
+        Fetch the pages of a race once and extract every part from them.
+
+        Args:
+            key: Race to scrape
+            parts: Parts to extract
+            method_names: Scraping method name of each part
+
+        Returns:
+            Records keyed by part
+        """
+        targets = []
+        for part in parts:
+            scraper = self._get_scraper_instance(method_names[part])
+            method = self._resolve_scraper_method(scraper, method_names[part])
+            targets.append((part, scraper, method))
+
+        soups = {}
+        try:
+            # Page names are unique across scrapers, so they identify a page
+            for _, scraper, method in targets:
+                for page in scraper.PAGES[method]:
+                    if page not in soups:
+                        url = scraper.build_url(page, *key)
+                        content, declared_charset = self._call_with_retry(
+                            partial(scraper.fetch, url)
+                        )
+                        soups[page] = scraper.parse_html(content, declared_charset)
+
+            bundle = {}
+            for part, scraper, method in targets:
+                pages = {page: soups[page] for page in scraper.PAGES[method]}
+                bundle[part] = scraper.extract(method, pages, *key)
+                self._remember_deadline(key, bundle[part])
+        finally:
+            for soup in soups.values():
+                soup.decompose()
+
+        return bundle
+
+    def _stream_races(
+        self,
+        pool: ThreadPoolExecutor,
+        scrape: Callable[[RaceKey], Dict[str, Any]],
+        keys: Iterable[RaceKey],
+        window: int,
+        on_error: Callable[[RaceKey, Exception], None],
+    ) -> Iterator[Tuple[RaceKey, Dict[str, Any]]]:
+        """
+        Scrape races in a thread pool, yielding records in completion order.
+
+        Args:
+            pool: Thread pool scraping the races
+            scrape: Scrapes the record of a race, retries included
+            keys: Races to scrape
+            window: Races in flight at most
+            on_error: Called with the key and exception of a race that still
+                fails after retries; it may raise to stop the stream
+
+        Yields:
+            (race key, record) tuples
+        """
+        keys = iter(keys)
+
+        def submit(key: RaceKey) -> None:
+            pending[pool.submit(scrape, key)] = key
+
+        # Keep the queue short so memory stays flat over long ranges
+        pending: Dict[Future, RaceKey] = {}
+        for key in itertools.islice(keys, window):
+            submit(key)
+
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = pending.pop(future)
+                    for next_key in itertools.islice(keys, 1):
+                        submit(next_key)
+
+                    try:
+                        record = future.result()
+                    except Exception as e:
+                        on_error(key, e)
+                        continue
+
+                    yield key, record
+        finally:
+            # Races not started yet are dropped when the stream stops early
+            for future in pending:
+                future.cancel()
+
+    def _retrying_scrape(
+        self, scraper: BaseScraper, method_name: str
+    ) -> Callable[[RaceKey], Dict[str, Any]]:
+        """Scrape one race of a method, retrying failures."""
+        return lambda key: self._call_with_retry(
+            partial(self._execute_scraper_method, scraper, method_name, *key)
+        )
+
+    def _race_method_name(self, kind: str) -> str:
+        """
+        Get the scraping method of a per-race kind.
+
+        Args:
+            kind: Scraping kind, with or without the scrape_ prefix
+
+        Returns:
+            Method name, e.g. scrape_results
+
+        Raises:
+            ValueError: If the kind is not a per-race kind
+        """
+        method_name = kind if kind.startswith("scrape_") else f"scrape_{kind}"
+        if method_name not in self._scraper_classes or method_name == "scrape_stadiums":
+            raise ValueError(f"Unknown race scraping kind: {kind}")
+
+        return method_name
+
+    def _plan_range(
+        self,
+        pool: ThreadPoolExecutor,
+        method_name: str,
+        start: Union[date, datetime, str],
+        end: Union[date, datetime, str],
+        stadiums: Optional[Iterable[int]],
+    ) -> Tuple[List[RaceKey], Dict[RaceKey, str]]:
+        """
+        Plan the races of a date range.
+
+        Args:
+            pool: Thread pool looking up the schedule of each date
+            method_name: Scraping method name
+            start: First race date
+            end: Last race date (inclusive)
+            stadiums: Optional stadium numbers to restrict to
+
+        Returns:
+            Races to scrape and the skipped ones with their reasons
+        """
+        first = self.parse_date(start)
+        dates = [
+            first + timedelta(days=offset)
+            for offset in range((self.parse_date(end) - first).days + 1)
+        ]
+        stadiums = None if stadiums is None else list(stadiums)
+
+        def plan_date(race_date: date) -> Tuple[List[RaceKey], Dict[RaceKey, str]]:
+            if stadiums is None:
+                return self.plan_races(method_name, race_date)
+
+            planned, skipped = [], {}
+            for stadium in stadiums:
+                stadium_planned, stadium_skipped = self.plan_races(
+                    method_name, race_date, stadium
+                )
+                planned.extend(stadium_planned)
+                skipped.update(stadium_skipped)
+            return planned, skipped
+
+        planned, skipped = [], {}
+        for date_planned, date_skipped in pool.map(plan_date, dates):
+            planned.extend(date_planned)
+            skipped.update(date_skipped)
+
+        return planned, skipped
+
+    def plan_races(
+        self,
+        method_name: str,
+        race_date: Union[date, datetime, str],
+        race_stadium_number: Optional[int] = None,
+        race_number: Optional[int] = None,
+    ) -> Tuple[List[RaceKey], Dict[RaceKey, str]]:
+        """
+        Plan the races a scraping method can get, skipping those that cannot.
+
+        Races are skipped when the stadium index shows no meet, a cancelled
+        meet or a full race list with fewer races, and when results or previews are
+        asked for races that have not run yet (a future date, or a betting
+        deadline still ahead in an already scraped program). The index is
+        only fetched when the stadiums are not given; otherwise it is used
+        if already cached.
+
+        Args:
+            method_name: Scraping method name, e.g. scrape_results
+            race_date: Race date
+            race_stadium_number: Stadium number (1-24), None for all stadiums
+            race_number: Race number (1-12), None for all races
+
+        Returns:
+            Races to scrape and the skipped ones with their reasons
+
+        Raises:
+            ValueError: If parameters are invalid
+        """
+        race_date = self.parse_date(race_date)
+        if race_stadium_number is None:
+            schedule = self.schedules.get(race_date)
+            stadium_numbers = list(schedule)
+        else:
+            schedule = self.schedules.peek(race_date) or {}
+            stadium_numbers = self._get_race_stadium_numbers(
+                race_date, race_stadium_number
+            )
+        race_numbers = self._get_race_numbers(race_number)
+        now = self.clock()
+
+        planned, skipped = [], {}
+        for stadium_number in stadium_numbers:
+            for race in race_numbers:
+                key = (race_date, stadium_number, race)
+                reason = self._skip_reason(method_name, schedule, key, now)
+                if reason:
+                    skipped[key] = reason
+                else:
+                    planned.append(key)
+
+        return planned, skipped
+
+    def _skip_reason(
+        self,
+        method_name: str,
+        schedule: Dict[int, Dict[str, Any]],
+        key: RaceKey,
+        now: datetime,
+    ) -> Optional[str]:
+        """Tell why a race cannot be scraped yet, or None if it can."""
+        race_date, stadium_number, race_number = key
+
+        # Without a parsed index nothing is known about the stadiums
+        if schedule:
+            stadium = schedule.get(stadium_number)
+            if stadium is None:
+                return "no meet at the stadium on this date"
+            if stadium.get("cancelled"):
+                return "meet cancelled"
+            race_count = stadium.get("race_count")
+            if race_count is not None and race_number > race_count:
+                return f"stadium holds {race_count} races"
+
+        if method_name == "scrape_results":
+            with self._deadlines_lock:
+                deadline = self._deadlines.get(key)
+            if race_date > now.date() or (deadline is not None and now < deadline):
+                return "race has not run yet"
+
+        if method_name == "scrape_previews" and race_date > now.date():
+            return "previews are not published yet"
+
+        return None
+
     def _scrape_method(
         self,
         method_name: str,
         race_date: Union[date, datetime, str],
         race_stadium_number: Optional[int] = None,
         race_number: Optional[int] = None,
+        raise_on_error: Optional[bool] = None,
     ) -> Dict[str, Any]:
         """
         Execute scraping method with proper parameter handling.
 
+        A race that still fails after retries (a network or parse failure)
+        does not stop the others; it is left out of the records and reported
+        in the result's errors.
+
         Args:
             method_name: Name of the scraping method
             race_date: Race date
             race_stadium_number: Stadium number (1-24), None for all stadiums
             race_number: Race number (1-12), None for all races
+            raise_on_error: Raise BatchError once every race has been tried
+                if any failed; default only when a single race is asked for
 
         Returns:
-            Dictionary containing scraped data
+            Dictionary containing scraped data; a BatchResult for race
+            scraping methods
 
         Raises:
             ValueError: If parameters are invalid
+            BatchError: If raise_on_error and a race failed
         """
-        parsed_date = self._parse_date(race_date)
+        parsed_date = self.parse_date(race_date)
 
         # Special handling for stadium scraping (no stadium/race number needed)
         if method_name == "scrape_stadiums":
-            scraper = self._get_scraper_instance(method_name)
-            return scraper.scrape(parsed_date, 0, 0)  # Dummy parameters
+            return self.schedules.get(parsed_date)
 
-        # Get stadium numbers to process
-        stadium_numbers = self._get_race_stadium_numbers(
-            parsed_date, race_stadium_number
+        planned, skipped = self.plan_races(
+            method_name, parsed_date, race_stadium_number, race_number
         )
-        race_numbers = self._get_race_numbers(race_number)
+        self._report_skipped(method_name, skipped)
+
+        # Race numbers to scrape by stadium; fully skipped stadiums stay empty
+        races: Dict[int, List[int]] = {}
+        for _, stadium_num, race_num in planned:
+            races.setdefault(stadium_num, []).append(race_num)
+        for _, stadium_num, _ in skipped:
+            races.setdefault(stadium_num, [])
 
-        response = {}
         scraper = self._get_scraper_instance(method_name)
+        response = BatchResult(
+            {stadium_num: {} for stadium_num in races}, skipped=skipped
+        )
 
-        for stadium_num in stadium_numbers:
-            response[stadium_num] = {}
-            for race_num in race_numbers:
-                response[stadium_num][race_num] = self._call_with_retry(
-                    partial(
-                        self._execute_scraper_method,
-                        scraper,
-                        method_name,
-                        parsed_date,
-                        stadium_num,
-                        race_num,
-                    )
-                )
+        if self.parse_workers > 0:
+            self._scrape_pipelined(scraper, method_name, parsed_date, races, response)
+        else:
+            scrape = self._retrying_scrape(scraper, method_name)
+            for stadium_num, race_numbers in races.items():
+                for race_num in race_numbers:
+                    key = (parsed_date, stadium_num, race_num)
+                    try:
+                        response[stadium_num][race_num] = scrape(key)
+                    except Exception as e:
+                        response.add_error(key, e)
 
+        if raise_on_error is None:
+            raise_on_error = race_stadium_number is not None and race_number is not None
+        self._finish_batch(method_name, response, raise_on_error)
         return response
 
+    def retry_failed(
+        self, kind: str, result: BatchResult, raise_on_error: bool = False
+    ) -> BatchResult:
+        """
+        Scrape the failed races of a batch again, updating it in place.
+
+        Args:
+            kind: Scraping kind of the batch, e.g. "results"
+            result: Batch returned by a scrape_* method
+            raise_on_error: Raise BatchError if a race fails again
+
+        Returns:
+            The same batch, with the races that now succeeded moved from
+            errors to the records
+
+        Raises:
+            ValueError: If the kind is not a per-race kind
+            BatchError: If raise_on_error and a race failed again
+        """
+        method_name = self._race_method_name(kind)
+        scrape = self._retrying_scrape(
+            self._get_scraper_instance(method_name), method_name
+        )
+
+        for key in list(result.errors):
+            _, stadium_num, race_num = key
+            try:
+                record = scrape(key)
+            except Exception as e:
+                result.add_error(key, e)
+                continue
+
+            result.setdefault(stadium_num, {})[race_num] = record
+            del result.errors[key]
+
+        self._finish_batch(method_name, result, raise_on_error)
+        return result
+
+    def _finish_batch(
+        self, method_name: str, result: BatchResult, raise_on_error: bool
+    ) -> None:
+        """Report the failed races of a batch, raising if asked to."""
+        if result.errors:
+            logger.warning(
+                "%d races of %s failed: %s",
+                len(result.errors),
+                method_name,
+                ", ".join(map(str, sorted(result.errors))),
+            )
+        if raise_on_error:
+            result.raise_for_errors()
+
+    def _scrape_pipelined(
+        self,
+        scraper: BaseScraper,
+        method_name: str,
+        race_date: date,
+        races: Dict[int, List[int]],
+        response: BatchResult,
+    ) -> None:
+        """
+        Fetch pages in I/O threads and extract them in a process pool.
+
+        Args:
+            scraper: Scraper instance
+            method_name: Method name
+            race_date: Parsed race date
+            races: Race numbers to process, keyed by stadium number
+            response: Batch to add the records and failed races to
+        """
+        method = self._resolve_scraper_method(scraper, method_name)
+        pages = scraper.PAGES[method]
+
+        io_pool, parse_pool = self._pipeline_pools()
+
+        fetches = {}
+        try:
+            # Queue every download up front; the I/O threads work through them
+            for stadium_num, race_numbers in races.items():
+                for race_num in race_numbers:
+                    for page in pages:
+                        url = scraper.build_url(page, race_date, stadium_num, race_num)
+                        fetches[stadium_num, race_num, page] = io_pool.submit(
+                            self._call_with_retry, partial(scraper.fetch, url)
+                        )
+
+            # Hand each stadium to the parse pool as soon as its pages are in,
+            # while the following stadiums are still downloading
+            parse_futures = []
+            for stadium_num, race_numbers in races.items():
+                items = []
+                for race_num in race_numbers:
+                    futures = {
+                        page: fetches.pop((stadium_num, race_num, page))
+                        for page in pages
+                    }
+                    try:
+                        raw_pages = {
+                            page: future.result() for page, future in futures.items()
+                        }
+                    except Exception as e:
+                        response.add_error((race_date, stadium_num, race_num), e)
+                        continue
+                    items.append((stadium_num, race_num, raw_pages))
+
+                if not items:
+                    continue
+                future = parse_pool.submit(
+                    extract_batch,
+                    type(scraper).__module__,
+                    type(scraper).__name__,
+                    method,
+                    race_date,
+                    items,
+                    self._scraper_settings(type(scraper).__name__),
+                )
+                parse_futures.append((future, [item[:2] for item in items]))
+
+            for future, batch_races in parse_futures:
+                try:
+                    records = unpack_records(future.result())
+                except Exception as e:
+                    for stadium_num, race_num in batch_races:
+                        response.add_error((race_date, stadium_num, race_num), e)
+                    continue
+
+                for stadium_num, race_num, record in records:
+                    self._remember_deadline((race_date, stadium_num, race_num), record)
+                    response[stadium_num][race_num] = record
+        finally:
+            # Downloads of races not reached are dropped when a bug stops
+            # the batch; the pools stay up for the next call
+            for future in fetches.values():
+                future.cancel()
+
+    def _pipeline_pools(self) -> Tuple[ThreadPoolExecutor, ProcessPoolExecutor]:
+        """
+        Get the pipeline's I/O thread pool and parse process pool.
+
+        The pools are created on first use and kept for later calls, so
+        worker processes are spawned and import the scrapers only once.
+
+        Returns:
+            I/O pool and parse pool
+        """
+        with self._pools_lock:
+            if self._io_pool is None:
+                self._ensure_rate_budget(self.io_workers)
+                self._io_pool = ThreadPoolExecutor(max_workers=self.io_workers)
+            if self._parse_pool is None:
+                self._parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+            return self._io_pool, self._parse_pool
+
+    def _resolve_scraper_method(self, scraper: BaseScraper, method_name: str) -> str:
+        """
+        Resolve the scraper method that serves a core method.
+
+        Args:
+            scraper: Scraper instance
+            method_name: Core method name (e.g. scrape_win_odds)
+
+        Returns:
+            Scraper method name (e.g. scrape_win)
+        """
+        # Handle odds-specific methods
+        odds_match = re.match(r"^scrape_([a-zA-Z_]+)_odds$", method_name)
+        if odds_match:
+            odds_type = odds_match.group(1)
+            if hasattr(scraper, f"scrape_{odds_type}"):
+                return f"scrape_{odds_type}"
+
+        # Default to main scrape method
+        return "scrape"
+
     def _execute_scraper_method(
         self,
         scraper: BaseScraper,
@@ -143,17 +1012,60 @@ class ScraperCore:
         Returns:
             Scraped data
         """
-        # Handle odds-specific methods
-        odds_match = re.match(r"^scrape_([a-zA-Z_]+)_odds$", method_name)
-        if odds_match:
-            odds_type = odds_match.group(1)
-            if hasattr(scraper, f"scrape_{odds_type}"):
-                return getattr(scraper, f"scrape_{odds_type}")(
-                    race_date, stadium_number, race_number
-                )
+        method = self._resolve_scraper_method(scraper, method_name)
+        record = getattr(scraper, method)(race_date, stadium_number, race_number)
+        self._remember_deadline((race_date, stadium_number, race_number), record)
+        return record
 
-        # Default to main scrape method
-        return scraper.scrape(race_date, stadium_number, race_number)
+    def _remember_deadline(self, key: RaceKey, record: Any) -> None:
+        """Keep the betting deadline of a scraped program for race planning."""
+        closed_at = isinstance(record, dict) and record.get("race_closed_at")
+        if not closed_at:
+            return
+
+        try:
+            deadline = datetime.strptime(closed_at, "%Y-%m-%d %H:%M:%S")
+        except (TypeError, ValueError):
+            return
+
+        # Only deadlines still ahead hold a race back, so passed ones go
+        now = self.clock()
+        with self._deadlines_lock:
+            for passed in [k for k, d in self._deadlines.items() if d <= now]:
+                del self._deadlines[passed]
+            if deadline > now:
+                self._deadlines[key] = deadline
+
+    @staticmethod
+    def _report_skipped(
+        method_name: str,
+        skipped: Dict[RaceKey, str],
+        on_skip: Optional[Callable[[date, int, int, str], None]] = None,
+    ) -> None:
+        """Log the races a plan left out and pass each one to on_skip."""
+        if skipped:
+            logger.info("Skipped %d races of %s", len(skipped), method_name)
+        if on_skip is not None:
+            for key, reason in skipped.items():
+                on_skip(*key, reason)
+
+    def _ensure_rate_budget(self, workers: int) -> None:
+        """
+        Give parallel scraping a shared rate budget when none is attached.
+
+        A single thread is spaced by the sleep after each request; several
+        threads would multiply that rate, so they share a scheduler granting
+        requests at the same pace instead.
+
+        Args:
+            workers: Threads about to send requests
+        """
+        if workers <= 1 or self.scheduler is not None:
+            return
+
+        delay = self._get_scraper_instance("scrape_stadiums").seconds
+        logger.info("Limiting %d workers to one request every %ss", workers, delay)
+        self.attach_scheduler(FetchScheduler(requests_per_second=1.0 / delay))
 
     def _get_scraper_instance(self, method_name: str) -> BaseScraper:
         """
@@ -168,11 +1080,11 @@ class ScraperCore:
         Raises:
             ValueError: If scraper class is not found
         """
-        if method_name not in self._scraper_instances:
-            scraper_class_name = self._scraper_classes.get(method_name)
-            if not scraper_class_name:
-                raise ValueError(f"Unknown scraper method: {method_name}")
+        scraper_class_name = self._scraper_classes.get(method_name)
+        if not scraper_class_name:
+            raise ValueError(f"Unknown scraper method: {method_name}")
 
+        if scraper_class_name not in self._scraper_instances:
             # Import and instantiate scraper class
             module_name = self._module_mapping.get(scraper_class_name)
             if not module_name:
@@ -183,13 +1095,28 @@ class ScraperCore:
                     f"bvp_scraper.scrapers.{module_name}", fromlist=[scraper_class_name]
                 )
                 scraper_class = getattr(module, scraper_class_name)
-                self._scraper_instances[method_name] = scraper_class(self.session)
             except (ImportError, AttributeError) as e:
                 raise ValueError(
                     f"Could not load scraper class {scraper_class_name}: {e}"
                 ) from e
 
-        return self._scraper_instances[method_name]
+            scraper = scraper_class(self.session)
+            scraper.stream = self.stream
+            scraper.track_memory = self.track_memory
+            scraper.scheduler = self.scheduler
+            if self.lane:
+                scraper.lane = self.lane
+            for name, value in self._scraper_settings(scraper_class_name).items():
+                setattr(scraper, name, value)
+            self._scraper_instances.setdefault(scraper_class_name, scraper)
+
+        return self._scraper_instances[scraper_class_name]
+
+    def _scraper_settings(self, scraper_class_name: str) -> Dict[str, Any]:
+        """Get the core options applying to scrapers of one class only."""
+        if scraper_class_name == "OddsScraper":
+            return {"cache_ttl": self.odds_cache_ttl, "compact": self.compact_odds}
+        return {}
 
     def _get_race_stadium_numbers(
         self, race_date: date, race_stadium_number: Optional[int]
@@ -209,9 +1136,7 @@ class ScraperCore:
         """
         if race_stadium_number is None:
             # Get all stadiums for the date
-            stadium_scraper = self._get_scraper_instance("scrape_stadiums")
-            stadiums_data = stadium_scraper.scrape(race_date, 0, 0)
-            return list(stadiums_data.keys())
+            return list(self.schedules.get(race_date))
 
         # Validate single stadium number
         if not isinstance(race_stadium_number, int) or not (
@@ -221,6 +1146,19 @@ class ScraperCore:
 
         return [race_stadium_number]
 
+    def _load_schedule(self, race_date: date) -> Schedule:
+        """
+        Scrape the stadium index of a date for the schedule cache.
+
+        Args:
+            race_date: Race date
+
+        Returns:
+            Stadium information keyed by stadium number
+        """
+        stadium_scraper = self._get_scraper_instance("scrape_stadiums")
+        return self._call_with_retry(partial(stadium_scraper.scrape, race_date, 0, 0))
+
     def _get_race_numbers(self, race_number: Optional[int]) -> List[int]:
         """
         Get list of race numbers to process.
@@ -242,7 +1180,7 @@ class ScraperCore:
 
         return [race_number]
 
-    def _parse_date(self, date_input: Union[date, datetime, str]) -> date:
+    def parse_date(self, date_input: Union[date, datetime, str]) -> date:
         """
         Parse various date input formats to date object.
 
@@ -251,11 +1189,15 @@ class ScraperCore:
 
         Returns:
             date object
+
+        Raises:
+            ValueError: If the input is not a date, datetime or string
         """
-        if isinstance(date_input, date):
-            return date_input
-        elif isinstance(date_input, datetime):
+        # datetime is a subclass of date, so it has to be checked first
+        if isinstance(date_input, datetime):
             return date_input.date()
+        elif isinstance(date_input, date):
+            return date_input
         elif isinstance(date_input, str):
             from dateutil.parser import parse
 
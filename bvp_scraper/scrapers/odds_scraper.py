@@ -2,15 +2,94 @@
 Odds scraper for all betting odds information.
 """
 
+import copy
+import math
+import re
+import threading
+import time
 from datetime import date, datetime
-from typing import Any, Dict, Union
+from typing import Any, ClassVar, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import requests
+from bs4.element import Tag
 
 from ..base_scraper import BaseScraper
+from ..combinations import (
+    BOAT_COUNT,
+    PAIRS,
+    empty_odds,
+    empty_pair_odds,
+    empty_triple_odds,
+    pair_index,
+    triple_index,
+)
+from ..fixed_point import compact_odds
+from ..parse_context import ParseContext
+
+# One bet-type table cell grid row, with spanned cells repeated
+GridRow = List[Optional[Tag]]
+
+# Odds cell texts of combinations withdrawn from sale (boat withdrawn)
+CANCELLED_TEXTS = frozenset({"欠場", "取消"})
 
 
 class OddsScraper(BaseScraper):
     """Scraper for betting odds information."""
 
+    PAGES: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        "scrape": ("oddstf", "odds2tf", "oddsk", "odds3t", "odds3f"),
+        "scrape_win": ("oddstf",),
+        "scrape_place": ("oddstf",),
+        "scrape_exacta": ("odds2tf",),
+        "scrape_quinella": ("odds2tf",),
+        "scrape_quinella_place": ("oddsk",),
+        "scrape_trifecta": ("odds3t",),
+        "scrape_trio": ("odds3f",),
+    }
+
+    LANE: ClassVar[str] = "live_odds"
+
+    SELECTORS: ClassVar[Dict[str, Dict[str, str]]] = {
+        "oddstf": {
+            "win_odds": "body main div div div div:nth-child(2) div:nth-child({level + 6}) div:nth-child(1) div:nth-child(2) table tbody:nth-child({boat}) tr td:nth-child(3)",
+            "place_odds": "body main div div div div:nth-child(2) div:nth-child({level + 6}) div:nth-child(2) div:nth-child(2) table tbody:nth-child({boat}) tr td:nth-child(3)",
+        },
+        "odds2tf": {
+            "odds_tables": "body main table:has(td.oddsPoint)",
+        },
+        "oddsk": {
+            "odds_tables": "body main table:has(td.oddsPoint)",
+        },
+        "odds3t": {
+            "odds_tables": "body main table:has(td.oddsPoint)",
+        },
+        "odds3f": {
+            "odds_tables": "body main table:has(td.oddsPoint)",
+        },
+    }
+
+    def __init__(
+        self, session: Optional[requests.Session] = None, compact: bool = False
+    ):
+        """
+        Initialize odds scraper.
+
+        Args:
+            session: Optional requests session for connection reuse
+            compact: Return odds as fixed-point FixedPointOdds (see
+                bvp_scraper.fixed_point) instead of float32 arrays, win odds
+                as a 6-element vector by boat
+        """
+        super().__init__(session)
+        self.compact = compact
+        self.max_workers = 5  # One thread per odds page, with a scheduler
+        # Seconds an extracted page stays reusable by the other bet types on
+        # it; 0 disables the cache, as cached odds go stale for live polling
+        self.cache_ttl = 0.0
+        self._results: Dict[Tuple[str, date, int, int], Tuple[float, Any]] = {}
+        self._results_lock = threading.Lock()
+
     def scrape(
         self,
         race_date: Union[date, datetime, str],
@@ -28,25 +107,115 @@ class OddsScraper(BaseScraper):
         Returns:
             Dictionary containing all odds data
         """
-        response = {}
+        # Each distinct odds page is fetched once and feeds every bet type on it
+        return self.scrape_pages("scrape", race_date, race_stadium_number, race_number)
 
-        # Scrape all types of odds
-        response.update(self.scrape_win(race_date, race_stadium_number, race_number))
-        response.update(self.scrape_place(race_date, race_stadium_number, race_number))
-        response.update(self.scrape_exacta(race_date, race_stadium_number, race_number))
-        response.update(
-            self.scrape_quinella(race_date, race_stadium_number, race_number)
-        )
-        response.update(
-            self.scrape_quinella_place(race_date, race_stadium_number, race_number)
+    def scrape_pages(
+        self,
+        method: str,
+        race_date: Union[date, datetime, str],
+        race_stadium_number: int,
+        race_number: int,
+    ) -> Dict[str, Any]:
+        """
+        Scrape odds, reusing bet types recently extracted from the same page.
+
+        Args:
+            method: Scraping method name (key of PAGES)
+            race_date: Race date
+            race_stadium_number: Stadium number (1-24)
+            race_number: Race number (1-12)
+
+        Returns:
+            Dictionary containing odds data
+        """
+        parsed_date = self._parse_date(race_date)
+        cached = self._cached_result(
+            method, parsed_date, race_stadium_number, race_number
         )
-        response.update(
-            self.scrape_trifecta(race_date, race_stadium_number, race_number)
+        if cached is not None:
+            return cached
+
+        return super().scrape_pages(
+            method, parsed_date, race_stadium_number, race_number
         )
-        response.update(self.scrape_trio(race_date, race_stadium_number, race_number))
+
+    def extract(
+        self,
+        method: str,
+        soups: Dict[str, Any],
+        race_date: date,
+        race_stadium_number: int,
+        race_number: int,
+    ) -> Dict[str, Any]:
+        """
+        Extract odds for a scraping method from its odds pages.
+
+        Each page is extracted once for every bet type on it that the call
+        needs: all of them for scrape. With cache_ttl set, every bet type on
+        a fetched page is extracted and cached, so asking for another bet
+        type of the same page shortly after costs nothing.
+        """
+        caching = self.cache_ttl > 0
+        wanted = None if method == "scrape" or caching else method
+        extracted = {}
+        for page, soup in soups.items():
+            ctx = self.create_context(
+                soup, page, race_date, race_stadium_number, race_number
+            )
+            for odds_method, pages in self.PAGES.items():
+                if odds_method == "scrape" or pages != (page,):
+                    continue
+                if wanted is not None and odds_method != wanted:
+                    continue
+                extractor = getattr(self, f"_extract_{odds_method[len('scrape_') :]}")
+                extracted[odds_method] = extractor(ctx)
+                if self.compact:
+                    extracted[odds_method] = compact_odds(extracted[odds_method])
+
+        if caching:
+            expires_at = time.monotonic() + self.cache_ttl
+            with self._results_lock:
+                self._prune_results()
+                for odds_method, result in extracted.items():
+                    key = (odds_method, race_date, race_stadium_number, race_number)
+                    self._results[key] = (expires_at, result)
+
+        methods = [method]
+        if method == "scrape":
+            methods = list(extracted)
+
+        # Cached results must not be shared with the caller
+        response = {}
+        for odds_method in methods:
+            result = extracted[odds_method]
+            response.update(copy.deepcopy(result) if caching else result)
 
         return response
 
+    def _cached_result(
+        self, method: str, race_date: date, race_stadium_number: int, race_number: int
+    ) -> Optional[Dict[str, Any]]:
+        """Get a copy of a recently extracted result, if still fresh."""
+        if method == "scrape" or self.cache_ttl <= 0:
+            return None
+
+        with self._results_lock:
+            entry = self._results.get(
+                (method, race_date, race_stadium_number, race_number)
+            )
+
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+
+        return copy.deepcopy(entry[1])
+
+    def _prune_results(self) -> None:
+        """Drop expired results; the caller holds the lock."""
+        now = time.monotonic()
+        for key in [key for key, entry in self._results.items() if entry[0] <= now]:
+            del self._results[key]
+
     def scrape_win(
         self,
         race_date: Union[date, datetime, str],
@@ -54,40 +223,22 @@ class OddsScraper(BaseScraper):
         race_number: int,
     ) -> Dict[str, Any]:
         """Scrape win odds."""
-        parsed_date = self._parse_date(race_date)
-
-        url = (
-            f"{self.base_url}/owpc/pc/race/oddstf"
-            f"?hd={parsed_date.strftime('%Y%m%d')}"
-            f"&jcd={race_stadium_number:02d}"
-            f"&rno={race_number}"
+        return self.scrape_pages(
+            "scrape_win", race_date, race_stadium_number, race_number
         )
 
-        soup = self.request_and_parse(url)
-
-        # Determine base level
-        self.base_level = 0
-        level_element = soup.select_one(
-            "body main div div div div:nth-child(2) div:nth-child(3) ul li"
-        )
-        if level_element:
-            self.base_level = 1
-
+    def _extract_win(self, ctx: ParseContext) -> Dict[str, Any]:
+        """Extract win odds."""
         response = {
-            "race_date": parsed_date.strftime("%Y-%m-%d"),
-            "race_stadium_number": race_stadium_number,
-            "race_number": race_number,
+            "race_date": ctx.race_date.strftime("%Y-%m-%d"),
+            "race_stadium_number": ctx.race_stadium_number,
+            "race_number": ctx.race_number,
             "win_odds": {},
         }
 
         # Extract win odds for each boat (1-6)
-        base_selector = f"body main div div div div:nth-child(2) div:nth-child({self.base_level + 6}) div:nth-child(1) div:nth-child(2) table"
-
-        for boat_number in range(1, 7):
-            selector = (
-                f"{base_selector} tbody:nth-child({boat_number}) tr td:nth-child(3)"
-            )
-            odds = self.filter_xpath_for_odds(soup, selector)
+        for boat_number, selector in enumerate(ctx.selector("win_odds"), 1):
+            odds = self.filter_xpath_for_odds(ctx.soup, selector)
             response["win_odds"][boat_number] = odds
 
         return response
@@ -99,30 +250,26 @@ class OddsScraper(BaseScraper):
         race_number: int,
     ) -> Dict[str, Any]:
         """Scrape place odds."""
-        parsed_date = self._parse_date(race_date)
-
-        url = (
-            f"{self.base_url}/owpc/pc/race/oddstf"
-            f"?hd={parsed_date.strftime('%Y%m%d')}"
-            f"&jcd={race_stadium_number:02d}"
-            f"&rno={race_number}"
+        return self.scrape_pages(
+            "scrape_place", race_date, race_stadium_number, race_number
         )
 
-        soup = self.request_and_parse(url)
+    def _extract_place(self, ctx: ParseContext) -> Dict[str, Any]:
+        """
+        Extract place odds.
 
-        response = {"place_odds": {}}
+        Returns:
+            Dictionary with aligned 6-element float32 lower_limit and
+            upper_limit arrays indexed by boat number minus one
+        """
+        lower, upper = _empty_ranges(BOAT_COUNT)
 
         # Extract place odds for each boat (1-6)
-        base_selector = f"body main div div div div:nth-child(2) div:nth-child({self.base_level + 6}) div:nth-child(2) div:nth-child(2) table"
+        for boat, selector in enumerate(ctx.selector("place_odds")):
+            text = self.filter_xpath_text(ctx.soup, selector)
+            lower[boat], upper[boat] = _range_of(text, self.parse_odds_range)
 
-        for boat_number in range(1, 7):
-            selector = (
-                f"{base_selector} tbody:nth-child({boat_number}) tr td:nth-child(3)"
-            )
-            odds_range = self.filter_xpath_for_odds_range(soup, selector)
-            response["place_odds"][boat_number] = odds_range
-
-        return response
+        return {"place_odds": {"lower_limit": lower, "upper_limit": upper}}
 
     def scrape_exacta(
         self,
@@ -131,23 +278,28 @@ class OddsScraper(BaseScraper):
         race_number: int,
     ) -> Dict[str, Any]:
         """Scrape exacta (2連単) odds."""
-        parsed_date = self._parse_date(race_date)
-
-        url = (
-            f"{self.base_url}/owpc/pc/race/oddsk"
-            f"?hd={parsed_date.strftime('%Y%m%d')}"
-            f"&jcd={race_stadium_number:02d}"
-            f"&rno={race_number}"
+        return self.scrape_pages(
+            "scrape_exacta", race_date, race_stadium_number, race_number
         )
 
-        _soup = self.request_and_parse(url)
+    def _extract_exacta(self, ctx: ParseContext) -> Dict[str, Any]:
+        """
+        Extract exacta (2連単) odds.
 
-        response = {"exacta_odds": {}}
+        Returns:
+            Dictionary with a 6x6 float32 array indexed by
+            [1st - 1][2nd - 1], NaN where no odds are offered and inf where
+            cancelled
+        """
+        odds = empty_odds(2)
 
-        # Exacta odds are for all 1st-2nd combinations
-        # This would need detailed implementation based on actual HTML structure
+        # The exacta table comes first on the page, the quinella table second
+        tables = ctx.soup.select(ctx.selector("odds_tables"))
+        if tables:
+            for (first, second), cell in self._read_odds_table(tables[0], 2):
+                odds[first - 1, second - 1] = self._odds_of(cell)
 
-        return response
+        return {"exacta_odds": odds}
 
     def scrape_quinella(
         self,
@@ -156,22 +308,27 @@ class OddsScraper(BaseScraper):
         race_number: int,
     ) -> Dict[str, Any]:
         """Scrape quinella (2連複) odds."""
-        parsed_date = self._parse_date(race_date)
-
-        url = (
-            f"{self.base_url}/owpc/pc/race/oddsk"
-            f"?hd={parsed_date.strftime('%Y%m%d')}"
-            f"&jcd={race_stadium_number:02d}"
-            f"&rno={race_number}"
+        return self.scrape_pages(
+            "scrape_quinella", race_date, race_stadium_number, race_number
         )
 
-        _soup = self.request_and_parse(url)
+    def _extract_quinella(self, ctx: ParseContext) -> Dict[str, Any]:
+        """
+        Extract quinella (2連複) odds.
 
-        response = {"quinella_odds": {}}
+        Returns:
+            Dictionary with a 15-element float32 vector in PAIRS order
+            (see bvp_scraper.combinations), NaN where no odds are offered and
+            inf where cancelled
+        """
+        odds = empty_pair_odds()
 
-        # Implementation would go here
+        tables = ctx.soup.select(ctx.selector("odds_tables"))
+        if len(tables) > 1:
+            for boats, cell in self._read_odds_table(tables[1], 2):
+                odds[pair_index(*boats)] = self._odds_of(cell)
 
-        return response
+        return {"quinella_odds": odds}
 
     def scrape_quinella_place(
         self,
@@ -180,22 +337,29 @@ class OddsScraper(BaseScraper):
         race_number: int,
     ) -> Dict[str, Any]:
         """Scrape quinella place (拡連複) odds."""
-        parsed_date = self._parse_date(race_date)
-
-        url = (
-            f"{self.base_url}/owpc/pc/race/oddsk"
-            f"?hd={parsed_date.strftime('%Y%m%d')}"
-            f"&jcd={race_stadium_number:02d}"
-            f"&rno={race_number}"
+        return self.scrape_pages(
+            "scrape_quinella_place", race_date, race_stadium_number, race_number
         )
 
-        _soup = self.request_and_parse(url)
+    def _extract_quinella_place(self, ctx: ParseContext) -> Dict[str, Any]:
+        """
+        Extract quinella place (拡連複) odds.
 
-        response = {"quinella_place_odds": {}}
+        Returns:
+            Dictionary with aligned 15-element float32 lower_limit and
+            upper_limit arrays in PAIRS order (see bvp_scraper.combinations)
+        """
+        lower, upper = _empty_ranges(len(PAIRS))
 
-        # Implementation would go here
+        table = ctx.soup.select_one(ctx.selector("odds_tables"))
+        if table:
+            for boats, cell in self._read_odds_table(table, 2):
+                index = pair_index(*boats)
+                lower[index], upper[index] = _range_of(
+                    cell.get_text(strip=True), self.parse_odds_range
+                )
 
-        return response
+        return {"quinella_place_odds": {"lower_limit": lower, "upper_limit": upper}}
 
     def scrape_trifecta(
         self,
@@ -204,22 +368,27 @@ class OddsScraper(BaseScraper):
         race_number: int,
     ) -> Dict[str, Any]:
         """Scrape trifecta (3連単) odds."""
-        parsed_date = self._parse_date(race_date)
-
-        url = (
-            f"{self.base_url}/owpc/pc/race/oddsk"
-            f"?hd={parsed_date.strftime('%Y%m%d')}"
-            f"&jcd={race_stadium_number:02d}"
-            f"&rno={race_number}"
+        return self.scrape_pages(
+            "scrape_trifecta", race_date, race_stadium_number, race_number
         )
 
-        _soup = self.request_and_parse(url)
+    def _extract_trifecta(self, ctx: ParseContext) -> Dict[str, Any]:
+        """
+        Extract trifecta (3連単) odds.
 
-        response = {"trifecta_odds": {}}
+        Returns:
+            Dictionary with a 6x6x6 float32 array indexed by
+            [1st - 1][2nd - 1][3rd - 1], NaN where no odds are offered and
+            inf where cancelled
+        """
+        odds = empty_odds(3)
 
-        # Implementation would go here
+        table = ctx.soup.select_one(ctx.selector("odds_tables"))
+        if table:
+            for boats, cell in self._read_odds_table(table, 3):
+                odds[tuple(boat - 1 for boat in boats)] = self._odds_of(cell)
 
-        return response
+        return {"trifecta_odds": odds}
 
     def scrape_trio(
         self,
@@ -228,19 +397,164 @@ class OddsScraper(BaseScraper):
         race_number: int,
     ) -> Dict[str, Any]:
         """Scrape trio (3連複) odds."""
-        parsed_date = self._parse_date(race_date)
+        return self.scrape_pages(
+            "scrape_trio", race_date, race_stadium_number, race_number
+        )
+
+    def _extract_trio(self, ctx: ParseContext) -> Dict[str, Any]:
+        """
+        Extract trio (3連複) odds.
+
+        Returns:
+            Dictionary with a 20-element float32 vector in TRIPLES order
+            (see bvp_scraper.combinations), NaN where no odds are offered and
+            inf where cancelled
+        """
+        odds = empty_triple_odds()
+
+        table = ctx.soup.select_one(ctx.selector("odds_tables"))
+        if table:
+            for boats, cell in self._read_odds_table(table, 3):
+                odds[triple_index(*boats)] = self._odds_of(cell)
+
+        return {"trio_odds": odds}
+
+    def _read_odds_table(
+        self, table: Tag, positions: int
+    ) -> List[Tuple[Tuple[int, ...], Tag]]:
+        """
+        Read an odds matrix table.
+
+        The header holds the 1st-place boat of each of the six column groups.
+        Each body row holds, per group, the boats of the remaining positions
+        followed by the odds cell; boats shared by several rows are spanned.
+
+        Args:
+            table: Odds table element
+            positions: Finishing positions of the bet type
 
-        url = (
-            f"{self.base_url}/owpc/pc/race/oddsk"
-            f"?hd={parsed_date.strftime('%Y%m%d')}"
-            f"&jcd={race_stadium_number:02d}"
-            f"&rno={race_number}"
+        Returns:
+            (boat numbers, odds cell) pairs of every valid combination in the
+            table
+        """
+        head = table.find("thead")
+        header = self._table_grid(head.find_all("tr") if head else [])
+        body = self._table_grid(
+            [row for tbody in table.find_all("tbody") for row in tbody.find_all("tr")]
         )
+        if not header or not header[0]:
+            return []
+
+        width = len(header[0]) // 6
+        if width < positions:
+            return []
+
+        combinations = []
+        for group in range(6):
+            first = self._boat_of(header[0][group * width])
+            for row in body:
+                cells = row[(group + 1) * width - positions : (group + 1) * width]
+                if len(cells) < positions or None in cells:
+                    continue
+
+                boats = (first, *(self._boat_of(cell) for cell in cells[:-1]))
+                if None in boats or len(set(boats)) != positions:
+                    continue
+
+                if "oddsPoint" in (cells[-1].get("class") or ()):
+                    combinations.append((boats, cells[-1]))
+
+        return combinations
+
+    @staticmethod
+    def _table_grid(rows: List[Tag]) -> List[GridRow]:
+        """Lay table rows out on a grid, repeating row- and column-spanned cells."""
+        grid = []
+        spanned: Dict[int, Tuple[Tag, int]] = {}
+        for row in rows:
+            line: GridRow = []
+            cells = iter(row.find_all(["td", "th"], recursive=False))
+            while True:
+                column = len(line)
+                if column in spanned:
+                    cell, remaining = spanned.pop(column)
+                    if remaining > 1:
+                        spanned[column] = (cell, remaining - 1)
+                    line.append(cell)
+                    continue
+
+                cell = next(cells, None)
+                if cell is None:
+                    if any(later > column for later in spanned):
+                        line.append(None)
+                        continue
+                    break
+
+                rowspan = _span(cell, "rowspan")
+                for _ in range(_span(cell, "colspan")):
+                    if rowspan > 1:
+                        spanned[len(line)] = (cell, rowspan - 1)
+                    line.append(cell)
+            grid.append(line)
+
+        return grid
+
+    @staticmethod
+    def _boat_of(cell: Optional[Tag]) -> Optional[int]:
+        """Get the boat number of a boat cell."""
+        if cell is None:
+            return None
+
+        for class_name in cell.get("class") or ():
+            match = re.fullmatch(r"is-boatColor([1-6])", class_name)
+            if match:
+                return int(match.group(1))
+
+        text = cell.get_text(strip=True)
+        return int(text) if text in {"1", "2", "3", "4", "5", "6"} else None
+
+    @staticmethod
+    def _odds_of(cell: Tag) -> float:
+        """
+        Get the odds of an odds cell.
 
-        _soup = self.request_and_parse(url)
+        Returns:
+            Odds, inf when the combination was cancelled and NaN when the cell
+            holds no number
+        """
+        text = cell.get_text(strip=True)
+        if text in CANCELLED_TEXTS:
+            return math.inf
 
-        response = {"trio_odds": {}}
+        try:
+            return float(text.replace(",", ""))
+        except ValueError:
+            return math.nan
 
-        # Implementation would go here
 
-        return response
+def _empty_ranges(size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Create aligned lower and upper limit arrays of NaN."""
+    return (
+        np.full(size, np.nan, dtype=np.float32),
+        np.full(size, np.nan, dtype=np.float32),
+    )
+
+
+def _range_of(text: Optional[str], parse_odds_range) -> Tuple[float, float]:
+    """Parse range odds; inf when cancelled and NaN when missing."""
+    if text in CANCELLED_TEXTS:
+        return math.inf, math.inf
+
+    lower, upper = parse_odds_range(text)
+    if lower is None or upper is None:
+        return math.nan, math.nan
+
+    return lower, upper
+
+
+def _span(cell: Tag, attribute: str) -> int:
+    """Get a cell's rowspan or colspan."""
+    try:
+        return max(int(cell.get(attribute) or 1), 1)
+    except ValueError:
+        return 1
@@ -3,14 +3,25 @@ Preview scraper for pre-race information and weather conditions.
 """
 
 from datetime import date, datetime
-from typing import Any, Dict, Union
+from typing import Any, ClassVar, Dict, Tuple, Union
 
 from ..base_scraper import BaseScraper
+from ..parse_context import ParseContext
 
 
 class PreviewScraper(BaseScraper):
     """Scraper for pre-race information and weather conditions."""
 
+    PAGES: ClassVar[Dict[str, Tuple[str, ...]]] = {"scrape": ("beforeinfo",)}
+
+    LANE: ClassVar[str] = "preview"
+
+    SELECTORS: ClassVar[Dict[str, Dict[str, str]]] = {
+        "beforeinfo": {
+            "weather": "body main div div div div:nth-child(2) div:nth-child({level + 3}) div:nth-child(1)",
+        }
+    }
+
     def scrape(
         self,
         race_date: Union[date, datetime, str],
@@ -28,52 +39,49 @@ class PreviewScraper(BaseScraper):
         Returns:
             Dictionary containing preview data
         """
-        parsed_date = self._parse_date(race_date)
-
-        url = (
-            f"{self.base_url}/owpc/pc/race/beforeinfo"
-            f"?hd={parsed_date.strftime('%Y%m%d')}"
-            f"&jcd={race_stadium_number:02d}"
-            f"&rno={race_number}"
-        )
+        return self.scrape_pages("scrape", race_date, race_stadium_number, race_number)
 
-        soup = self.request_and_parse(url)
-
-        # Determine base level
-        self.base_level = 0
-        level_element = soup.select_one(
-            "body main div div div div:nth-child(2) div:nth-child(3) ul li"
+    def extract(
+        self,
+        method: str,
+        soups: Dict[str, Any],
+        race_date: date,
+        race_stadium_number: int,
+        race_number: int,
+    ) -> Dict[str, Any]:
+        """Extract preview data from the beforeinfo page."""
+        ctx = self.create_context(
+            soups["beforeinfo"],
+            "beforeinfo",
+            race_date,
+            race_stadium_number,
+            race_number,
         )
-        if level_element:
-            self.base_level = 1
 
         response = {
-            "race_date": parsed_date.strftime("%Y-%m-%d"),
+            "race_date": race_date.strftime("%Y-%m-%d"),
             "race_stadium_number": race_stadium_number,
             "race_number": race_number,
         }
 
         # Scrape weather information
-        weather_data = self._scrape_weather(soup)
+        weather_data = self._scrape_weather(ctx)
         response.update(weather_data)
 
         # Scrape course information
-        course_data = self._scrape_course(soup)
+        course_data = self._scrape_course(ctx.soup)
         response.update(course_data)
 
         # Scrape boat preview data
-        boats_data = self._scrape_boats_preview(soup)
+        boats_data = self._scrape_boats_preview(ctx.soup)
         response.update(boats_data)
 
         return response
 
-    def _scrape_weather(self, soup) -> Dict[str, Any]:
+    def _scrape_weather(self, ctx: ParseContext) -> Dict[str, Any]:
         """Scrape weather information."""
 
-        # CSS selectors for weather data
-        weather_selector = f"body main div div div div:nth-child(2) div:nth-child({self.base_level + 3}) div:nth-child(1)"
-
-        weather_text = self.filter_xpath_text(soup, weather_selector)
+        weather_text = self.filter_xpath_text(ctx.soup, ctx.selector("weather"))
 
         # Parse weather information (this would need specific implementation)
         weather_data = {
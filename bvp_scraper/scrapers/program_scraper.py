@@ -4,14 +4,30 @@ Program scraper for race programs and boat/racer information.
 
 import re
 from datetime import date, datetime
-from typing import Any, Dict, Optional, Union
+from typing import Any, ClassVar, Dict, List, Optional, Tuple, Union
+
+from bs4.element import Tag
 
 from ..base_scraper import BaseScraper
+from ..parse_context import ParseContext
 
 
 class ProgramScraper(BaseScraper):
     """Scraper for race programs and participant information."""
 
+    PAGES: ClassVar[Dict[str, Tuple[str, ...]]] = {"scrape": ("racelist",)}
+
+    LANE: ClassVar[str] = "preview"
+
+    SELECTORS: ClassVar[Dict[str, Dict[str, str]]] = {
+        "racelist": {
+            "race_grade": "body main div div div div:nth-child(1) div div:nth-child(2)",
+            "race_title": "body main div div div div:nth-child(1) div div:nth-child(2) h2",
+            "race_subtitle_distance": "body main div div div div:nth-child(2) div:nth-child({level + 3}) h3",
+            "boats_table": "body main div div div div:nth-child(2) div:nth-child({level + 5}) table",
+        }
+    }
+
     def scrape(
         self,
         race_date: Union[date, datetime, str],
@@ -29,59 +45,46 @@ class ProgramScraper(BaseScraper):
         Returns:
             Dictionary containing race program data
         """
-        parsed_date = self._parse_date(race_date)
-
-        # Build scraper URL
-        url = (
-            f"{self.base_url}/owpc/pc/race/racelist"
-            f"?hd={parsed_date.strftime('%Y%m%d')}"
-            f"&jcd={race_stadium_number:02d}"
-            f"&rno={race_number}"
-        )
+        return self.scrape_pages("scrape", race_date, race_stadium_number, race_number)
 
-        soup = self.request_and_parse(url)
-
-        # Determine base level from page structure
-        self.base_level = 0
-        level_element = soup.select_one(
-            "body main div div div div:nth-child(2) div:nth-child(3) ul li"
+    def extract(
+        self,
+        method: str,
+        soups: Dict[str, Any],
+        race_date: date,
+        race_stadium_number: int,
+        race_number: int,
+    ) -> Dict[str, Any]:
+        """Extract race program data from the racelist page."""
+        ctx = self.create_context(
+            soups["racelist"], "racelist", race_date, race_stadium_number, race_number
         )
-        if level_element:
-            self.base_level = 1
 
         # Extract race information
-        race_data = self._scrape_race_info(
-            soup, parsed_date, race_stadium_number, race_number
-        )
+        race_data = self._scrape_race_info(ctx)
 
         # Extract boat and racer information
-        boats_data = self._scrape_boats(soup)
+        boats_data = self._scrape_boats(ctx)
 
         response = {**race_data, **boats_data}
         return response
 
-    def _scrape_race_info(
-        self, soup, race_date: date, race_stadium_number: int, race_number: int
-    ) -> Dict[str, Any]:
+    def _scrape_race_info(self, ctx: ParseContext) -> Dict[str, Any]:
         """Extract basic race information."""
+        soup = ctx.soup
+        race_date = ctx.race_date
+        race_number = ctx.race_number
 
-        # CSS selectors for race information
-        race_grade_selector = (
-            "body main div div div div:nth-child(1) div div:nth-child(2)"
-        )
-        race_title_selector = (
-            "body main div div div div:nth-child(1) div div:nth-child(2) h2"
-        )
-        race_subtitle_distance_selector = f"body main div div div div:nth-child(2) div:nth-child({self.base_level + 3}) h3"
+        # The deadline column depends on the race, so it is not precompiled
         race_deadline_selector = f"body main div div div div:nth-child(2) div:nth-child(2) table tbody tr:nth-child(1) td:nth-child({race_number + 1})"
 
         # Extract data
         race_grade_number = self.filter_xpath_for_grade_number(
-            soup, race_grade_selector
+            soup, ctx.selector("race_grade")
         )
-        race_title = self.filter_xpath_text(soup, race_title_selector)
+        race_title = self.filter_xpath_text(soup, ctx.selector("race_title"))
         race_subtitle_distance = self.filter_xpath_text(
-            soup, race_subtitle_distance_selector
+            soup, ctx.selector("race_subtitle_distance")
         )
         race_deadline = self.filter_xpath_text(soup, race_deadline_selector)
 
@@ -105,7 +108,7 @@ class ProgramScraper(BaseScraper):
 
         return {
             "race_date": race_date.strftime("%Y-%m-%d"),
-            "race_stadium_number": race_stadium_number,
+            "race_stadium_number": ctx.race_stadium_number,
             "race_number": race_number,
             "race_closed_at": race_closed_at,
             "race_grade_number": race_grade_number,
@@ -114,36 +117,28 @@ class ProgramScraper(BaseScraper):
             "race_distance": race_distance,
         }
 
-    def _scrape_boats(self, soup) -> Dict[str, Any]:
+    def _scrape_boats(self, ctx: ParseContext) -> Dict[str, Any]:
         """Extract boat and racer information."""
         boats = {}
 
-        # CSS selector templates for boat/racer data
-        base_selector = f"body main div div div div:nth-child(2) div:nth-child({self.base_level + 5}) table"
+        # Locate the table once; each boat is one of its tbody elements
+        table = ctx.soup.select_one(ctx.selector("boats_table"))
+        if not table:
+            return {"boats": boats}
 
+        tbodies = table.find_all("tbody")
         for boat_number in range(1, 7):  # Boats 1-6
-            tbody_selector = f"{base_selector} tbody:nth-child({boat_number})"
-
             # Extract boat data
-            boat_data = self._extract_boat_data(soup, tbody_selector, boat_number)
+            boat_data = self._extract_boat_data(tbodies, boat_number)
             if boat_data:
                 boats[boat_number] = boat_data
 
         return {"boats": boats}
 
     def _extract_boat_data(
-        self, soup, tbody_selector: str, default_boat_number: int
+        self, tbodies: List[Tag], default_boat_number: int
     ) -> Optional[Dict[str, Any]]:
         """Extract data for a single boat."""
-
-        # Get the tbody element directly instead of using complex CSS selectors
-        base_selector = f"body main div div div div:nth-child(2) div:nth-child({self.base_level + 5}) table"
-        table = soup.select_one(base_selector)
-
-        if not table:
-            return None
-
-        tbodies = table.find_all("tbody")
         if default_boat_number > len(tbodies):
             return None
 
@@ -3,14 +3,28 @@ Result scraper for race results and payouts.
 """
 
 from datetime import date, datetime
-from typing import Any, Dict, Union
+from typing import Any, ClassVar, Dict, Optional, Tuple, Union
 
 from ..base_scraper import BaseScraper
+from ..combinations import TABLES
 
 
 class ResultScraper(BaseScraper):
     """Scraper for race results and payout information."""
 
+    PAGES: ClassVar[Dict[str, Tuple[str, ...]]] = {"scrape": ("raceresult",)}
+
+    # Bet types of the payout table, keyed by their name on the site
+    BET_TYPE_NAMES: ClassVar[Dict[str, str]] = {
+        "3連単": "trifecta",
+        "3連複": "trio",
+        "2連単": "exacta",
+        "2連複": "quinella",
+        "拡連複": "quinella_place",
+        "単勝": "win",
+        "複勝": "place",
+    }
+
     def scrape(
         self,
         race_date: Union[date, datetime, str],
@@ -28,27 +42,23 @@ class ResultScraper(BaseScraper):
         Returns:
             Dictionary containing race results
         """
-        parsed_date = self._parse_date(race_date)
-
-        url = (
-            f"{self.base_url}/owpc/pc/race/raceresult"
-            f"?hd={parsed_date.strftime('%Y%m%d')}"
-            f"&jcd={race_stadium_number:02d}"
-            f"&rno={race_number}"
-        )
+        return self.scrape_pages("scrape", race_date, race_stadium_number, race_number)
 
-        soup = self.request_and_parse(url)
-
-        # Determine base level
-        self.base_level = 0
-        level_element = soup.select_one(
-            "body main div div div div:nth-child(2) div:nth-child(3) ul li"
-        )
-        if level_element:
-            self.base_level = 1
+    def extract(
+        self,
+        method: str,
+        soups: Dict[str, Any],
+        race_date: date,
+        race_stadium_number: int,
+        race_number: int,
+    ) -> Dict[str, Any]:
+        """Extract result data from the raceresult page."""
+        # Result tables are located by their headers, so the page layout
+        # level does not matter here
+        soup = soups["raceresult"]
 
         response = {
-            "race_date": parsed_date.strftime("%Y-%m-%d"),
+            "race_date": race_date.strftime("%Y-%m-%d"),
             "race_stadium_number": race_stadium_number,
             "race_number": race_number,
         }
@@ -233,22 +243,14 @@ class ResultScraper(BaseScraper):
                             "popularity": popularity,
                         }
 
-                        if current_bet_type == "3連単":
-                            payouts["trifecta_payouts"][combination_text] = payout_data
-                        elif current_bet_type == "3連複":
-                            payouts["trio_payouts"][combination_text] = payout_data
-                        elif current_bet_type == "2連単":
-                            payouts["exacta_payouts"][combination_text] = payout_data
-                        elif current_bet_type == "2連複":
-                            payouts["quinella_payouts"][combination_text] = payout_data
-                        elif current_bet_type == "拡連複":
-                            payouts["quinella_place_payouts"][combination_text] = (
+                        bet_type = self.BET_TYPE_NAMES.get(current_bet_type)
+                        if bet_type:
+                            payout_data["combination_index"] = _combination_index(
+                                bet_type, combination_text
+                            )
+                            payouts[f"{bet_type}_payouts"][combination_text] = (
                                 payout_data
                             )
-                        elif current_bet_type == "単勝":
-                            payouts["win_payouts"][combination_text] = payout_data
-                        elif current_bet_type == "複勝":
-                            payouts["place_payouts"][combination_text] = payout_data
 
         return payouts
 
@@ -318,3 +320,9 @@ class ResultScraper(BaseScraper):
             race_info["start_info"] = start_info
 
         return race_info
+
+
+def _combination_index(bet_type: str, combination: str) -> Optional[int]:
+    """Dense index of a payout combination, None if it cannot be parsed."""
+    index = int(TABLES[bet_type].parse([combination])[0])
+    return index if index >= 0 else None
@@ -2,8 +2,9 @@
 Stadium scraper for venue information and race schedules.
 """
 
+import re
 from datetime import date, datetime
-from typing import Any, Dict, Union
+from typing import Any, ClassVar, Dict, Optional, Tuple, Union
 
 from ..base_scraper import BaseScraper
 
@@ -11,6 +12,10 @@ from ..base_scraper import BaseScraper
 class StadiumScraper(BaseScraper):
     """Scraper for stadium information and race schedules."""
 
+    PAGES: ClassVar[Dict[str, Tuple[str, ...]]] = {"scrape": ("index",)}
+
+    LANE: ClassVar[str] = "preview"
+
     def scrape(
         self,
         race_date: Union[date, datetime, str],
@@ -28,14 +33,28 @@ class StadiumScraper(BaseScraper):
         Returns:
             Dictionary containing stadium information
         """
-        parsed_date = self._parse_date(race_date)
-
-        url = (
-            f"{self.base_url}/owpc/pc/race/index"
-            f"?hd={parsed_date.strftime('%Y%m%d')}"
-        )
+        return self.scrape_pages("scrape", race_date, race_stadium_number, race_number)
 
-        soup = self.request_and_parse(url)
+    def build_url(
+        self,
+        page: str,
+        race_date: date,
+        race_stadium_number: int,
+        race_number: int,
+    ) -> str:
+        """Build the URL of the race index page, which covers the whole day."""
+        return f"{self.base_url}/owpc/pc/race/{page}?hd={race_date.strftime('%Y%m%d')}"
+
+    def extract(
+        self,
+        method: str,
+        soups: Dict[str, Any],
+        race_date: date,
+        race_stadium_number: int,
+        race_number: int,
+    ) -> Dict[str, Any]:
+        """Extract stadium information from the index page."""
+        soup = soups["index"]
 
         stadiums = {}
 
@@ -61,8 +80,6 @@ class StadiumScraper(BaseScraper):
         href = stadium_link.get("href", "")
 
         # Extract stadium number from URL pattern
-        import re
-
         stadium_match = re.search(r"jcd=(\d+)", href)
         if not stadium_match:
             return None
@@ -76,8 +93,49 @@ class StadiumScraper(BaseScraper):
         grade_element = element.select_one(".grade")
         grade = grade_element.get_text(strip=True) if grade_element else None
 
+        text = element.get_text(" ", strip=True)
+
+        # Only the meet's own status marks it cancelled; a single race
+        # called off shows 中止 elsewhere in the card
+        status_element = element.select_one(".status")
+        status = status_element.get_text(strip=True) if status_element else ""
+
         return {
             "stadium_number": stadium_number,
             "stadium_name": stadium_name,
             "grade": grade,
+            "race_count": self._race_count_of(element),
+            "meet_day": self._meet_day_of(text),
+            "cancelled": "中止" in status,
         }
+
+    @staticmethod
+    def _race_count_of(element) -> Optional[int]:
+        """
+        Get the number of races of the day from the card's race links.
+
+        During the day the card only links the current or next race, whose
+        number says nothing about how many races there are; the count is
+        known only when the links list every race from 1R.
+
+        Args:
+            element: Stadium card
+
+        Returns:
+            Number of races, or None if the card does not list them all
+        """
+        races = set()
+        for link in element.select("a[href]"):
+            match = re.search(r"rno=(\d+)", link.get("href", ""))
+            if match:
+                races.add(int(match.group(1)))
+
+        if len(races) > 1 and races == set(range(1, max(races) + 1)):
+            return max(races)
+        return None
+
+    @staticmethod
+    def _meet_day_of(text: str) -> Optional[str]:
+        """Get the day of the meet (初日, 2日目, ..., 最終日), if shown."""
+        match = re.search(r"初日|最終日|\d+日目", text)
+        return match.group(0) if match else None
@@ -11,6 +11,7 @@ from datetime import date, timedelta
 import requests
 
 from bvp_scraper import Scraper, ScraperCore
+from bvp_scraper.scheduler import FetchScheduler
 
 
 def advanced_configuration_example():
@@ -45,33 +46,22 @@ def batch_scraping_example():
     start_date = date(2024, 1, 1)
     end_date = start_date + timedelta(days=2)
 
-    current_date = start_date
+    # Four races in flight at a time, across dates and stadiums, all within
+    # one request per second (the pace of a single sequential scraper)
+    scheduler = FetchScheduler(requests_per_second=1.0)
+    scraper_core = ScraperCore(io_workers=4, scheduler=scheduler, lane="backfill")
     all_results = {}
 
-    while current_date <= end_date:
-        date_str = current_date.strftime("%Y-%m-%d")
-        print(f"Processing date: {date_str}")
+    def report_error(race_date, stadium_num, race_num, error):
+        print(f"  Error processing {race_date} stadium {stadium_num} race {race_num}")
 
-        try:
-            # Get stadiums for the date
-            stadiums = Scraper.scrape_stadiums(date_str)
-
-            # Scrape first few stadiums
-            for stadium_num in list(stadiums.keys())[:2]:
-                print(f"  Processing Stadium {stadium_num}")
-
-                # Scrape programs for all races in this stadium
-                programs = Scraper.scrape_programs(date_str, stadium_num)
-
-                # Store results
-                if date_str not in all_results:
-                    all_results[date_str] = {}
-                all_results[date_str][stadium_num] = programs
-
-        except Exception as e:
-            print(f"  Error processing {date_str}: {e}")
-
-        current_date += timedelta(days=1)
+    # Records arrive as soon as each race is scraped
+    for race_date, stadium_num, race_num, program in scraper_core.scrape_range(
+        "programs", start_date, end_date, stadiums=[1, 2], on_error=report_error
+    ):
+        print(f"  Scraped {race_date} stadium {stadium_num} race {race_num}")
+        races = all_results.setdefault(race_date, {}).setdefault(stadium_num, {})
+        races[race_num] = program
 
     print(f"Batch processing completed. Processed {len(all_results)} dates.")
 
@@ -0,0 +1,128 @@
+"""
+Tests for the vectorized odds analytics.
+"""
+
+from itertools import permutations
+
+import numpy as np
+import pytest
+
+from bvp_scraper import analytics
+from bvp_scraper.combinations import PAIRS, TRIPLES
+
+
+def market(races=4, payout_rate=0.75, seed=0):
+    """Build consistent odds of every race from Plackett-Luce strengths."""
+    rng = np.random.default_rng(seed)
+    strengths = rng.uniform(1, 10, (races, 6))
+    strengths /= strengths.sum(axis=1, keepdims=True)
+
+    trifecta = np.zeros((races, 6, 6, 6))
+    for a, b, c in permutations(range(6), 3):
+        trifecta[:, a, b, c] = (
+            strengths[:, a]
+            * strengths[:, b]
+            / (1 - strengths[:, a])
+            * strengths[:, c]
+            / (1 - strengths[:, a] - strengths[:, b])
+        )
+    exacta = trifecta.sum(axis=3)
+    quinella = np.stack(
+        [exacta[:, a - 1, b - 1] + exacta[:, b - 1, a - 1] for a, b in PAIRS], axis=1
+    )
+    trio = np.stack(
+        [
+            sum(trifecta[:, x - 1, y - 1, z - 1] for x, y, z in permutations(t))
+            for t in TRIPLES
+        ],
+        axis=1,
+    )
+
+    def to_odds(probabilities):
+        with np.errstate(divide="ignore"):
+            odds = np.where(probabilities > 0, payout_rate / probabilities, np.nan)
+        return odds.astype(np.float32)
+
+    return {
+        "win_odds": to_odds(strengths),
+        "exacta_odds": to_odds(exacta),
+        "quinella_odds": to_odds(quinella),
+        "trifecta_odds": to_odds(trifecta),
+        "trio_odds": to_odds(trio),
+    }
+
+
+class TestAnalytics:
+    """Test cases for the analytics functions."""
+
+    def test_takeout_and_normalization(self):
+        """Test takeout estimation and normalized probabilities."""
+        odds = market()
+
+        for name, values in odds.items():
+            np.testing.assert_allclose(analytics.takeout(values), 0.25, rtol=1e-5)
+            np.testing.assert_allclose(
+                analytics.normalized_probabilities(values)
+                .reshape(len(values), -1)
+                .sum(axis=1),
+                1.0,
+                err_msg=name,
+            )
+
+    def test_missing_odds(self):
+        """Test races without any odds."""
+        odds = np.full((2, 6), np.nan, dtype=np.float32)
+        odds[0] = 4.0
+
+        assert analytics.implied_probabilities(odds)[1].sum() == 0
+        assert analytics.takeout(odds, winners=1)[0] == pytest.approx(1 - 1 / 1.5)
+        assert np.isnan(analytics.takeout(odds)[1])
+        assert np.isnan(analytics.normalized_probabilities(odds)[1]).all()
+
+    def test_consistency_of_a_consistent_market(self):
+        """Test that marginals of finer bet types match coarser ones."""
+        checks = analytics.consistency(market())
+
+        assert sorted(checks) == [
+            "exacta_vs_quinella",
+            "exacta_vs_win",
+            "trifecta_vs_exacta",
+            "trifecta_vs_trio",
+            "trifecta_vs_win",
+        ]
+        for name, difference in checks.items():
+            assert difference.shape == (4,)
+            assert (difference < 1e-5).all(), name
+
+    def test_consistency_flags_stale_win_odds(self):
+        """Test that diverging win odds are flagged for their race only."""
+        odds = market()
+        odds["win_odds"][2] = odds["win_odds"][2][::-1]
+
+        difference = analytics.consistency(odds)["trifecta_vs_win"]
+
+        assert difference[2] > 0.01
+        assert (np.delete(difference, 2) < 1e-5).all()
+
+    def test_stack_odds(self):
+        """Test stacking scraper output of several races."""
+        odds = market(races=2)
+        races = [
+            {
+                "race_number": race + 1,
+                "win_odds": dict(zip(range(1, 7), odds["win_odds"][race].tolist())),
+                "trifecta_odds": odds["trifecta_odds"][race],
+                "place_odds": {
+                    "lower_limit": np.ones(6, dtype=np.float32),
+                    "upper_limit": np.ones(6, dtype=np.float32),
+                },
+            }
+            for race in range(2)
+        ]
+
+        stacked = analytics.stack_odds(races)
+
+        assert stacked["win_odds"].shape == (2, 6)
+        assert stacked["trifecta_odds"].shape == (2, 6, 6, 6)
+        assert stacked["place_odds.lower_limit"].shape == (2, 6)
+        assert analytics.stack_odds([]) == {}
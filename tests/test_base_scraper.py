@@ -2,6 +2,7 @@
 Tests for BaseScraper class.
 """
 
+import tracemalloc
 from datetime import date, datetime
 from unittest.mock import Mock, patch
 
@@ -85,6 +86,89 @@ class TestBaseScraper:
         # Verify BeautifulSoup object
         assert soup.find("div").get_text() == "Test content"
 
+    def test_parse_html_reuses_resolved_encoding(self):
+        """Test that encoding detection only runs when the charset changes."""
+        scraper = BaseScraper()
+        content = "<div>テスト</div>".encode()
+
+        soup = scraper.parse_html(content, "utf-8")
+        assert soup.find("div").get_text() == "テスト"
+        assert scraper._encoding_cache == ("utf-8", "utf-8")
+
+        with patch("bvp_scraper.base_scraper.BeautifulSoup") as mock_soup:
+            scraper.parse_html(content, "utf-8")
+            mock_soup.assert_called_once_with(
+                content, "html.parser", from_encoding="utf-8"
+            )
+
+        sjis = "<div>テスト</div>".encode("shift_jis")
+        soup = scraper.parse_html(sjis, "shift_jis")
+        assert soup.find("div").get_text() == "テスト"
+        assert scraper._encoding_cache == ("shift_jis", "shift_jis")
+
+    def test_declared_charset_of(self):
+        """Test charset extraction from the Content-Type header."""
+        response = Mock()
+        response.headers = {"Content-Type": "text/html; charset=UTF-8"}
+        assert BaseScraper._declared_charset_of(response) == "utf-8"
+
+        response.headers = {"Content-Type": "text/html"}
+        assert BaseScraper._declared_charset_of(response) is None
+
+        response.headers = {}
+        assert BaseScraper._declared_charset_of(response) is None
+
+    @patch("time.sleep")
+    def test_stream_matches_full_fetch(self, mock_sleep, mock_session):
+        """Test that a streamed page parses like a full download."""
+        html = "<html><body><main><div><p>１着</p></div></main></body></html>"
+        mock_session.get(
+            "https://example.com",
+            content=html.encode(),
+            headers={"Content-Type": "text/html; charset=UTF-8"},
+        )
+
+        scraper = BaseScraper()
+        scraper.stream = True
+        scraper.chunk_size = 8
+        soup = scraper.request_and_parse("https://example.com", until=None)
+
+        assert soup.select_one("main p").get_text() == "１着"
+        assert str(soup) == str(scraper.parse_html(html.encode(), "utf-8"))
+        mock_sleep.assert_called_once_with(1)
+
+    @patch("time.sleep")
+    def test_stream_stops_download_early(self, mock_sleep, mock_session):
+        """Test that streaming stops once the needed end tag has arrived."""
+        html = (
+            "<html><body><main><table><tr><td>1.5</td></tr></table></main>"
+            + "<footer>"
+            + "x" * 1000
+            + "</footer></body></html>"
+        )
+        mock_session.get("https://example.com", content=html.encode())
+
+        scraper = BaseScraper()
+        scraper.stream = True
+        scraper.chunk_size = 16
+        soup = scraper.request_and_parse("https://example.com")
+
+        assert soup.select_one("main td").get_text() == "1.5"
+        assert soup.find("footer") is None
+
+    @patch("time.sleep")
+    def test_stream_end_tag_split_across_chunks(self, mock_sleep, mock_session):
+        """Test that the end tag is found when chunks cut through it."""
+        html = "<html><body><main><p>1</p></main><footer>x</footer></body></html>"
+        mock_session.get("https://example.com", content=html.encode())
+
+        scraper = BaseScraper()
+        scraper.stream = True
+        scraper.chunk_size = 3
+        soup = scraper.request_and_parse("https://example.com")
+
+        assert str(soup) == "<html><body><main><p>1</p></main></body></html>"
+
     def test_filter_xpath_for_grade_number(self, sample_html):
         """Test grade number extraction."""
         from bs4 import BeautifulSoup
@@ -150,3 +234,33 @@ class TestBaseScraper:
         scraper = BaseScraper()
         with pytest.raises(NotImplementedError):
             scraper.scrape(date(2024, 1, 1), 1, 1)
+
+    @patch("time.sleep")
+    def test_scrape_pages_releases_trees(self, mock_sleep, mock_session):
+        """Test that parse trees are torn down after extraction."""
+        mock_session.get(
+            "https://www.boatrace.jp/owpc/pc/race/racelist",
+            content=b"<html><body><main><p>1</p></main></body></html>",
+        )
+
+        parsed = []
+
+        class PageScraper(BaseScraper):
+            PAGES = {"scrape": ("racelist",)}  # noqa: RUF012
+
+            def extract(self, method, soups, race_date, stadium, race):
+                parsed.append(soups["racelist"])
+                return {"text": soups["racelist"].find("p").get_text()}
+
+        scraper = PageScraper()
+        scraper.track_memory = True
+        try:
+            result = scraper.scrape_pages("scrape", "2024-01-01", 1, 1)
+        finally:
+            tracing = tracemalloc.is_tracing()
+            tracemalloc.stop()
+
+        assert not tracing
+        assert result == {"text": "1"}
+        assert parsed[0].decomposed
+        assert scraper.peak_tree_memory["racelist"] > 0
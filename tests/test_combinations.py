@@ -0,0 +1,124 @@
+"""
+Tests for odds array and combination string conversion.
+"""
+
+import numpy as np
+import pytest
+
+from bvp_scraper.combinations import (
+    PAIRS,
+    TABLES,
+    TRIPLE_POSITIONS,
+    TRIPLES,
+    array_to_combinations,
+    combinations_to_array,
+    combinations_to_pairs,
+    combinations_to_triples,
+    empty_odds,
+    pair_index,
+    pairs_to_combinations,
+    triple_index,
+    triples_to_combinations,
+)
+
+
+class TestCombinations:
+    """Test cases for combination conversion."""
+
+    def test_round_trip(self):
+        """Test conversion of a trifecta array to strings and back."""
+        odds = empty_odds(3)
+        odds[0, 1, 2] = 12.5
+        odds[5, 4, 3] = 980.0
+
+        combinations = array_to_combinations(odds)
+
+        assert combinations == {"1-2-3": 12.5, "6-5-4": 980.0}
+        np.testing.assert_array_equal(combinations_to_array(combinations, 3), odds)
+
+    def test_invalid_combination(self):
+        """Test that impossible combinations are rejected."""
+        with pytest.raises(ValueError):
+            combinations_to_array({"1-1-2": 5.0}, 3)
+
+        with pytest.raises(ValueError):
+            combinations_to_array({"1-7": 5.0}, 2)
+
+    def test_pair_round_trip(self):
+        """Test conversion of a quinella vector to strings and back."""
+        odds = combinations_to_pairs({"2=1": 3.5, "5=6": 40.0})
+
+        assert len(PAIRS) == 15
+        assert odds[pair_index(1, 2)] == 3.5
+        assert pairs_to_combinations(odds) == {"1=2": 3.5, "5=6": 40.0}
+
+        with pytest.raises(ValueError):
+            pair_index(3, 3)
+
+    def test_triple_round_trip(self):
+        """Test conversion of a trio vector to strings and back."""
+        odds = combinations_to_triples({"3=1=2": 8.5, "4=5=6": 300.0})
+
+        assert len(TRIPLES) == 20
+        assert odds[triple_index(1, 2, 3)] == 8.5
+        assert triples_to_combinations(odds) == {"1=2=3": 8.5, "4=5=6": 300.0}
+
+        with pytest.raises(ValueError):
+            triple_index(1, 1, 2)
+
+    def test_triple_positions(self):
+        """Test the vectorized mapping of ordered triples to trio positions."""
+        trifecta = np.arange(216, dtype=np.float32).reshape(6, 6, 6)
+        valid = TRIPLE_POSITIONS >= 0
+
+        # Lowest trifecta value of each trio group, without Python loops
+        trio = np.full(len(TRIPLES), np.inf, dtype=np.float32)
+        np.minimum.at(trio, TRIPLE_POSITIONS[valid], trifecta[valid])
+
+        assert np.count_nonzero(valid) == 120
+        assert TRIPLE_POSITIONS[2, 0, 1] == triple_index(1, 2, 3)
+        assert trio[triple_index(1, 2, 3)] == trifecta[0, 1, 2]
+
+    def test_tables_encode_and_decode(self):
+        """Test vectorized encoding of boat numbers to dense indices and back."""
+        trifecta = TABLES["trifecta"]
+        boats = np.array([[1, 2, 3], [6, 5, 4], [1, 1, 2], [1, 2, 7]])
+
+        indices = trifecta.encode(boats)
+
+        np.testing.assert_array_equal(indices, [8, 207, -1, -1])
+        np.testing.assert_array_equal(trifecta.decode(indices[:2]), boats[:2])
+        assert trifecta.size == 216
+        assert len(trifecta.indices) == 120
+
+        # Unordered bet types accept any boat order
+        np.testing.assert_array_equal(
+            TABLES["trio"].encode([[3, 1, 2], [1, 2, 3]]), [0, 0]
+        )
+
+    def test_tables_parse_strings(self):
+        """Test parsing of combination strings, as found in payouts."""
+        assert TABLES["exacta"].parse(["1-2", "2-1", "1=2", "1-1"]).tolist() == [
+            1,
+            6,
+            -1,
+            -1,
+        ]
+        assert TABLES["quinella"].parse(["2=1", "１＝２"]).tolist() == [0, 0]
+        assert TABLES["win"].index_of("3") == 2
+        assert TABLES["trifecta"].format([8]) == ["1-2-3"]
+
+        # Joining odds to a payout is plain indexing
+        odds = np.arange(216, dtype=np.float32).reshape(6, 6, 6)
+        assert odds.ravel()[TABLES["trifecta"].index_of("1-2-3")] == odds[0, 1, 2]
+
+        with pytest.raises(ValueError):
+            TABLES["quinella"].index_of("1-2")
+
+    def test_tables_are_immutable(self):
+        """Test that the shared tables cannot be modified."""
+        with pytest.raises(ValueError):
+            TABLES["trifecta"].lookup[1, 2, 3] = 0
+
+        with pytest.raises(TypeError):
+            TABLES["trio"].string_index["1=2=3"] = 5
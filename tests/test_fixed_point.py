@@ -0,0 +1,87 @@
+"""
+Tests for fixed-point odds.
+"""
+
+import numpy as np
+import pytest
+
+from bvp_scraper.fixed_point import (
+    FixedPointOdds,
+    compact_odds,
+    decode_odds,
+    encode_odds,
+    expand_odds,
+    sentinels,
+)
+from bvp_scraper.odds_delta import flatten_odds
+
+
+class TestFixedPoint:
+    """Test cases for fixed-point odds."""
+
+    def test_round_trip_is_lossless(self):
+        """Test that parsed odds decode to the exact same float32 values."""
+        texts = ["1.0", "1.1", "12.3", "99.9", "1234.5", "6553.3"]
+        values = np.array([float(text) for text in texts], dtype=np.float32)
+
+        codes = encode_odds(values)
+
+        assert codes.dtype == np.uint16
+        np.testing.assert_array_equal(decode_odds(codes), values)
+
+    def test_sentinels(self):
+        """Test that absent and cancelled combinations survive encoding."""
+        codes = encode_odds([np.nan, np.inf, 2.5])
+
+        assert codes.tolist() == [65535, 65534, 25]
+        assert sentinels(np.uint16) == {"absent": 65535, "cancelled": 65534}
+        decoded = decode_odds(codes)
+        assert np.isnan(decoded[0])
+        assert np.isposinf(decoded[1])
+
+    def test_wide_odds_use_uint32(self):
+        """Test that odds beyond the uint16 range switch to uint32."""
+        values = np.array([6553.4, 12345.6, np.nan], dtype=np.float32)
+
+        codes = encode_odds(values)
+
+        assert codes.dtype == np.uint32
+        np.testing.assert_array_equal(decode_odds(codes), values)
+
+        with pytest.raises(ValueError):
+            encode_odds(values, dtype=np.uint16)
+
+        with pytest.raises(ValueError):
+            encode_odds([-1.0])
+
+    def test_compact_record(self):
+        """Test conversion of a scraped odds record and back."""
+        trifecta = np.full((6, 6, 6), np.nan, dtype=np.float32)
+        trifecta[0, 1, 2] = 123.5
+        record = {
+            "race_number": 1,
+            "win_odds": {1: 1.5},
+            "trifecta_odds": trifecta,
+            "place_odds": {
+                "lower_limit": np.array([1.0, 1.2], dtype=np.float32),
+                "upper_limit": np.array([1.4, 2.0], dtype=np.float32),
+            },
+        }
+
+        compact = compact_odds(record)
+
+        assert isinstance(compact["trifecta_odds"], FixedPointOdds)
+        assert compact["trifecta_odds"].nbytes * 2 == trifecta.nbytes
+        assert compact["win_odds"] == FixedPointOdds.from_float([1.5])
+        assert compact["place_odds"]["upper_limit"] == FixedPointOdds.from_float(
+            record["place_odds"]["upper_limit"]
+        )
+
+        expanded = expand_odds(compact)
+        np.testing.assert_array_equal(expanded["trifecta_odds"], trifecta)
+
+        flat = flatten_odds(compact)
+        np.testing.assert_array_equal(flat["trifecta_odds"], trifecta.ravel())
+        np.testing.assert_array_equal(
+            flat["place_odds.lower_limit"], record["place_odds"]["lower_limit"]
+        )
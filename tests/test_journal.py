@@ -0,0 +1,66 @@
+"""
+Tests for the backfill journal.
+"""
+
+import sqlite3
+from datetime import date, timedelta
+
+from bvp_scraper.journal import BackfillJournal
+
+DAY = date(2024, 1, 1)
+
+
+class FakeClock:
+    """Clock that only moves when advanced."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestBackfillJournal:
+    """Test cases for BackfillJournal."""
+
+    def test_statuses_survive_reopening(self, tmp_path):
+        """Test that done and failed races are durable."""
+        path = str(tmp_path / "journal.db")
+        with BackfillJournal(path) as journal:
+            journal.plan("results", [(DAY, 1, race) for race in range(1, 4)])
+            journal.mark_done("results", DAY, 1, 1, output="results/2024-01-01.jsonl")
+            journal.mark_done("results", DAY, 1, 1)
+            journal.mark_failed("results", DAY, 1, 2, "HTTPError(503)")
+
+        with BackfillJournal(path) as journal:
+            assert journal.completed("results") == {(DAY, 1, 1)}
+            assert journal.failures("results") == {(DAY, 1, 2): "HTTPError(503)"}
+            assert journal.output_of("results", DAY, 1, 1) == (
+                "results/2024-01-01.jsonl"
+            )
+            assert journal.completed("programs") == set()
+
+        connection = sqlite3.connect(path)
+        assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+        attempts = connection.execute(
+            "SELECT attempts FROM races WHERE race_number = 1"
+        ).fetchone()
+        assert attempts == (1,)
+
+    def test_progress_and_eta(self, tmp_path):
+        """Test counts and the ETA from this run's rate."""
+        clock = FakeClock()
+        journal = BackfillJournal(str(tmp_path / "journal.db"), clock=clock)
+        journal.plan("results", [(DAY, 1, race) for race in range(1, 13)])
+
+        assert journal.progress("results").eta is None
+
+        clock.now += 10
+        journal.mark_done("results", DAY, 1, 1)
+        journal.mark_done("results", DAY, 1, 2)
+        journal.mark_failed("results", DAY, 1, 3, "timeout")
+        progress = journal.progress("results")
+
+        assert (progress.total, progress.done, progress.failed) == (12, 2, 1)
+        assert progress.pending == 9
+        assert progress.eta == timedelta(seconds=50)
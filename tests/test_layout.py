@@ -0,0 +1,132 @@
+"""
+Tests for page layout detection.
+"""
+
+import logging
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup
+
+from bvp_scraper.layout import LayoutDetector
+
+# Level 0 page: three blocks in the content container
+LEVEL0_HTML = """
+<html><body><main><div><div><div>
+    <div></div>
+    <div><div><table></table></div><div></div><div><h3>一般戦 1800m</h3></div></div>
+</div></div></div></main></body></html>
+"""
+
+# Level 1 page: an extra navigation block shifts the content down by one
+LEVEL1_HTML = """
+<html><body><main><div><div><div>
+    <div></div>
+    <div><div><table></table></div><div></div><div><ul><li>1R</li></ul></div>
+        <div><h3>一般戦 1800m</h3></div></div>
+</div></div></div></main></body></html>
+"""
+
+# Pages whose blocks have the same tags at both levels; only the level 1
+# navigation inside the third block tells them apart
+SAME_SHAPE_HTML = """
+<html><body><main><div><div><div>
+    <div></div>
+    <div><div><table></table></div><div></div><div><div>{navigation}</div></div>
+        <div><h3>一般戦 1800m</h3></div></div>
+</div></div></div></main></body></html>
+"""
+
+TEMPLATES = {
+    "racelist": {
+        "subtitle": "body main div div div div:nth-child(2) div:nth-child({level + 3}) h3",
+        "cell": "table tbody:nth-child({boat}) td",
+    }
+}
+
+
+def parse(html):
+    return BeautifulSoup(html, "html.parser")
+
+
+class TestLayoutDetector:
+    """Test cases for LayoutDetector."""
+
+    def test_plan_per_level(self):
+        """Test that each layout gets selectors compiled for its level."""
+        detector = LayoutDetector(TEMPLATES)
+
+        for html, level in ((LEVEL0_HTML, 0), (LEVEL1_HTML, 1)):
+            soup = parse(html)
+            plan = detector.plan_for("racelist", soup)
+
+            assert plan.base_level == level
+            assert soup.select_one(plan.selectors["subtitle"]).text == "一般戦 1800m"
+            assert len(plan.selectors["cell"]) == 6
+
+    def test_known_layout_skips_probe(self):
+        """Test that a known fingerprint reuses the cached plan."""
+        detector = LayoutDetector(TEMPLATES)
+
+        with patch.object(
+            LayoutDetector, "probe_base_level", wraps=detector.probe_base_level
+        ) as probe:
+            plans = [
+                detector.plan_for("racelist", parse(LEVEL0_HTML)) for _ in range(3)
+            ]
+
+        assert probe.call_count == 1
+        assert plans[0] is plans[1] is plans[2]
+        assert len(detector.known_layouts()["racelist"]) == 1
+
+    def test_new_layout_is_reported(self, caplog):
+        """Test that a second layout of a page type logs a warning."""
+        detector = LayoutDetector(TEMPLATES)
+
+        with caplog.at_level(logging.INFO, logger="bvp_scraper.layout"):
+            detector.plan_for("racelist", parse(LEVEL0_HTML))
+            detector.plan_for("racelist", parse(LEVEL1_HTML))
+
+        levels = [record.levelno for record in caplog.records]
+        assert levels == [logging.INFO, logging.WARNING]
+
+    def test_unexpected_structure_falls_back_to_probe(self):
+        """Test pages without the expected skeleton."""
+        detector = LayoutDetector(TEMPLATES)
+        soup = parse("<html><body><p>メンテナンス中</p></body></html>")
+
+        assert LayoutDetector.fingerprint(soup) is None
+        assert detector.plan_for("racelist", soup).base_level == 0
+        assert detector.known_layouts() == {}
+
+    def test_same_shape_at_different_levels(self, caplog):
+        """Test that pages differing only in the level signal get their own plan."""
+        detector = LayoutDetector(TEMPLATES)
+        level0 = parse(SAME_SHAPE_HTML.format(navigation=""))
+        level1 = parse(SAME_SHAPE_HTML.format(navigation="<ul><li>1R</li></ul>"))
+
+        with caplog.at_level(logging.INFO, logger="bvp_scraper.layout"):
+            plans = [detector.plan_for("racelist", soup) for soup in (level0, level1)]
+
+        assert (
+            LayoutDetector.fingerprint(level0)[0]
+            == (LayoutDetector.fingerprint(level1)[0])
+        )
+        assert [plan.base_level for plan in plans] == [0, 1]
+        assert caplog.records[-1].levelno == logging.WARNING
+
+    def test_level_signal_elsewhere_is_probed(self):
+        """Test that a fingerprint disagreeing with the probe is not cached."""
+        detector = LayoutDetector(TEMPLATES)
+        # Level 1 navigation under a second <main>: the probe sees it, the
+        # fingerprint's walk does not
+        html = SAME_SHAPE_HTML.format(navigation="").replace(
+            "</main>",
+            "</main><main><div><div><div><div></div><div><div></div><div></div>"
+            "<div><ul><li>1R</li></ul></div></div></div></div></div></main>",
+        )
+
+        plans = [detector.plan_for("racelist", parse(html)) for _ in range(2)]
+
+        assert [plan.base_level for plan in plans] == [1, 1]
+        assert plans[0].fingerprint is None
+        assert detector.known_layouts() == {}
@@ -0,0 +1,122 @@
+"""
+Tests for odds change detection.
+"""
+
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from bvp_scraper.combinations import empty_odds
+from bvp_scraper.odds_delta import OddsDeltaDecoder, OddsDeltaEncoder, flatten_odds
+from bvp_scraper.poller import OddsSnapshot
+
+START = datetime(2024, 1, 1, 10, 0)
+
+
+def snapshot(minutes, trifecta, win=None):
+    """Build a snapshot of race 1 at stadium 1."""
+    odds = {"race_number": 1, "trifecta_odds": trifecta}
+    if win is not None:
+        odds["win_odds"] = win
+    return OddsSnapshot(
+        date(2024, 1, 1),
+        1,
+        1,
+        START + timedelta(minutes=minutes),
+        START + timedelta(hours=1),
+        odds,
+    )
+
+
+class TestOddsDelta:
+    """Test cases for the delta encoder and decoder."""
+
+    def test_flatten_odds(self):
+        """Test flattening of every odds shape."""
+        flat = flatten_odds(
+            {
+                "race_number": 1,
+                "win_odds": {1: 1.5, 2: None},
+                "place_odds": {
+                    "lower_limit": np.ones(6, dtype=np.float32),
+                    "upper_limit": np.ones(6, dtype=np.float32),
+                },
+                "exacta_odds": empty_odds(2),
+            }
+        )
+
+        assert sorted(flat) == [
+            "exacta_odds",
+            "place_odds.lower_limit",
+            "place_odds.upper_limit",
+            "win_odds",
+        ]
+        assert flat["exacta_odds"].shape == (36,)
+        assert np.isnan(flat["win_odds"][1])
+
+    def test_only_changes_are_emitted(self):
+        """Test keyframe, changed positions and unchanged polls."""
+        encoder = OddsDeltaEncoder(keyframe_interval=300)
+        odds = empty_odds(3)
+        odds[0, 1, 2] = 10.0
+
+        (first,) = encoder.encode(snapshot(0, odds.copy()))
+        assert encoder.encode(snapshot(1, odds.copy())) == []
+
+        odds[0, 1, 2] = 12.0
+        odds[5, 4, 3] = 80.0
+        (second,) = encoder.encode(snapshot(2, odds.copy()))
+
+        assert first.keyframe
+        assert first.indices.size == 216
+        assert not second.keyframe
+        assert second.indices.dtype == np.uint16
+        assert second.indices.tolist() == [
+            np.ravel_multi_index((0, 1, 2), (6, 6, 6)),
+            np.ravel_multi_index((5, 4, 3), (6, 6, 6)),
+        ]
+        assert second.values.tolist() == [12.0, 80.0]
+        assert second.taken_at == START + timedelta(minutes=2)
+
+    def test_periodic_keyframe(self):
+        """Test that a keyframe follows once the interval has passed."""
+        encoder = OddsDeltaEncoder(keyframe_interval=300)
+        odds = empty_odds(3)
+
+        encoder.encode(snapshot(0, odds))
+        (delta,) = encoder.encode(snapshot(5, odds))
+
+        assert delta.keyframe
+
+    def test_encoder_without_sink(self):
+        """Test that a default encoder tracks snapshots without a sink."""
+        encoder = OddsDeltaEncoder()
+        odds = empty_odds(3)
+
+        encoder(snapshot(0, odds))
+        assert encoder.encode(snapshot(1, odds)) == []
+
+        # The post-deadline poll drops the race, so the next one is a keyframe
+        encoder(snapshot(60, odds))
+        (delta,) = encoder.encode(snapshot(61, odds))
+        assert delta.keyframe
+
+    def test_decoder_rebuilds_odds(self):
+        """Test that decoding the deltas reproduces every snapshot."""
+        deltas = []
+        encoder = OddsDeltaEncoder(deltas.append, keyframe_interval=300)
+        decoder = OddsDeltaDecoder()
+        rng = np.random.default_rng(0)
+        odds = rng.uniform(1, 100, (6, 6, 6)).astype(np.float32)
+
+        for minute in range(10):
+            odds[rng.integers(0, 6, 3).tolist()] = rng.uniform(1, 100)
+            encoder(snapshot(minute, odds.copy(), win={1: 1.2, 2: 3.4}))
+
+            rebuilt = {}
+            for delta in deltas:
+                rebuilt[delta.bet_type] = decoder.apply(delta)
+            deltas.clear()
+
+            if "trifecta_odds" in rebuilt:
+                np.testing.assert_array_equal(rebuilt["trifecta_odds"], odds.ravel())
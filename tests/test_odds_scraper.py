@@ -0,0 +1,414 @@
+"""
+Tests for OddsScraper.
+"""
+
+import threading
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+from bvp_scraper.combinations import pair_index, triple_index
+from bvp_scraper.fixed_point import FixedPointOdds
+from bvp_scraper.scheduler import FetchScheduler
+from bvp_scraper.scraper_core import ScraperCore
+from bvp_scraper.scrapers.odds_scraper import OddsScraper
+
+BOATS = range(1, 7)
+
+
+def odds_value(*boats):
+    """Odds used in the generated pages: 1-2-3 pays 123.5."""
+    return float("".join(map(str, boats)) + ".5")
+
+
+def page_html(*tables):
+    """Wrap odds tables in the page skeleton."""
+    return (
+        "<html><body><main><div><div><div><div></div><div>"
+        + "".join(f'<div class="table1">{table}</div>' for table in tables)
+        + "</div></div></div></div></main></body></html>"
+    )
+
+
+def odds_table(head, rows):
+    """Build an odds table from header and row cells."""
+    return (
+        f"<table><thead><tr>{head}</tr></thead>"
+        f"<tbody>{''.join(f'<tr>{row}</tr>' for row in rows)}</tbody></table>"
+    )
+
+
+def odds_range(*boats):
+    """Range odds used in the generated pages: 1=2 pays 12.0-12.5."""
+    value = odds_value(*boats)
+    return f"{value - 0.5}-{value}"
+
+
+def two_boat_table(ordered, value=odds_value):
+    """Build an exacta (ordered), quinella or quinella place table."""
+    head = "".join(
+        f'<th class="is-boatColor{first}">{first}</th><th>選手{first}</th>'
+        for first in BOATS
+    )
+
+    rows = []
+    for row in range(5):
+        cells = []
+        for first in BOATS:
+            seconds = [
+                boat for boat in BOATS if boat != first and (ordered or boat > first)
+            ]
+            if row < len(seconds):
+                second = seconds[row]
+                cells.append(f'<td class="is-boatColor{second}">{second}</td>')
+                cells.append(f'<td class="oddsPoint">{value(first, second)}</td>')
+            else:
+                cells.append('<td class="is-disabled"></td><td></td>')
+        rows.append("".join(cells))
+
+    return odds_table(head, rows)
+
+
+def odds2tf_html():
+    """Build an exacta/quinella page shaped like the official one."""
+    return page_html(two_boat_table(True), two_boat_table(False))
+
+
+def oddstf_html():
+    """Build a win/place page shaped like the official one."""
+
+    def table(value):
+        return (
+            "<table>"
+            + "".join(
+                f"<tbody><tr><td>{boat}</td><td>選手{boat}</td><td>{value(boat)}</td>"
+                "</tr></tbody>"
+                for boat in BOATS
+            )
+            + "</table>"
+        )
+
+    blocks = "<div></div>" * 5 + (
+        f"<div><div><div></div><div>{table(odds_value)}</div></div>"
+        f"<div><div></div><div>{table(odds_range)}</div></div></div>"
+    )
+    return (
+        "<html><body><main><div><div><div><div></div>"
+        f"<div>{blocks}</div></div></div></div></main></body></html>"
+    )
+
+
+def odds3t_html():
+    """Build a trifecta page shaped like the official one."""
+    head = "".join(
+        f'<th class="is-boatColor{first}">{first}</th>'
+        f'<th class="is-boatColor{first}" colspan="2">選手{first}</th>'
+        for first in BOATS
+    )
+
+    rows = []
+    for row in range(20):
+        cells = []
+        for first in BOATS:
+            seconds = [boat for boat in BOATS if boat != first]
+            second = seconds[row // 4]
+            third = [boat for boat in seconds if boat != second][row % 4]
+            if row % 4 == 0:
+                cells.append(
+                    f'<td class="is-boatColor{second}" rowspan="4">{second}</td>'
+                )
+            cells.append(f'<td class="is-boatColor{third}">{third}</td>')
+            cells.append(
+                f'<td class="oddsPoint">{odds_value(first, second, third)}</td>'
+            )
+        rows.append("".join(cells))
+
+    return page_html(odds_table(head, rows))
+
+
+def odds3f_html():
+    """Build a trio page: a triangular table with spanned 2nd boats."""
+    head = "".join(
+        f'<th class="is-boatColor{first}">{first}</th>'
+        f'<th class="is-boatColor{first}" colspan="2">選手{first}</th>'
+        for first in BOATS
+    )
+
+    rows = [[] for _ in range(10)]
+    for first in BOATS:
+        row = 0
+        for second in range(first + 1, 6):
+            thirds = range(second + 1, 7)
+            for offset, third in enumerate(thirds):
+                if offset == 0:
+                    rows[row].append(
+                        f'<td class="is-boatColor{second}" rowspan="{len(thirds)}">'
+                        f"{second}</td>"
+                    )
+                rows[row].append(f'<td class="is-boatColor{third}">{third}</td>')
+                rows[row].append(
+                    f'<td class="oddsPoint">{odds_value(first, second, third)}</td>'
+                )
+                row += 1
+        for empty in range(row, 10):
+            rows[empty].append('<td class="is-disabled"></td><td></td><td></td>')
+
+    return page_html(odds_table(head, ["".join(cells) for cells in rows]))
+
+
+class TestOddsScraper:
+    """Test cases for OddsScraper."""
+
+    @patch("time.sleep")
+    def test_scrape_trifecta(self, mock_sleep, mock_session):
+        """Test that all 120 trifecta combinations land in the array."""
+        mock_session.get(
+            "https://www.boatrace.jp/owpc/pc/race/odds3t", text=odds3t_html()
+        )
+
+        odds = OddsScraper().scrape_trifecta("2024-01-01", 1, 1)["trifecta_odds"]
+
+        assert odds.shape == (6, 6, 6)
+        assert odds.dtype == np.float32
+        assert np.count_nonzero(~np.isnan(odds)) == 120
+        assert odds[0, 1, 2] == odds_value(1, 2, 3)
+        assert odds[5, 3, 4] == odds_value(6, 4, 5)
+        assert np.isnan(odds[0, 0, 1])
+        assert mock_session.last_request.path.endswith("/odds3t")
+
+    def test_trifecta_missing_table(self):
+        """Test that a page without odds gives an all-NaN array."""
+        scraper = OddsScraper()
+        soup = scraper.parse_html(b"<html><body><main></main></body></html>")
+        ctx = scraper.create_context(soup, "odds3t", None, 1, 1)
+
+        odds = scraper._extract_trifecta(ctx)["trifecta_odds"]
+
+        assert np.isnan(odds).all()
+
+    @patch("time.sleep")
+    def test_scrape_exacta_and_quinella(self, mock_sleep, mock_session):
+        """Test both two-boat bet types from the odds2tf page."""
+        mock_session.get(
+            "https://www.boatrace.jp/owpc/pc/race/odds2tf", text=odds2tf_html()
+        )
+        scraper = OddsScraper()
+
+        exacta = scraper.scrape_exacta("2024-01-01", 1, 1)["exacta_odds"]
+        quinella = scraper.scrape_quinella("2024-01-01", 1, 1)["quinella_odds"]
+
+        assert exacta.shape == (6, 6)
+        assert np.count_nonzero(~np.isnan(exacta)) == 30
+        assert exacta[1, 0] == odds_value(2, 1)
+        assert np.isnan(np.diag(exacta)).all()
+        assert quinella.shape == (15,)
+        assert not np.isnan(quinella).any()
+        assert quinella[pair_index(3, 5)] == odds_value(3, 5)
+
+    @patch("time.sleep")
+    def test_back_to_back_bet_types_share_fetch(self, mock_sleep, mock_session):
+        """Test that with the cache on, exacta then quinella is one request."""
+        mock_session.get(
+            "https://www.boatrace.jp/owpc/pc/race/odds2tf", text=odds2tf_html()
+        )
+        core = ScraperCore(odds_cache_ttl=5.0)
+
+        exacta = core.scrape_exacta_odds("2024-01-01", 1, 1)[1][1]
+        quinella = core.scrape_quinella_odds("2024-01-01", 1, 1)[1][1]
+
+        assert mock_session.call_count == 1
+        assert exacta["exacta_odds"][0, 1] == odds_value(1, 2)
+        assert quinella["quinella_odds"][pair_index(1, 2)] == odds_value(1, 2)
+
+    @patch("time.sleep")
+    def test_repeated_calls_fetch_fresh_odds(self, mock_sleep, mock_session):
+        """Test that by default every call fetches the page again."""
+        mock_session.get(
+            "https://www.boatrace.jp/owpc/pc/race/odds2tf", text=odds2tf_html()
+        )
+        scraper = OddsScraper()
+
+        scraper.scrape_exacta("2024-01-01", 1, 1)
+        quinella = scraper.scrape_quinella("2024-01-01", 1, 1)
+
+        assert mock_session.call_count == 2
+        assert set(quinella) >= {"quinella_odds"}
+        assert "exacta_odds" not in quinella
+        assert scraper._results == {}
+
+    @patch("time.monotonic")
+    @patch("time.sleep")
+    def test_cached_result_expires(self, mock_sleep, mock_monotonic, mock_session):
+        """Test that results are fetched again once the cache TTL passes."""
+        mock_session.get(
+            "https://www.boatrace.jp/owpc/pc/race/odds2tf", text=odds2tf_html()
+        )
+        mock_monotonic.return_value = 100.0
+        scraper = OddsScraper()
+        scraper.cache_ttl = 5.0
+
+        first = scraper.scrape_exacta("2024-01-01", 1, 1)
+        first["exacta_odds"][:] = 0
+        mock_monotonic.return_value = 104.0
+        cached = scraper.scrape_exacta("2024-01-01", 1, 1)
+        fetches_before_expiry = mock_session.call_count
+        mock_monotonic.return_value = 105.0
+        expired = scraper.scrape_exacta("2024-01-01", 1, 1)
+
+        assert fetches_before_expiry == 1
+        assert mock_session.call_count == 2
+        assert cached["exacta_odds"][0, 1] == odds_value(1, 2)
+        assert expired["exacta_odds"][0, 1] == odds_value(1, 2)
+
+    @patch("time.sleep")
+    def test_scrape_win_and_place(self, mock_sleep, mock_session):
+        """Test win odds and place odds as lower/upper arrays."""
+        mock_session.get(
+            "https://www.boatrace.jp/owpc/pc/race/oddstf", text=oddstf_html()
+        )
+        scraper = OddsScraper()
+
+        win = scraper.scrape_win("2024-01-01", 1, 1)["win_odds"]
+        place = scraper.scrape_place("2024-01-01", 1, 1)["place_odds"]
+
+        assert win == {boat: odds_value(boat) for boat in BOATS}
+        assert place["lower_limit"].dtype == np.float32
+        np.testing.assert_array_equal(
+            place["lower_limit"], [odds_value(boat) - 0.5 for boat in BOATS]
+        )
+        np.testing.assert_array_equal(
+            place["upper_limit"], [odds_value(boat) for boat in BOATS]
+        )
+        # Without the opt-in cache every call fetches fresh odds
+        assert mock_session.call_count == 2
+
+    @patch("time.sleep")
+    def test_scrape_quinella_place(self, mock_sleep, mock_session):
+        """Test quinella place ranges as aligned pair arrays."""
+        mock_session.get(
+            "https://www.boatrace.jp/owpc/pc/race/oddsk",
+            text=page_html(two_boat_table(False, odds_range)),
+        )
+
+        odds = OddsScraper().scrape_quinella_place("2024-01-01", 1, 1)[
+            "quinella_place_odds"
+        ]
+        lower, upper = odds["lower_limit"], odds["upper_limit"]
+
+        assert lower.shape == upper.shape == (15,)
+        assert lower[pair_index(2, 4)] == odds_value(2, 4) - 0.5
+        assert upper[pair_index(2, 4)] == odds_value(2, 4)
+        assert (lower < upper).all()
+
+    @patch("time.sleep")
+    def test_scrape_trio(self, mock_sleep, mock_session):
+        """Test that the 20 trio triples land in the shared vector order."""
+        mock_session.get(
+            "https://www.boatrace.jp/owpc/pc/race/odds3f", text=odds3f_html()
+        )
+
+        odds = OddsScraper().scrape_trio("2024-01-01", 1, 1)["trio_odds"]
+
+        assert odds.shape == (20,)
+        assert odds.dtype == np.float32
+        assert not np.isnan(odds).any()
+        assert odds[triple_index(2, 4, 6)] == odds_value(2, 4, 6)
+        assert odds[triple_index(4, 5, 6)] == odds_value(4, 5, 6)
+
+    @patch("time.sleep")
+    def test_scrape_fetches_each_page_once(self, mock_sleep, mock_session):
+        """Test that all bet types come from one fetch per distinct page."""
+        pages = {
+            "oddstf": oddstf_html(),
+            "odds2tf": odds2tf_html(),
+            "oddsk": page_html(two_boat_table(False, odds_range)),
+            "odds3t": odds3t_html(),
+            "odds3f": odds3f_html(),
+        }
+        for page, html in pages.items():
+            mock_session.get(f"https://www.boatrace.jp/owpc/pc/race/{page}", text=html)
+
+        odds = OddsScraper().scrape("2024-01-01", 1, 1)
+
+        assert mock_session.call_count == 5
+        assert sorted(request.path for request in mock_session.request_history) == [
+            f"/owpc/pc/race/{page}" for page in sorted(pages)
+        ]
+        assert odds["race_number"] == 1
+        assert odds["win_odds"][1] == odds_value(1)
+        assert odds["exacta_odds"][0, 1] == odds_value(1, 2)
+        assert odds["quinella_place_odds"]["upper_limit"][0] == odds_value(1, 2)
+        assert odds["trifecta_odds"][0, 1, 2] == odds_value(1, 2, 3)
+        assert odds["trio_odds"][0] == odds_value(1, 2, 3)
+
+    @patch("time.sleep")
+    def test_pages_fetched_in_parallel_only_with_scheduler(
+        self, mock_sleep, mock_session
+    ):
+        """Test that without a scheduler odds pages are fetched one by one."""
+        pages = {
+            "oddstf": oddstf_html(),
+            "odds2tf": odds2tf_html(),
+            "oddsk": page_html(two_boat_table(False, odds_range)),
+            "odds3t": odds3t_html(),
+            "odds3f": odds3f_html(),
+        }
+        for page, html in pages.items():
+            mock_session.get(f"https://www.boatrace.jp/owpc/pc/race/{page}", text=html)
+
+        scraper = OddsScraper()
+        threads = []
+        fetch = scraper.fetch
+
+        def recording_fetch(url):
+            threads.append(threading.get_ident())
+            return fetch(url)
+
+        scraper.fetch = recording_fetch
+        scraper.scrape("2024-01-01", 1, 1)
+
+        assert threads == [threading.get_ident()] * 5
+        assert mock_sleep.call_count == 5
+
+        threads.clear()
+        scraper.scheduler = Mock(spec=FetchScheduler)
+        scraper.scrape("2024-01-01", 1, 1)
+
+        assert len(threads) == 5
+        assert threading.get_ident() not in threads
+
+    @patch("time.sleep")
+    def test_compact_odds_through_core(self, mock_sleep, mock_session):
+        """Test that ScraperCore returns fixed-point win and place odds."""
+        mock_session.get(
+            "https://www.boatrace.jp/owpc/pc/race/oddstf", text=oddstf_html()
+        )
+        core = ScraperCore(compact_odds=True)
+
+        record = core.scrape_win_odds("2024-01-01", 1, 1)[1][1]
+        place = core.scrape_place_odds("2024-01-01", 1, 1)[1][1]["place_odds"]
+
+        assert isinstance(record["win_odds"], FixedPointOdds)
+        assert record["win_odds"].codes.dtype == np.uint16
+        np.testing.assert_array_equal(
+            record["win_odds"].to_float(),
+            np.array([odds_value(boat) for boat in BOATS], dtype=np.float32),
+        )
+        assert isinstance(place["lower_limit"], FixedPointOdds)
+
+    @patch("time.sleep")
+    def test_compact_trifecta(self, mock_sleep, mock_session):
+        """Test fixed-point trifecta odds with a cancelled combination."""
+        html = odds3t_html().replace(f">{odds_value(1, 2, 3)}<", ">欠場<")
+        mock_session.get("https://www.boatrace.jp/owpc/pc/race/odds3t", text=html)
+
+        odds = OddsScraper(compact=True).scrape_trifecta("2024-01-01", 1, 1)[
+            "trifecta_odds"
+        ]
+        values = odds.to_float()
+
+        assert odds.codes.dtype == np.uint16
+        assert odds.nbytes == 216 * 2
+        assert np.isposinf(values[0, 1, 2])
+        assert values[5, 3, 4] == odds_value(6, 4, 5)
+        assert np.count_nonzero(np.isnan(values)) == 216 - 120
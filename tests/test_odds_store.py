@@ -0,0 +1,87 @@
+"""
+Tests for the append-only odds store.
+"""
+
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from bvp_scraper.combinations import empty_odds
+from bvp_scraper.odds_store import OddsStore
+from bvp_scraper.poller import OddsSnapshot
+
+START = datetime(2024, 1, 1, 10, 0)
+
+
+def snapshot(race_date, stadium, race, minutes, value):
+    """Build a snapshot whose odds all equal value."""
+    trio = np.full(20, value, dtype=np.float32)
+    exacta = empty_odds(2)
+    exacta[0, 1] = value
+    return OddsSnapshot(
+        race_date,
+        stadium,
+        race,
+        datetime.combine(race_date, START.time()) + timedelta(minutes=minutes),
+        datetime.combine(race_date, START.time()) + timedelta(hours=1),
+        {"race_number": race, "trio_odds": trio, "exacta_odds": exacta},
+    )
+
+
+class TestOddsStore:
+    """Test cases for OddsStore."""
+
+    def test_history(self, tmp_path):
+        """Test loading one race's history across several chunks."""
+        with OddsStore(str(tmp_path), chunk_rows=3) as store:
+            for minute in range(5):
+                store(snapshot(date(2024, 1, 1), 1, 1, minute, minute + 1.0))
+                store(snapshot(date(2024, 1, 1), 2, 1, minute, 99.0))
+
+        times, odds = OddsStore(str(tmp_path)).history("2024-01-01", 1, 1, "trio_odds")
+
+        assert odds.shape == (5, 20)
+        assert odds.dtype == np.float32
+        assert odds[:, 0].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+        assert times[0] == np.datetime64(START, "us")
+        assert (np.diff(times) > np.timedelta64(0)).all()
+
+    def test_final_odds(self, tmp_path):
+        """Test the last capture of every race over a date range."""
+        store = OddsStore(str(tmp_path))
+        for day in (1, 2, 3):
+            for minute in range(3):
+                for stadium in (1, 2):
+                    store(
+                        snapshot(
+                            date(2024, 1, day), stadium, 1, minute, day * 10.0 + minute
+                        )
+                    )
+        store.flush()
+
+        records, odds = store.final_odds("exacta_odds", "2024-01-01", "2024-01-02", [1])
+
+        assert records["race_date"].tolist() == [date(2024, 1, 1), date(2024, 1, 2)]
+        assert odds.shape == (2, 36)
+        assert odds[:, 1].tolist() == [12.0, 22.0]
+
+    def test_append_only(self, tmp_path):
+        """Test that reopening a store appends to it."""
+        with OddsStore(str(tmp_path)) as store:
+            store(snapshot(date(2024, 1, 1), 1, 1, 0, 1.0))
+        with OddsStore(str(tmp_path)) as store:
+            store(snapshot(date(2024, 1, 1), 1, 1, 1, 2.0))
+
+        _, odds = OddsStore(str(tmp_path)).history("2024-01-01", 1, 1, "trio_odds")
+
+        assert odds[:, 0].tolist() == [1.0, 2.0]
+        assert len(OddsStore(str(tmp_path)).index()) == 4
+
+    def test_unknown_bet_type(self, tmp_path):
+        """Test that unknown bet types are rejected."""
+        store = OddsStore(str(tmp_path))
+
+        assert len(store.index()) == 0
+        with pytest.raises(ValueError):
+            store.append(date(2024, 1, 1), 1, 1, "bogus", START, np.zeros(3))
@@ -0,0 +1,118 @@
+"""
+Tests for the process-pool parse pipeline.
+"""
+
+from datetime import date
+from unittest.mock import patch
+
+from bvp_scraper.pipeline import extract_batch, pack_records, unpack_records
+from bvp_scraper.scheduler import FetchScheduler
+from bvp_scraper.scraper_core import ScraperCore
+
+# Parallel fetches need a rate budget; keep it out of the way of the tests
+FAST = FetchScheduler(requests_per_second=1000.0, burst=100)
+
+RACELIST_HTML = """
+<html><body><main><div><div><div>
+    <div><div><div><h2>テストレース</h2></div></div></div>
+    <div><div></div><div></div><div><h3>一般戦 1800m</h3></div></div>
+</div></div></div></main></body></html>
+"""
+
+
+class TestPipeline:
+    """Test cases for the fetch/parse pipeline."""
+
+    def test_pack_and_unpack_records(self):
+        """Test that packing shares dict keys and round-trips records."""
+        records = [
+            (1, race, {"race_number": race, "boats": {1: {"name": "a"}}})
+            for race in (1, 2, 3)
+        ]
+
+        schemas, packed = pack_records(records)
+
+        assert len(schemas) == 3
+        assert unpack_records((schemas, packed)) == records
+
+    def test_pack_keeps_tuples(self):
+        """Test that tuples and lists come back as they were packed."""
+        records = [
+            (1, 1, {"percentages": (1.0, 2.0), "racers": [{"boat": 1}, (2, None)]}),
+            (1, 2, (3, {"boat": 3})),
+        ]
+
+        batch = pack_records(records)
+
+        assert unpack_records(batch) == records
+        assert isinstance(unpack_records(batch)[0][2]["percentages"], tuple)
+        assert batch[0] == [("percentages", "racers"), ("boat",)]
+
+    def test_extract_batch(self):
+        """Test extraction of raw pages in the worker function."""
+        items = [(1, 1, {"racelist": (RACELIST_HTML.encode(), "utf-8")})]
+
+        batch = extract_batch(
+            "bvp_scraper.scrapers.program_scraper",
+            "ProgramScraper",
+            "scrape",
+            date(2024, 1, 1),
+            items,
+        )
+        ((stadium, race, record),) = unpack_records(batch)
+
+        assert (stadium, race) == (1, 1)
+        assert record["race_stadium_number"] == 1
+        assert record["race_distance"] == 1800
+
+    @patch("time.sleep")
+    def test_pipelined_scrape(self, mock_sleep, mock_session):
+        """Test that pipeline mode matches the sequential result."""
+        mock_session.get(
+            "https://www.boatrace.jp/owpc/pc/race/racelist",
+            content=RACELIST_HTML.encode(),
+        )
+
+        pipelined = ScraperCore(io_workers=2, parse_workers=1, scheduler=FAST)
+        result = pipelined.scrape_programs("2024-01-01", 1)
+        expected = ScraperCore().scrape_programs("2024-01-01", 1)
+
+        assert list(result[1]) == list(range(1, 13))
+        assert result == expected
+
+    @patch("time.sleep")
+    def test_pipelined_failed_page(self, mock_sleep, mock_session):
+        """Test that a failed download leaves the other races of the batch."""
+        mock_session.get(
+            "https://www.boatrace.jp/owpc/pc/race/racelist",
+            content=RACELIST_HTML.encode(),
+        )
+        mock_session.get(
+            "https://www.boatrace.jp/owpc/pc/race/racelist?rno=5", status_code=500
+        )
+
+        pipelined = ScraperCore(io_workers=2, parse_workers=1, scheduler=FAST)
+        pipelined._call_with_retry = lambda callback: callback()
+        result = pipelined.scrape_programs("2024-01-01", 1)
+
+        assert 5 not in result[1]
+        assert len(result[1]) == 11
+        assert list(result.errors) == [(date(2024, 1, 1), 1, 5)]
+
+    @patch("time.sleep")
+    def test_pools_are_reused_until_closed(self, mock_sleep, mock_session):
+        """Test that calls share the pipeline pools until the core closes."""
+        mock_session.get(
+            "https://www.boatrace.jp/owpc/pc/race/racelist",
+            content=RACELIST_HTML.encode(),
+        )
+
+        with ScraperCore(io_workers=2, parse_workers=1, scheduler=FAST) as core:
+            core.scrape_programs("2024-01-01", 1, 1)
+            pools = core._pipeline_pools()
+            core.scrape_programs("2024-01-01", 1, 2)
+
+            assert core._pipeline_pools() == pools
+
+        assert core._io_pool is None
+        assert core._parse_pool is None
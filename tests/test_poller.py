@@ -0,0 +1,154 @@
+"""
+Tests for the live odds poller.
+"""
+
+import re
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from bvp_scraper.batch import BatchResult
+from bvp_scraper.poller import OddsPoller
+from bvp_scraper.scheduler import FetchScheduler
+from bvp_scraper.scraper_core import ScraperCore
+
+START = datetime(2024, 1, 1, 10, 0)
+ODDS_PAGES = re.compile(r"https://www\.boatrace\.jp/owpc/pc/race/odds")
+
+
+class FakeClock:
+    """Clock that only moves when slept on."""
+
+    def __init__(self):
+        self.now = START
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += timedelta(seconds=seconds)
+
+
+def make_poller(deadlines, core=None, **kwargs):
+    """Build a poller over races closing at the given minutes after START."""
+    clock = FakeClock()
+    core = core or ScraperCore()
+    core.scrape_programs = Mock(
+        return_value={
+            1: {
+                race: {"race_closed_at": f"{START + timedelta(minutes=minutes)}"}
+                for race, minutes in deadlines.items()
+            }
+        }
+    )
+    core.scrape_odds = Mock(
+        side_effect=lambda race_date, stadium, race, raise_on_error: BatchResult(
+            {stadium: {race: {"race_number": race}}}
+        )
+    )
+    snapshots = []
+    poller = OddsPoller(
+        snapshots.append, core, clock=clock, sleep=clock.sleep, **kwargs
+    )
+    return poller, clock, snapshots
+
+
+class TestOddsPoller:
+    """Test cases for OddsPoller."""
+
+    def test_load_tracks_open_races(self):
+        """Test that only races before their deadline are tracked."""
+        poller, _, _ = make_poller({1: -5, 2: 30, 3: 90})
+
+        assert poller.load("2024-01-01") == 2
+
+    def test_interval_tightens_near_deadline(self):
+        """Test deadline-aware intervals within the bounds."""
+        poller, _, _ = make_poller({})
+        deadline = START + timedelta(hours=2)
+
+        far = poller.interval_for(deadline, START)
+        near = poller.interval_for(deadline, deadline - timedelta(minutes=5))
+        last = poller.interval_for(deadline, deadline - timedelta(seconds=30))
+
+        assert far == poller.max_interval
+        assert near == 30.0
+        assert last == poller.min_interval
+
+    def test_budget_stretches_intervals(self):
+        """Test that too many races stretch every interval alike."""
+        poller, _, _ = make_poller(dict.fromkeys(range(1, 13), 2))
+        poller.load("2024-01-01")
+        deadline = START + timedelta(minutes=2)
+
+        # 12 races wanting a poll of 5 pages every 12s is 5 requests/second
+        assert poller.interval_for(deadline, START) == 12.0 * 5
+
+    def test_run_covers_every_race_within_budget(self):
+        """Test a full run until all races close."""
+        poller, _, snapshots = make_poller({1: 3, 2: 10}, requests_per_second=0.5)
+        poller.load("2024-01-01")
+
+        poller.run()
+
+        polled_races = {snapshot.race_number for snapshot in snapshots}
+        assert polled_races == {1, 2}
+        assert snapshots[-1].taken_at >= snapshots[-1].closed_at
+        assert poller.scheduler.requests_per_second == 0.5
+
+        race1 = [s.taken_at for s in snapshots if s.race_number == 1]
+        assert race1[-1] >= START + timedelta(minutes=3)
+
+    def test_failed_poll_keeps_polling(self):
+        """Test that a race whose odds fail is logged and polled again."""
+        poller, _, snapshots = make_poller({1: 3})
+        core = poller.scraper_core
+        del core.scrape_odds  # Go through the real batch method
+        core._call_with_retry = lambda callback: callback()
+        core._execute_scraper_method = Mock(
+            side_effect=requests.ConnectionError("reset")
+        )
+        poller.load("2024-01-01")
+
+        assert poller.step() is None
+        assert snapshots == []
+        assert len(poller._queue) == 1
+
+    def test_core_without_scheduler_gets_one(self):
+        """Test that the poller's budget becomes the core's scheduler."""
+        poller, _, _ = make_poller({}, requests_per_second=0.5)
+        odds_scraper = poller.scraper_core._get_scraper_instance("scrape_odds")
+
+        assert poller.scheduler.requests_per_second == 0.5
+        assert odds_scraper.scheduler is poller.scheduler
+        assert poller.requests_per_poll == 5
+
+    def test_shared_scheduler_is_kept(self):
+        """Test that a scheduler shared with a backfill stays in charge."""
+        scheduler = FetchScheduler(2.0)
+        backfill = ScraperCore(scheduler=scheduler, lane="backfill")
+        poller, _, _ = make_poller({}, core=ScraperCore(scheduler=scheduler))
+
+        assert poller.scheduler is scheduler is backfill.scheduler
+        with pytest.raises(ValueError):
+            make_poller({}, core=backfill)
+
+    @patch("time.sleep")
+    def test_polls_use_the_live_odds_lane(self, mock_sleep, mock_session):
+        """Test that every page of a poll is granted in the live_odds lane."""
+        mock_session.get(ODDS_PAGES, text="<html><body></body></html>")
+        scheduler = FetchScheduler(1000, burst=100)
+        poller, _, snapshots = make_poller(
+            {1: 3}, core=ScraperCore(scheduler=scheduler)
+        )
+        del poller.scraper_core.scrape_odds  # Go through the real batch method
+        poller.load("2024-01-01")
+
+        poller.step()
+
+        assert len(snapshots) == 1
+        assert scheduler.granted["live_odds"] == poller.requests_per_poll
+        assert sum(scheduler.granted.values()) == poller.requests_per_poll
+        mock_sleep.assert_not_called()
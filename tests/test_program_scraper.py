@@ -150,3 +150,40 @@ class TestProgramScraper:
         assert scraper._clean_racer_name("  田中太郎  ") == "田中太郎"
         assert scraper._clean_racer_name(None) is None
         assert scraper._clean_racer_name("") is None
+
+    def test_extract_is_reentrant(self):
+        """Test that one instance extracts pages of different layouts at once."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from bs4 import BeautifulSoup
+
+        page = """
+        <html><body><main><div><div><div>
+            <div></div>
+            <div><div></div><div></div>{blocks}</div>
+        </div></div></div></main></body></html>
+        """
+        level0 = BeautifulSoup(
+            page.format(blocks="<div><h3>一般戦 1800m</h3></div>"), "html.parser"
+        )
+        level1 = BeautifulSoup(
+            page.format(
+                blocks="<div><ul><li>tab</li></ul></div><div><h3>優勝戦 1200m</h3></div>"
+            ),
+            "html.parser",
+        )
+
+        scraper = ProgramScraper()
+        soups = [level0, level1] * 50
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            distances = list(
+                pool.map(
+                    lambda soup: scraper.extract(
+                        "scrape", {"racelist": soup}, date(2024, 1, 1), 1, 1
+                    )["race_distance"],
+                    soups,
+                )
+            )
+
+        assert distances == [1800, 1200] * 50
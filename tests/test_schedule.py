@@ -0,0 +1,101 @@
+"""
+Tests for the stadium schedule cache.
+"""
+
+from datetime import date, datetime
+from unittest.mock import Mock, patch
+
+from bvp_scraper.schedule import ScheduleCache
+from bvp_scraper.scraper_core import ScraperCore
+
+TODAY = date(2024, 1, 2)
+INDEX_HTML = (
+    "<html><body><main><div><div><div><div></div><div><div>"
+    '<div><a href="/owpc/pc/race/raceindex?jcd=05&hd=20240101">多摩川</a>'
+    "<h3>多摩川</h3><p>3日目</p><ul>"
+    + "".join(
+        f'<li><a href="/owpc/pc/race/racelist?rno={race}&jcd=05&hd=20240101">'
+        f"{race}R</a></li>"
+        for race in range(1, 12)
+    )
+    + "</ul></div></div></div></div></div></main></body></html>"
+)
+# Mid-day index: each card links only the next race, and a single race
+# called off shows 中止 outside the meet status
+MIDDAY_HTML = (
+    "<html><body><main><div><div><div><div></div><div><div>"
+    '<div><a href="/owpc/pc/race/raceindex?jcd=05&hd=20240102">多摩川</a>'
+    '<h3>多摩川</h3><p class="grade">一般</p><p>3日目</p>'
+    '<p><a href="/owpc/pc/race/racelist?rno=7&jcd=05&hd=20240102">7R</a>'
+    " 締切予定 14:21</p><p>12R 中止</p></div>"
+    '<div><a href="/owpc/pc/race/raceindex?jcd=12&hd=20240102">住之江</a>'
+    '<h3>住之江</h3><p class="status">中止</p></div>'
+    "</div></div></div></div></main></body></html>"
+)
+
+
+class FakeClock:
+    """Monotonic clock that only moves when advanced."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestScheduleCache:
+    """Test cases for ScheduleCache."""
+
+    def test_past_dates_are_cached_for_good(self):
+        """Test that only today's schedule expires."""
+        clock = FakeClock()
+        loader = Mock(side_effect=lambda race_date: {1: {"race_count": 12}})
+        cache = ScheduleCache(loader, ttl=60, clock=clock, today=lambda: TODAY)
+
+        cache.get(date(2024, 1, 1))
+        cache.get(TODAY)
+        clock.now += 61
+        cache.get(date(2024, 1, 1))
+        cache.get(TODAY)
+
+        assert loader.call_count == 3
+
+    def test_copies_are_returned(self):
+        """Test that callers cannot change the cached schedule."""
+        cache = ScheduleCache(lambda race_date: {1: {"race_count": 12}})
+
+        cache.get(TODAY)[1]["race_count"] = 0
+
+        assert cache.get(TODAY)[1]["race_count"] == 12
+
+    @patch("time.sleep")
+    def test_index_is_fetched_once_per_date(self, mock_sleep, mock_session):
+        """Test that every scrape kind shares one index fetch."""
+        mock_session.get("https://www.boatrace.jp/owpc/pc/race/index", text=INDEX_HTML)
+        core = ScraperCore()
+
+        stadiums = core.scrape_stadiums("2024-01-01")
+        numbers = core._get_race_stadium_numbers(date(2024, 1, 1), None)
+        core._get_race_stadium_numbers(date(2024, 1, 1), None)
+
+        assert mock_session.call_count == 1
+        assert numbers == [5]
+        assert stadiums[5]["race_count"] == 11
+        assert stadiums[5]["meet_day"] == "3日目"
+
+    @patch("time.sleep")
+    def test_midday_index_keeps_every_race(self, mock_sleep, mock_session):
+        """Test that the next race shown is not taken as the race count."""
+        mock_session.get("https://www.boatrace.jp/owpc/pc/race/index", text=MIDDAY_HTML)
+        core = ScraperCore()
+        core.clock = lambda: datetime(2024, 1, 2, 14, 0)
+
+        stadiums = core.scrape_stadiums(TODAY)
+        planned, skipped = core.plan_races("scrape_programs", TODAY)
+
+        assert stadiums[5]["race_count"] is None
+        assert stadiums[5]["cancelled"] is False
+        assert stadiums[12]["cancelled"] is True
+        assert planned == [(TODAY, 5, race) for race in range(1, 13)]
+        assert set(skipped.values()) == {"meet cancelled"}
@@ -0,0 +1,107 @@
+"""
+Tests for the fetch scheduler.
+"""
+
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from bvp_scraper.scheduler import FetchScheduler
+from bvp_scraper.scraper_core import ScraperCore
+
+
+class FakeClock:
+    """Monotonic clock that only moves when advanced."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def wait_until(condition, timeout=5.0):
+    """Poll a condition from the test thread."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def run_queued(lanes, tokens):
+    """
+    Queue one request per lane while the bucket is empty, then release
+    tokens one at a time and record the order the lanes are served in.
+    """
+    clock = FakeClock()
+    scheduler = FetchScheduler(requests_per_second=1000.0, burst=1, clock=clock)
+    scheduler.acquire("backfill")  # Drain the bucket
+
+    served = []
+    threads = []
+    for number, lane in enumerate(lanes):
+        thread = threading.Thread(
+            target=lambda lane=lane: served.append(scheduler.acquire(lane) or lane),
+            daemon=True,
+        )
+        thread.start()
+        threads.append(thread)
+        wait_until(lambda number=number: sum(scheduler.queued().values()) > number)
+
+    for count in range(1, tokens + 1):
+        clock.now += 0.001
+        wait_until(lambda count=count: len(served) >= count)
+
+    return served, scheduler
+
+
+class TestFetchScheduler:
+    """Test cases for FetchScheduler."""
+
+    def test_live_odds_preempt_queued_backfill(self):
+        """Test that a later live request is served before earlier backfill."""
+        served, _ = run_queued(["backfill"] * 3 + ["live_odds"], 1)
+
+        assert served == ["live_odds"]
+
+    def test_weighted_share_keeps_backfill_moving(self):
+        """Test that backfill gets its share while live requests wait."""
+        served, scheduler = run_queued(["backfill"] * 4 + ["live_odds"] * 16, 18)
+
+        assert served.count("live_odds") == 16
+        assert served.count("backfill") == 2
+        assert scheduler.queued()["backfill"] == 2
+
+    def test_rate_budget(self):
+        """Test that the bucket refills at the global rate."""
+        clock = FakeClock()
+        scheduler = FetchScheduler(requests_per_second=2.0, burst=2, clock=clock)
+
+        scheduler.acquire("live_odds")
+        scheduler.acquire("backfill")
+
+        assert scheduler._take_token() == pytest.approx(0.5)
+        clock.now += 0.5
+        assert scheduler._take_token() == 0.0
+
+    def test_unknown_lane(self):
+        """Test that unknown lanes and weights are rejected."""
+        with pytest.raises(ValueError):
+            FetchScheduler().acquire("other")
+
+        with pytest.raises(ValueError):
+            FetchScheduler(weights={"other": 1.0})
+
+    @patch("time.sleep")
+    def test_scheduler_replaces_sleep(self, mock_sleep, mock_session):
+        """Test that scrapers ask the scheduler instead of sleeping."""
+        mock_session.get("https://www.boatrace.jp/owpc/pc/race/raceresult", text="")
+        scheduler = Mock(spec=FetchScheduler)
+        core = ScraperCore(scheduler=scheduler, lane="backfill")
+
+        core.scrape_results("2024-01-01", 1, 1)
+
+        scheduler.acquire.assert_called_once_with("backfill")
+        mock_sleep.assert_not_called()
@@ -56,10 +56,19 @@ class TestScraper:
 
             # Test static method calls
             Scraper.scrape_programs(test_date, 1, 1)
-            mock_scraper_core.scrape_programs.assert_called_once_with(test_date, 1, 1)
+            mock_scraper_core.scrape_programs.assert_called_once_with(
+                test_date, 1, 1, raise_on_error=None
+            )
 
             Scraper.scrape_odds(test_date, 1, 1)
-            mock_scraper_core.scrape_odds.assert_called_once_with(test_date, 1, 1)
+            mock_scraper_core.scrape_odds.assert_called_once_with(
+                test_date, 1, 1, raise_on_error=None
+            )
+
+            Scraper.scrape_results(test_date, raise_on_error=True)
+            mock_scraper_core.scrape_results.assert_called_once_with(
+                test_date, None, None, raise_on_error=True
+            )
 
     def test_initialization_with_custom_core(self):
         """Test initialization with custom scraper core."""
@@ -71,3 +80,11 @@ class TestScraper:
         """Test initialization with default scraper core."""
         scraper = Scraper()
         assert isinstance(scraper._scraper_core, ScraperCore)
+
+    def test_scraper_instance_shared_across_methods(self):
+        """Test that all methods of a scraper class share one instance."""
+        scraper_core = ScraperCore()
+        odds_scraper = scraper_core._get_scraper_instance("scrape_odds")
+
+        assert scraper_core._get_scraper_instance("scrape_win_odds") is odds_scraper
+        assert scraper_core._get_scraper_instance("scrape_trio_odds") is odds_scraper
@@ -0,0 +1,429 @@
+"""
+Tests for ScraperCore batch scraping.
+"""
+
+import asyncio
+from datetime import date, datetime
+from unittest.mock import Mock
+
+import pytest
+import requests
+from tenacity import Future, RetryError
+
+from bvp_scraper.batch import BatchError, BatchResult
+from bvp_scraper.journal import BackfillJournal
+from bvp_scraper.schedule import ScheduleCache
+from bvp_scraper.scraper_core import ScraperCore
+
+DAY1, DAY2, DAY3 = date(2024, 1, 1), date(2024, 1, 2), date(2024, 1, 3)
+
+
+def make_core(stadiums, fail=()):
+    """Build a core over fake stadium lookups and race scrapes."""
+    core = ScraperCore()
+    core._call_with_retry = lambda callback: callback()
+    core.clock = lambda: datetime(2024, 6, 1, 12, 0)
+    core.schedules = ScheduleCache(
+        Mock(
+            side_effect=lambda race_date: {
+                stadium: {"race_count": 12} for stadium in stadiums[race_date]
+            }
+        )
+    )
+
+    def execute(scraper, method_name, race_date, stadium, race):
+        if (race_date, stadium, race) in fail:
+            raise requests.ConnectionError("page failed")
+        return {"race_stadium_number": stadium, "race_number": race}
+
+    core._execute_scraper_method = Mock(side_effect=execute)
+    return core
+
+
+class TestScrapeRange:
+    """Test cases for ScraperCore.scrape_range."""
+
+    def test_scrapes_every_race_of_the_range(self):
+        """Test that the plan covers each date's stadiums and races."""
+        core = make_core({DAY1: [1, 2], DAY2: [], DAY3: [3]})
+
+        records = list(core.scrape_range("results", "2024-01-01", DAY3, workers=4))
+
+        keys = {(race_date, stadium, race) for race_date, stadium, race, _ in records}
+        assert len(records) == len(keys) == 36
+        assert (DAY1, 2, 12) in keys
+        assert (DAY3, 3, 1) in keys
+        assert all(record["race_number"] == race for _, _, race, record in records)
+        assert core.schedules.loader.call_count == 3
+
+    def test_given_stadiums_skip_lookup(self):
+        """Test that explicit stadiums are used for every date."""
+        core = make_core({})
+
+        records = list(core.scrape_range("programs", DAY1, DAY2, stadiums=[5]))
+
+        assert {stadium for _, stadium, _, _ in records} == {5}
+        assert len(records) == 24
+        assert not core.schedules.loader.called
+
+    def test_failures(self):
+        """Test that failed races go to on_error or are raised."""
+        core = make_core({DAY1: [1]}, fail={(DAY1, 1, 7)})
+        errors = []
+
+        records = list(
+            core.scrape_range(
+                "results",
+                DAY1,
+                DAY1,
+                workers=2,
+                on_error=lambda *key: errors.append(key[:3]),
+            )
+        )
+
+        assert len(records) == 11
+        assert errors == [(DAY1, 1, 7)]
+
+        with pytest.raises(requests.ConnectionError):
+            list(core.scrape_range("results", DAY1, DAY1))
+
+    def test_unknown_kind(self):
+        """Test that only per-race kinds are accepted."""
+        with pytest.raises(ValueError):
+            next(ScraperCore().scrape_range("stadiums", DAY1, DAY1))
+
+    def test_parallel_workers_share_a_rate_budget(self):
+        """Test that parallel scraping attaches a scheduler if none is set."""
+        core = make_core({DAY1: [1]})
+
+        list(core.scrape_range("results", DAY1, DAY1))
+        assert core.scheduler is None
+
+        list(core.scrape_range("results", DAY1, DAY1, workers=4))
+        scheduler = core.scheduler
+        assert scheduler.requests_per_second == 1.0
+        assert core._get_scraper_instance("scrape_results").scheduler is scheduler
+        assert core._get_scraper_instance("scrape_odds").scheduler is scheduler
+
+    def test_journal_resumes_backfill(self, tmp_path):
+        """Test that a restart scrapes only the races not done before."""
+        journal = BackfillJournal(str(tmp_path / "journal.db"))
+        core = make_core({DAY1: [1]}, fail={(DAY1, 1, 7)})
+
+        # The first run dies after handling five records
+        for count, _ in enumerate(
+            core.scrape_range("results", DAY1, DAY1, journal=journal), 1
+        ):
+            if count == 5:
+                break
+
+        core = make_core({DAY1: [1]})
+        records = list(core.scrape_range("results", DAY1, DAY1, journal=journal))
+
+        assert len(records) == 8
+        assert len(journal.completed("results")) == 12
+        assert journal.progress("results").pending == 0
+
+    def test_journal_records_output(self, tmp_path):
+        """Test that output_for tells the journal where each race went."""
+        journal = BackfillJournal(str(tmp_path / "journal.db"))
+        core = make_core({DAY1: [1]})
+
+        for _, _, race, _ in core.scrape_range(
+            "results",
+            DAY1,
+            DAY1,
+            journal=journal,
+            output_for=lambda race_date, stadium, race, record: f"out/{race}.json",
+        ):
+            if race == 4:
+                break
+
+        done = journal.completed("results")
+        assert (DAY1, 1, 4) not in done
+        assert all(
+            journal.output_of("results", *key).startswith("out/") for key in done
+        )
+
+
+class TestPlanRaces:
+    """Test cases for ScraperCore.plan_races."""
+
+    def make_core(self):
+        """Build a core whose index shows a full, a cancelled and a short meet."""
+        core = make_core({})
+        schedule = {
+            1: {"race_count": 12},
+            2: {"race_count": 12, "cancelled": True},
+            3: {"race_count": 10},
+        }
+        core.schedules = ScheduleCache(Mock(return_value=schedule))
+        return core
+
+    def test_schedule_prunes_races(self):
+        """Test that cancelled meets and missing races are skipped."""
+        core = self.make_core()
+
+        planned, skipped = core.plan_races("scrape_results", DAY1)
+
+        assert len(planned) == 22
+        assert skipped[DAY1, 2, 1] == "meet cancelled"
+        assert skipped[DAY1, 3, 11] == "stadium holds 10 races"
+        assert len(skipped) == 14
+
+    def test_races_not_run_yet(self):
+        """Test that results wait for the date and the betting deadline."""
+        core = self.make_core()
+        today = date(2024, 6, 1)
+        core._remember_deadline(
+            (today, 1, 5), {"race_closed_at": "2024-06-01 13:00:00"}
+        )
+
+        _, skipped = core.plan_races("scrape_results", today, 1)
+        future_results, _ = core.plan_races("scrape_results", date(2024, 6, 2), 1)
+        future_programs, _ = core.plan_races("scrape_programs", date(2024, 6, 2), 1)
+
+        assert skipped == {(today, 1, 5): "race has not run yet"}
+        assert future_results == []
+        assert len(future_programs) == 12
+        assert not core.schedules.loader.called
+
+    def test_passed_deadlines_are_evicted(self):
+        """Test that only deadlines still ahead are kept."""
+        core = self.make_core()
+        today = date(2024, 6, 1)
+        core._remember_deadline(
+            (today, 1, 1), {"race_closed_at": "2024-06-01 11:00:00"}
+        )
+        core._remember_deadline(
+            (today, 1, 5), {"race_closed_at": "2024-06-01 13:00:00"}
+        )
+        core.clock = lambda: datetime(2024, 6, 1, 14, 0)
+        core._remember_deadline(
+            (today, 1, 12), {"race_closed_at": "2024-06-01 16:00:00"}
+        )
+
+        assert list(core._deadlines) == [(today, 1, 12)]
+
+    def test_datetime_dates(self):
+        """Test that a datetime is planned as its date."""
+        core = self.make_core()
+
+        planned, _ = core.plan_races("scrape_results", datetime(2024, 1, 1, 10), 1, 1)
+        response = core.scrape_results(datetime(2024, 1, 1, 10), 1, 1)
+
+        assert planned == [(DAY1, 1, 1)]
+        assert list(response[1]) == [1]
+
+    def test_batch_reports_skipped_races(self):
+        """Test that a day's scrape requests only the planned races."""
+        core = self.make_core()
+
+        response = core.scrape_results(DAY1)
+
+        assert core._execute_scraper_method.call_count == 22
+        assert response[2] == {}
+        assert sorted(response[3]) == list(range(1, 11))
+        assert response.skipped[DAY1, 3, 12] == "stadium holds 10 races"
+        assert not hasattr(core, "skipped")
+
+
+class TestIterRaces:
+    """Test cases for the streaming ScraperCore.iter_races."""
+
+    def test_yields_before_the_day_is_scraped(self):
+        """Test that records arrive while later races are not started yet."""
+        core = make_core({DAY1: [1, 2]})
+
+        records = core.iter_results(DAY1, workers=1)
+        _, race, record = next(records)
+
+        assert record["race_number"] == race
+        assert core._execute_scraper_method.call_count <= 3
+        assert len(list(records)) == 23
+
+    def test_streams_every_planned_race(self):
+        """Test that the stream covers the planned races only."""
+        core = make_core({DAY1: [1, 2]})
+
+        keys = {(stadium, race) for stadium, race, _ in core.iter_programs(DAY1, 2)}
+
+        assert keys == {(2, race) for race in range(1, 13)}
+
+    def test_skipped_races_go_to_on_skip(self):
+        """Test that each call reports its own skipped races."""
+        future = date(2024, 6, 2)
+        core = make_core({DAY1: [1], future: [1]})
+        skipped = []
+
+        records = core.iter_results(future, on_skip=lambda *race: skipped.append(race))
+        day1 = list(core.iter_results(DAY1))
+
+        assert list(records) == []
+        assert len(day1) == 12
+        assert skipped == [
+            (future, 1, race, "race has not run yet") for race in range(1, 13)
+        ]
+
+    def test_async_counterpart(self):
+        """Test that aiter_<kind> yields the same records."""
+        core = make_core({DAY1: [1]}, fail={(DAY1, 1, 3)})
+        errors = []
+
+        async def collect():
+            return [
+                item
+                async for item in core.aiter_odds(
+                    DAY1, on_error=lambda *key: errors.append(key[:3])
+                )
+            ]
+
+        records = asyncio.run(collect())
+
+        assert sorted(race for _, race, _ in records) == [
+            race for race in range(1, 13) if race != 3
+        ]
+        assert errors == [(DAY1, 1, 3)]
+
+    def test_stadiums_are_not_streamed(self):
+        """Test that only per-race kinds have iterators."""
+        assert not hasattr(ScraperCore(), "iter_stadiums")
+
+
+class TestScrapeRaceBundle:
+    """Test cases for ScraperCore.scrape_race_bundle."""
+
+    def make_core(self):
+        """Build a core whose scrapers fetch fake pages and echo them back."""
+        core = make_core({DAY1: [1]})
+        core.fetched = []
+
+        def fetch(url):
+            core.fetched.append(url)
+            return b"<html></html>", "utf-8"
+
+        for method_name in core._scraper_classes:
+            scraper = core._get_scraper_instance(method_name)
+            scraper.fetch = fetch
+            scraper.extract = Mock(
+                side_effect=lambda method, soups, *key: {"pages": sorted(soups)}
+            )
+        return core
+
+    def test_one_record_per_race(self):
+        """Test that every part of a race comes back together."""
+        core = self.make_core()
+
+        response = core.scrape_race_bundle(DAY1, workers=4)
+
+        assert sorted(response[1]) == list(range(1, 13))
+        assert response[1][5] == {
+            "programs": {"pages": ["racelist"]},
+            "previews": {"pages": ["beforeinfo"]},
+            "odds": {"pages": ["odds2tf", "odds3f", "odds3t", "oddsk", "oddstf"]},
+            "results": {"pages": ["raceresult"]},
+        }
+        assert len(core.fetched) == 12 * 8
+        assert core.schedules.loader.call_count == 1
+
+    def test_shared_pages_are_fetched_once(self):
+        """Test that parts on the same page share one download."""
+        core = self.make_core()
+
+        response = core.scrape_race_bundle(
+            DAY1, 1, 1, parts=("odds", "win_odds", "place_odds")
+        )
+
+        assert set(response[1][1]) == {"odds", "win_odds", "place_odds"}
+        assert response[1][1]["win_odds"] == {"pages": ["oddstf"]}
+        assert len(core.fetched) == 5
+
+    def test_parts_not_available_are_skipped(self):
+        """Test that results of races not run yet are left out."""
+        core = self.make_core()
+
+        response = core.scrape_race_bundle(
+            date(2024, 6, 2), 1, 1, parts=("programs", "results")
+        )
+
+        assert set(response[1][1]) == {"programs"}
+        assert response.skipped == {
+            (date(2024, 6, 2), 1, 1): "results: race has not run yet"
+        }
+
+
+class TestBatchFailures:
+    """Test cases for partial batch results."""
+
+    def test_failed_race_keeps_the_others(self):
+        """Test that a failure is reported without losing the other races."""
+        core = make_core({DAY1: [1, 2]}, fail={(DAY1, 2, 7)})
+
+        response = core.scrape_results(DAY1)
+
+        assert isinstance(response, BatchResult)
+        assert len(response[1]) == 12
+        assert sorted(response[2]) == [race for race in range(1, 13) if race != 7]
+        assert list(response.errors) == [(DAY1, 2, 7)]
+        assert isinstance(response.errors[DAY1, 2, 7], requests.ConnectionError)
+        assert not response.ok
+
+    def test_raise_on_error_after_every_race(self):
+        """Test that raise_on_error raises once the whole batch was tried."""
+        core = make_core({DAY1: [1]}, fail={(DAY1, 1, 1)})
+
+        with pytest.raises(BatchError) as raised:
+            core.scrape_programs(DAY1, raise_on_error=True)
+
+        assert core._execute_scraper_method.call_count == 12
+        assert len(raised.value.result[1]) == 11
+
+    def test_single_race_raises_by_default(self):
+        """Test that asking for one race raises its failure."""
+        core = make_core({DAY1: [1]}, fail={(DAY1, 1, 2)})
+
+        with pytest.raises(BatchError):
+            core.scrape_results(DAY1, 1, 2)
+
+        assert core.scrape_results(DAY1, 1, 2, raise_on_error=False).errors
+
+    def test_bugs_are_not_collected(self):
+        """Test that exceptions other than network and parse failures raise."""
+        core = make_core({DAY1: [1]})
+        core._execute_scraper_method.side_effect = TypeError("bug")
+
+        with pytest.raises(TypeError):
+            core.scrape_results(DAY1)
+
+    def test_retry_pass_targets_failed_races(self):
+        """Test that retry_failed scrapes only the failed races again."""
+        core = make_core({DAY1: [1]}, fail={(DAY1, 1, 3), (DAY1, 1, 9)})
+        response = core.scrape_odds(DAY1)
+        core._execute_scraper_method.reset_mock()
+
+        core._execute_scraper_method.side_effect = lambda *args: {"retried": True}
+        core.retry_failed("odds", response)
+
+        assert core._execute_scraper_method.call_count == 2
+        assert response.ok
+        assert response[1][9] == {"retried": True}
+
+    def test_retry_error_is_unwrapped(self):
+        """Test that the last cause of an exhausted retry is recorded."""
+        attempt = Future(3)
+        attempt.set_exception(requests.ConnectionError("reset"))
+        response = BatchResult()
+
+        response.add_error((DAY1, 1, 1), RetryError(attempt))
+
+        assert isinstance(response.errors[DAY1, 1, 1], requests.ConnectionError)
+
+    def test_bundle_reports_failed_races(self):
+        """Test that bundles collect failures the same way."""
+        core = make_core({DAY1: [1]})
+        core._scrape_bundle = Mock(side_effect=requests.ConnectionError("page failed"))
+
+        response = core.scrape_race_bundle(DAY1, 1, parts=("programs",))
+
+        assert response[1] == {}
+        assert len(response.errors) == 12